@@ -1,54 +1,25 @@
 import streamlit as st
 from datetime import datetime
-import pandas as pd
+import os
 
-from utils import t, t_question, append_to_google_sheet, TRANSLATIONS, map_to_english
-from UI import render_mcq_card
-from test_compute_scores import compute_scores
-from score_interpretations import interpret_score, get_interpretation_labels
+from utils import t, get_submission_writer, TRANSLATIONS, app_catalog
+from UI import render_mcq_card_compact, inject_global_styles, track_forward_messages
+from trail_core import AnswerSheet, score_codes, interpret_score, get_interpretation_labels
+from survey_schema import page_plan, FINAL_PAGE, TOTAL_PAGES, QUESTION_IDS
+from admin import show_admin
 import uuid
+import metrics
 
-st.markdown(
-    """
-    <style>
-    /* 1. Global Background Enhancement */
-    .stApp {
-        background: linear-gradient(
-            to bottom right, 
-            var(--background-color), 
-            var(--secondary-background-color)
-        );
-    }
+metrics.start_exporter()  # no-op unless TRAIL_METRICS* is set
 
-    /* 2. Fix Radio Button Text Visibility */
-    /* This ensures that even if Streamlit defaults change, 
-       your radio options remain tied to the theme text color */
-    div[data-testid="stWidgetLabel"] p {
-        color: var(--text-color) !important;
-    }
-    
-    div[data-testid="stMarkdownContainer"] p {
-        color: var(--text-color);
-    }
+# Set TRAIL_SHOW_PAYLOAD=1 to see the websocket payload of the previous rerun.
+# Counting hooks a private Streamlit API, so it is off by default.
+SHOW_PAYLOAD = os.environ.get("TRAIL_SHOW_PAYLOAD") == "1"
+payload = track_forward_messages() if SHOW_PAYLOAD else None
+inject_global_styles()
 
-    /* 3. Smooth Spacing */
-    /* Prevents the 'overlapping' you saw earlier by 
-       standardizing the gap between the card and the options */
-    [data-testid="stVerticalBlock"] > div:has(div.stRadio) {
-        margin-top: 5px;
-        padding-left: 5px;
-        padding-bottom: 5px;
-    }
-
-    /* 4. Title Enhancement */
-    h1, h2, h3 {
-        color: var(--text-color);
-        font-family: 'Inter', sans-serif;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True
-)
+if payload:
+    st.sidebar.caption(f"Previous rerun: {payload['messages']} messages, {payload['bytes']:,} bytes")
 
 # --- Generate a unique survey ID at the start of the session ---
 if "survey_id" not in st.session_state:
@@ -71,8 +42,9 @@ st.set_page_config(
 if "page" not in st.session_state:
     st.session_state.page = 1
 
+# Answers are option codes, one byte per question; text is only for display
 if "responses" not in st.session_state:
-    st.session_state.responses = {}
+    st.session_state.responses = AnswerSheet(QUESTION_IDS)
 
 if "lang_choice" not in st.session_state:
     st.session_state.lang_choice = "en"
@@ -105,7 +77,11 @@ def scroll_to_question(q_key):
         unsafe_allow_html=True
     )
 
-TOTAL_PAGES = 6  # excluding intro
+
+# Batched mode: each section is an st.form, so radio clicks stay in the browser
+# and all answers of a page arrive in one rerun when Back/Next is pressed.
+# Set TRAIL_BATCHED_FORMS=0 to get the old rerun-per-click behaviour back.
+BATCHED_FORMS = os.environ.get("TRAIL_BATCHED_FORMS", "1") != "0"
 
 def show_progress():
     if st.session_state.page > 1:
@@ -118,51 +94,6 @@ def show_progress():
 def show_intro():
     lang = st.session_state.lang_choice
 
-    # --- HERO IMAGE CSS ---
-    st.markdown(
-        """
-        <style>
-        /* Hero container */
-        .hero-container {
-            width: 100%;
-            max-height: 260px;
-            overflow: hidden;
-            border-radius: 18px;
-            box-shadow: 0 12px 28px rgba(0, 0, 0, 0.25);
-            animation: fadeInHero 1.2s ease-in-out;
-            margin-bottom: 24px;
-        }
-
-        /* Hero image */
-        .hero-container img {
-            width: 100%;
-            height: 260px;
-            object-fit: cover;
-        }
-
-        /* Mobile optimization */
-        @media (max-width: 768px) {
-            .hero-container img {
-                height: 200px;
-            }
-        }
-
-        /* Fade-in animation */
-        @keyframes fadeInHero {
-            from {
-                opacity: 0;
-                transform: translateY(12px);
-            }
-            to {
-                opacity: 1;
-                transform: translateY(0);
-            }
-        }
-        </style>
-        """,
-        unsafe_allow_html=True
-    )
-
     # --- HERO IMAGE ---
     st.markdown(
         """
@@ -192,111 +123,113 @@ def show_intro():
 
     if st.button(t(lang, "start", "Start")):
         st.session_state.locked_lang = st.session_state.lang_choice
-        st.session_state.responses = {}
+        st.session_state.responses = AnswerSheet(QUESTION_IDS)
         next_page()
         st.rerun()
 
 
 # --------------------------------------------------
-# Generic Section Renderer (A, B, D, E, F)
+# Section helpers
 # --------------------------------------------------
-def render_section(section_id, q_list, next_p):
-    lang = st.session_state.locked_lang
-    
-    st.header(t(lang, "title"))
-
-    show_progress()
-    
-    st.subheader(t(lang, f"sections.{section_id}", f"Section {section_id}"))
-
-    # Render all questions
-    for q in q_list:
-        data = t_question(lang, q)
-        q_text = data.get("q", f"Question {q}")
-        opts = data.get("opts", [])
-
-        existing_ans = st.session_state.responses.get(q)
-
-        choice = render_mcq_card(
-            q_text,
-            opts,
-            key=f"ans_{q}",
-            current_value=existing_ans
+def render_questions(questions):
+    # Render all questions of a compiled group; answers are stored as option codes
+    responses = st.session_state.responses
+    for q in questions:
+        choice = render_mcq_card_compact(
+            q.text,
+            q.options,
+            key=f"ans_{q.q_id}",
+            current_value=responses.get(q.q_id)
         )
-        st.session_state.responses[q] = choice
+        responses.set(q.q_id, choice)
 
-        # Example special case for B14
-        if q == "B14" and choice in ["Yes", "हाँ", "होय"]:
-            st.session_state.responses["B14_details"] = st.text_input(
-                "Please specify / कृपया स्पष्ट करें / कृपया स्पष्ट करा:",
-                key="input_B14_details"
+        # Conditional follow-up text input, configured in survey_schema
+        if q.followup and choice in q.followup.when:
+            responses.details[q.followup.key] = st.text_input(
+                q.followup.label,
+                key=f"input_{q.followup.key}"
             )
 
-    unanswered = [q for q in q_list if st.session_state.responses.get(q) is None]
-
+def unanswered_on(plan):
+    """
+    Unanswered questions of a page, then follow-ups whose answer triggers
+    them but which are still empty. In batched mode a follow-up only appears
+    once the form is submitted, so this keeps the page until it is filled.
+    """
+    responses = st.session_state.responses
+    missing = responses.unanswered(plan.question_ids)
+    for group in plan.groups:
+        for q in group.questions:
+            if q.followup and responses.get(q.q_id) in q.followup.when and not responses.details.get(q.followup.key):
+                missing.append(q.followup.key)
+    return missing
+
+def section_body(section_id):
+    """Container for a page's questions: a form in batched mode."""
+    if BATCHED_FORMS:
+        return st.form(f"form_{section_id}", border=False)
+    return st.container()
+
+def nav_buttons(lang, unanswered):
+    """
+    Back/Next buttons of a section page. Returns (back_clicked, next_clicked).
+    In batched mode Next cannot be disabled up front, because answers are
+    only known once the form is submitted; the caller validates instead.
+    """
     col1, col2 = st.columns(2)
 
-    with col1:
-        if st.button(t(lang, "back", "Back")):
-            st.session_state.page -= 1
-            st.rerun()
+    if BATCHED_FORMS:
+        with col1:
+            back = st.form_submit_button(t(lang, "back", "Back"))
+        with col2:
+            nxt = st.form_submit_button(t(lang, "next", "Next"))
+        return back, nxt
 
+    with col1:
+        back = st.button(t(lang, "back", "Back"))
     with col2:
-        if st.button(t(lang, "next", "Next"), disabled=bool(unanswered)):
-            st.session_state.page = next_p
-            st.rerun()
+        nxt = st.button(t(lang, "next", "Next"), disabled=bool(unanswered))
+    return back, nxt
+
+def handle_nav(lang, back, nxt, unanswered, next_p):
+    if back:
+        st.session_state.page -= 1
+        st.rerun()
+
+    if nxt and not unanswered:
+        st.session_state.page = next_p
+        st.rerun()
 
     if unanswered:
         st.info(t(lang, "answer_all", "Please answer all questions to continue."))
 
 # --------------------------------------------------
-# Section C (Custom layout)
+# Section Page Renderer
 # --------------------------------------------------
-def render_section_c():
+def render_page(plan):
     lang = st.session_state.locked_lang
-    st.title(t(lang, "title"))
-
-    show_progress()
-    
-    st.header(t(lang, "sections.C"))
 
-    qs = ["C1","C2","C3","C4","C5","C6","C7","C8","C9","C10","C11","C12"]
+    if plan.heading == "title":
+        st.title(plan.title)
+        show_progress()
+        st.header(plan.section_title)
+    else:
+        st.header(plan.title)
+        show_progress()
+        st.subheader(plan.section_title)
 
-    # WHO-5 questions
-    st.subheader(t(lang, "sections.C_sub_who"))
-    for q in qs[:5]:
-        data = t_question(lang, q)
-        q_text = data.get("q", f"Question {q}")
-        opts = data.get("opts", [])
-        existing_ans = st.session_state.responses.get(q)
-        st.session_state.responses[q] = render_mcq_card(q_text, opts, key=f"ans_{q}", current_value=existing_ans)
+    with section_body(plan.section_id):
+        for group in plan.groups:
+            if group.divider:
+                st.divider()
+            if group.sub_header:
+                st.subheader(group.sub_header)
+            render_questions(group.questions)
 
-    st.divider()
+        unanswered = unanswered_on(plan)
+        back, nxt = nav_buttons(lang, unanswered)
 
-    # Distress questions
-    for q in qs[5:]:
-        data = t_question(lang, q)
-        q_text = data.get("q", f"Question {q}")
-        opts = data.get("opts", [])
-        existing_ans = st.session_state.responses.get(q)
-        st.session_state.responses[q] = render_mcq_card(q_text, opts, key=f"ans_{q}", current_value=existing_ans)
-
-    unanswered = [q for q in qs if st.session_state.responses.get(q) is None]
-
-    col1, col2 = st.columns(2)
-
-    with col1:
-        if st.button(t(lang, "back", "Back")):
-            st.session_state.page -= 1
-            st.rerun()
-
-    with col2:
-        if st.button(t(lang, "next", "Next"), disabled=bool(unanswered)):
-            st.session_state.page = 5  # next page number
-            st.rerun()
-
-    if unanswered:
-        st.info(t(lang, "answer_all", "Please answer all questions to continue."))
+    handle_nav(lang, back, nxt, unanswered, plan.next_page)
 
 SCALE_ORDER = [
     ("sleep_quality", "🌙"),
@@ -306,32 +239,8 @@ SCALE_ORDER = [
     ("lifestyle_risk", "🔥")
 ]
 
-# --------------------------------------------------
-# Final Page
-# --------------------------------------------------
-def show_final():
-    lang = st.session_state.locked_lang
-    scores = compute_scores(st.session_state.responses, lang)
-    st.title(t(lang, "title"))
-
-    st.success(t(lang, "final_thanks", "Thank you for completing the assessment!"))
-    st.subheader(t(lang, "final_scores", "Your Scores"))
-    # Display metrics using translations
-    metrics = TRANSLATIONS.get("final_metrics", {}).get(lang, {})
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.metric(metrics.get("sleep_quality", "🌙 Sleep Quality (3–15)"), scores.get("sleep_quality", 0))
-        st.metric(metrics.get("WHO_total", "🙂 WHO-5 Well-being (0–100)"), scores.get("WHO_total", 0))
-        st.metric(metrics.get("distress_total", "⚠️ Mental Distress (6–30)"), scores.get("distress_total", 0))
-
-    with col2:
-        st.metric(metrics.get("cognitive_efficiency", "🧠 Cognitive Efficiency (8–40)"), scores.get("cognitive_efficiency", 0))
-        st.metric(metrics.get("lifestyle_risk", "🔥 Lifestyle Risk (higher = worse)"), scores.get("lifestyle_risk", 0))
-
-    labels = get_interpretation_labels(lang)
-    st.subheader(labels["section_title"])
-    
+def render_interpretations(scores, lang, labels):
+    """One bordered card per scale with its band, meaning and advice."""
     for scale_key, icon in SCALE_ORDER:
         score_value = scores.get(scale_key)
     
@@ -360,12 +269,39 @@ def show_final():
                 for item in interp["what_to_change"]:
                     st.markdown(f"- {item}")
 
+# --------------------------------------------------
+# Final Page
+# --------------------------------------------------
+def show_final():
+    lang = st.session_state.locked_lang
+    with metrics.timer("trail_scoring_seconds"):
+        scores = score_codes(st.session_state.responses.answered_codes())
+    st.title(t(lang, "title"))
+
+    st.success(t(lang, "final_thanks", "Thank you for completing the assessment!"))
+    st.subheader(t(lang, "final_scores", "Your Scores"))
+    # Display metrics using translations
+    metric_labels = TRANSLATIONS.get("final_metrics", {}).get(lang, {})
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.metric(metric_labels.get("sleep_quality", "🌙 Sleep Quality (3–15)"), scores.get("sleep_quality", 0))
+        st.metric(metric_labels.get("WHO_total", "🙂 WHO-5 Well-being (0–100)"), scores.get("WHO_total", 0))
+        st.metric(metric_labels.get("distress_total", "⚠️ Mental Distress (6–30)"), scores.get("distress_total", 0))
+
+    with col2:
+        st.metric(metric_labels.get("cognitive_efficiency", "🧠 Cognitive Efficiency (8–40)"), scores.get("cognitive_efficiency", 0))
+        st.metric(metric_labels.get("lifestyle_risk", "🔥 Lifestyle Risk (higher = worse)"), scores.get("lifestyle_risk", 0))
+
+    labels = get_interpretation_labels(lang)
+    st.subheader(labels["section_title"])
+    with metrics.timer("trail_interpretation_seconds"):
+        render_interpretations(scores, lang, labels)
+
     st.balloons()
 
-    # Convert all responses to English before saving
-    english_responses = {}
-    for q, ans in st.session_state.responses.items():
-        english_responses[q] = map_to_english(q, ans, st.session_state.locked_lang)
+    # Option codes index straight into the English options for saving
+    english_responses = st.session_state.responses.to_english(app_catalog())
 
     # Save data only once per session
     if not st.session_state.get("data_saved", False):
@@ -374,47 +310,41 @@ def show_final():
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "lang": "en",
             **english_responses,
-            **scores
+            **scores,
+            # Last, so sheets with an older header keep their columns aligned
+            "respondent_lang": lang,
         }
 
         # # Debug log to check data
-        # st.write("Saving data to Google Sheets:", save_data)
+        # st.write("Saving data:", save_data)
 
-        if append_to_google_sheet(save_data):
+        # Hand off to the background writer; it logs the record before returning
+        if get_submission_writer().submit(save_data):
             st.success(t(lang, "final_saved"))
             st.write(t(lang, "done_message"))
             st.session_state.data_saved = True  # prevent duplicate saves
         else:
-            st.error("Failed to save data to Google Sheets. Please contact admin.")
+            st.error("Failed to save data. Please contact admin.")
             
 # --------------------------------------------------
 # Navigation Controller
 # --------------------------------------------------
-if st.session_state.page == 1:
-    show_intro()
-
-elif st.session_state.page == 2:
-    render_section("A", ["A1", "A2", "A3", "A4", "A5", "A6", "A7"], 3)
-    scroll_to_question("A1")
-    
-elif st.session_state.page == 3:
-    render_section("B", [f"B{i}" for i in range(1, 14)], 4)
-    scroll_to_question("B1")
-
-elif st.session_state.page == 4:
-    render_section_c()
-
-elif st.session_state.page == 5:
-    render_section("D", [f"D{i}" for i in range(1, 10)], 6)
-    scroll_to_question("D1")
-
-elif st.session_state.page == 6:
-    render_section("E", ["E1", "E2", "E3", "E4"], 7)
-    scroll_to_question("E1")
-
-elif st.session_state.page == 7:
-    render_section("F", ["F1", "F2", "F3", "F4", "F5", "F6"], 8)
-    scroll_to_question("F1")
-
-elif st.session_state.page == 8:
-    show_final()
+# Each branch is timed as trail_page_seconds{page}; reruns via st.rerun() count too
+if "admin" in st.query_params:
+    # Results dashboard at ?admin, behind the admin password
+    with metrics.timer("trail_page_seconds", page="admin"):
+        show_admin()
+
+elif st.session_state.page == 1:
+    with metrics.timer("trail_page_seconds", page="intro"):
+        show_intro()
+
+elif st.session_state.page >= FINAL_PAGE:
+    with metrics.timer("trail_page_seconds", page="final"):
+        show_final()
+
+else:
+    plan = page_plan(st.session_state.locked_lang, st.session_state.page, app_catalog())
+    with metrics.timer("trail_page_seconds", page=plan.section_id):
+        render_page(plan)
+        scroll_to_question(plan.question_ids[0])
@@ -0,0 +1,202 @@
+import hmac
+import os
+from datetime import datetime
+from typing import NamedTuple
+
+import streamlit as st
+
+from export import DOWNLOAD_PART_ROWS, FORMATS, export_part, iter_records
+from storage import get_store
+from trail_core.interpretation import SCORE_INTERPRETATIONS, interpret_scores
+from trail_core.scoring import SCALE_COLUMNS
+
+# ======================================================
+# Admin results dashboard, opened with ?admin in the URL.
+#
+# Everything shown comes from one Snapshot of the response store, built at
+# most once per ADMIN_CACHE_TTL seconds per process and shared by every
+# admin session. Reruns only slice ready-made tables, and the row table is
+# paginated so a large cohort never ships more than PAGE_SIZE rows at a time.
+# Downloads read the live store in parts of DOWNLOAD_PART_ROWS rows, since
+# Streamlit keeps each one in memory; full exports go through export.py.
+# ======================================================
+
+ADMIN_CACHE_TTL = int(os.environ.get("TRAIL_ADMIN_CACHE_TTL", "300"))
+PAGE_SIZE = 50
+
+# Only these fields are kept from each stored record
+SNAPSHOT_COLUMNS = ["survey_id", "timestamp", "respondent_lang", "A1"] + SCALE_COLUMNS
+
+
+class Snapshot(NamedTuple):
+    loaded_at: datetime
+    rows: object  # DataFrame of SNAPSHOT_COLUMNS, newest first
+    daily: object  # submissions per day
+    languages: object  # submissions and share per respondent language
+    distributions: dict  # scale -> count per score value
+    bands: object  # scale x band level counts
+
+
+def build_snapshot(records):
+    """Projects store records to SNAPSHOT_COLUMNS and precomputes every panel."""
+    import pandas as pd
+
+    rows = pd.DataFrame.from_records(
+        ({col: record.get(col) for col in SNAPSHOT_COLUMNS} for record in records),
+        columns=SNAPSHOT_COLUMNS,
+    )
+    rows["timestamp"] = pd.to_datetime(rows["timestamp"], errors="coerce")
+    # Rows saved before respondent_lang existed
+    rows["respondent_lang"] = rows["respondent_lang"].fillna("unknown")
+    for scale in SCALE_COLUMNS:
+        # Google Sheets returns numbers as text
+        rows[scale] = pd.to_numeric(rows[scale], errors="coerce").astype("Int64")
+    rows = rows.sort_values("timestamp", ascending=False, na_position="last").reset_index(drop=True)
+
+    daily = rows.groupby(rows["timestamp"].dt.date).size().rename("submissions")
+
+    counts = rows["respondent_lang"].value_counts()
+    languages = pd.DataFrame({"submissions": counts, "share": (counts / max(len(rows), 1)).round(3)})
+
+    distributions = {
+        scale: rows[scale].dropna().astype("int64").value_counts().sort_index().rename("respondents")
+        for scale in SCALE_COLUMNS
+    }
+
+    band_counts = {}
+    for scale in SCALE_COLUMNS:
+        if scale not in SCORE_INTERPRETATIONS:
+            continue
+        scores = rows[scale].astype("float64").to_numpy()
+        levels = pd.Series(interpret_scores(scale, scores, "en")).fillna("no score")
+        band_counts[scale] = levels.value_counts()
+    bands = pd.DataFrame(band_counts).T.fillna(0).astype("int64")
+    # Low → High as the bands are defined, unscored rows last
+    level_order = list(dict.fromkeys(
+        band["level"] for bands_by_lang in SCORE_INTERPRETATIONS.values() for band in bands_by_lang["en"]
+    )) + ["no score"]
+    bands = bands[[level for level in level_order if level in bands.columns]]
+
+    return Snapshot(datetime.now(), rows, daily, languages, distributions, bands)
+
+
+@st.cache_resource(ttl=ADMIN_CACHE_TTL, show_spinner="Loading responses…")
+def load_snapshot():
+    """The shared, TTL-evicted Snapshot; treat it as read-only."""
+    return build_snapshot(get_store().scan())
+
+
+# --------------------------------------------------
+# Access
+# --------------------------------------------------
+def admin_password():
+    """[admin] password from Streamlit secrets, else TRAIL_ADMIN_PASSWORD."""
+    try:
+        password = st.secrets.get("admin", {}).get("password")
+    except Exception:
+        password = None  # no secrets file
+    return password or os.environ.get("TRAIL_ADMIN_PASSWORD")
+
+
+def require_admin():
+    """Shows a password form until the session has logged in. Returns True once it has."""
+    if st.session_state.get("admin_authenticated"):
+        return True
+
+    expected = admin_password()
+    if not expected:
+        st.error("The admin page is disabled: no admin password is configured.")
+        return False
+
+    with st.form("admin_login"):
+        entered = st.text_input("Admin password", type="password")
+        submitted = st.form_submit_button("Log in")
+    if submitted:
+        if hmac.compare_digest(entered.encode("utf-8"), expected.encode("utf-8")):
+            st.session_state.admin_authenticated = True
+            st.rerun()
+        st.error("Wrong password.")
+    return False
+
+
+# --------------------------------------------------
+# Page
+# --------------------------------------------------
+def paginated_table(frame, key, page_size=PAGE_SIZE):
+    """Shows one page of `frame`, with a page picker when there is more than one."""
+    pages = max((len(frame) - 1) // page_size + 1, 1)
+    page = 1
+    if pages > 1:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key=key)
+    start = (page - 1) * page_size
+    st.dataframe(frame.iloc[start:start + page_size], hide_index=True)
+    st.caption(f"Rows {start + 1 if len(frame) else 0}–{min(start + page_size, len(frame))} of {len(frame):,}")
+
+
+def show_admin():
+    st.title("Results dashboard")
+    if not require_admin():
+        return
+
+    snapshot = load_snapshot()
+    rows = snapshot.rows
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.caption(f"{len(rows):,} submissions, snapshot from {snapshot.loaded_at:%Y-%m-%d %H:%M:%S}, "
+                   f"refreshed every {ADMIN_CACHE_TTL} s")
+    with col2:
+        if st.button("Refresh now"):
+            load_snapshot.clear()
+            st.rerun()
+
+    if rows.empty:
+        st.info("No submissions yet.")
+        return
+
+    st.subheader("Submissions per day")
+    st.bar_chart(snapshot.daily)
+
+    st.subheader("Completed surveys by language")
+    st.dataframe(snapshot.languages)
+
+    st.subheader("Score distributions")
+    scale = st.selectbox("Scale", SCALE_COLUMNS, key="admin_scale")
+    st.bar_chart(snapshot.distributions[scale])
+
+    st.subheader("Interpretation bands")
+    st.dataframe(snapshot.bands)
+
+    st.subheader("Submissions")
+    lang = st.selectbox("Language", ["all"] + list(snapshot.languages.index), key="admin_lang")
+    table = rows if lang == "all" else rows[rows["respondent_lang"] == lang]
+    paginated_table(table, key=f"admin_page_{lang}")
+
+    st.subheader("Export")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        fmt = st.selectbox("Format", list(FORMATS), key="admin_export_format")
+    with col2:
+        langs = st.multiselect("Languages (all if empty)", list(snapshot.languages.index), key="admin_export_langs")
+    matching = len(rows) if not langs else int(rows["respondent_lang"].isin(langs).sum())
+    parts = max(1, -(-matching // DOWNLOAD_PART_ROWS))
+    with col3:
+        part = st.number_input("Part", min_value=1, max_value=parts, value=1, key="admin_export_part")
+    mime, suffix = FORMATS[fmt]
+
+    def download():
+        store = get_store()
+        return export_part(iter_records(store, langs=langs), fmt, part - 1, columns=store.columns())
+
+    st.download_button(
+        f"Download {fmt.upper()} part {part} of {parts}",
+        # Runs only on click, reading the store rather than the snapshot
+        data=download,
+        file_name=f"responses-part{part}{suffix}",
+        mime=mime,
+        on_click="ignore",
+    )
+    st.caption(
+        f"Each part holds up to {DOWNLOAD_PART_ROWS:,} rows. For every row in one file, "
+        f"run `python export.py responses{suffix}` on the server."
+    )
@@ -0,0 +1,227 @@
+"""
+Running population statistics, updated as submissions are written.
+
+For every scale and every (age group, language) cell, plus the "*" totals
+over either or both, RunningAggregates keeps count, sum, sum of squares,
+min, max and a histogram of exact scores. Adding a record touches a fixed
+number of cells, so the cost does not grow with the number of responses.
+The histogram gives percentiles without a rescan.
+
+The numbers live in a JSON file next to the response store and can be
+rebuilt from the store at any time:
+
+    python aggregates.py show WHO_total --age 18–25
+    python aggregates.py verify      # rebuild in memory and compare
+    python aggregates.py rebuild     # rebuild and overwrite the file
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+
+from storage import as_int, get_store, sidecar_path
+from trail_core.scoring import SCALE_COLUMNS
+
+AGE_ITEM = "A1"
+ALL = "*"
+FORMAT_VERSION = 1
+
+
+def aggregates_path(store):
+    """Where the aggregates of a store are kept: beside its file or directory."""
+    return sidecar_path(store, "aggregates.json", env="TRAIL_AGGREGATES_PATH")
+
+
+class RunningAggregates:
+    """
+    Cells are keyed "scale|age group|language" and hold
+    [count, sum, sum of squares, min, max, {score: count}].
+    """
+
+    def __init__(self, cells=None, rows=0):
+        self.cells = cells if cells is not None else {}
+        self.rows = rows
+        self._lock = threading.Lock()
+
+    def add(self, record):
+        age = str(record.get(AGE_ITEM) or "unknown")
+        lang = str(record.get("respondent_lang") or "unknown")
+        with self._lock:
+            self.rows += 1
+            for scale in SCALE_COLUMNS:
+                score = as_int(record.get(scale))
+                if score is None:
+                    continue
+                for cell_age, cell_lang in ((age, lang), (age, ALL), (ALL, lang), (ALL, ALL)):
+                    self._update(f"{scale}|{cell_age}|{cell_lang}", score)
+
+    def add_many(self, records):
+        for record in records:
+            self.add(record)
+
+    def _update(self, key, score):
+        cell = self.cells.get(key)
+        if cell is None:
+            self.cells[key] = [1, score, score * score, score, score, {str(score): 1}]
+            return
+        cell[0] += 1
+        cell[1] += score
+        cell[2] += score * score
+        cell[3] = min(cell[3], score)
+        cell[4] = max(cell[4], score)
+        histogram = cell[5]
+        histogram[str(score)] = histogram.get(str(score), 0) + 1
+
+    def stats(self, scale, age=ALL, lang=ALL):
+        """count, mean, std, min, max and histogram of one cell; None if empty."""
+        with self._lock:
+            cell = self.cells.get(f"{scale}|{age}|{lang}")
+            if cell is None:
+                return None
+            count, total, squares, low, high, histogram = cell
+            histogram = {int(score): n for score, n in histogram.items()}
+        mean = total / count
+        variance = (squares - count * mean * mean) / (count - 1) if count > 1 else 0.0
+        return {
+            "count": count,
+            "mean": mean,
+            "std": max(variance, 0.0) ** 0.5,
+            "min": low,
+            "max": high,
+            "histogram": dict(sorted(histogram.items())),
+        }
+
+    def percentile(self, scale, pct, age=ALL, lang=ALL):
+        """Smallest score with at least `pct` percent of the cell at or below it."""
+        stats = self.stats(scale, age, lang)
+        if stats is None:
+            return None
+        target = pct / 100 * stats["count"]
+        seen = 0
+        for score, n in stats["histogram"].items():
+            seen += n
+            if seen >= target:
+                return score
+        return stats["max"]
+
+    def percentile_rank(self, scale, score, age=ALL, lang=ALL):
+        """Percent of the cell scoring at or below `score` (0–100)."""
+        stats = self.stats(scale, age, lang)
+        if stats is None:
+            return None
+        at_or_below = sum(n for s, n in stats["histogram"].items() if s <= score)
+        return 100 * at_or_below / stats["count"]
+
+    def groups(self, field):
+        """Values seen for "age" or "lang", without the "*" total."""
+        index = {"age": 1, "lang": 2}[field]
+        with self._lock:
+            return sorted({key.split("|")[index] for key in self.cells} - {ALL})
+
+    def to_dict(self):
+        with self._lock:
+            return {"version": FORMAT_VERSION, "rows": self.rows, "cells": self.cells}
+
+    def dumps(self):
+        """JSON text of to_dict(), serialised while no update can run."""
+        with self._lock:
+            return json.dumps(
+                {"version": FORMAT_VERSION, "rows": self.rows, "cells": self.cells},
+                ensure_ascii=False, separators=(",", ":"),
+            )
+
+    def __eq__(self, other):
+        if not isinstance(other, RunningAggregates):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported aggregates format: {data.get('version')!r}")
+        return cls(data["cells"], data["rows"])
+
+
+class AggregateFile:
+    """A RunningAggregates persisted as JSON, replaced atomically on save."""
+
+    def __init__(self, path):
+        self.path = path
+        self.aggregates = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return RunningAggregates.from_dict(json.load(f))
+        except FileNotFoundError:
+            return RunningAggregates()
+        except ValueError as e:
+            # Unreadable or from another format: start over rather than block writes
+            logging.warning("Ignoring aggregates file %s (%s); run 'python aggregates.py rebuild'", self.path, e)
+            return RunningAggregates()
+
+    def add_many(self, records):
+        """Adds the records and saves; called once per written batch."""
+        self.aggregates.add_many(records)
+        self.save()
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.aggregates.dumps())
+        os.replace(tmp_path, self.path)
+
+
+def rebuild(store):
+    """Recomputes the aggregates from every record in the store."""
+    aggregates = RunningAggregates()
+    aggregates.add_many(store.scan())
+    return aggregates
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backend", help="store backend, overriding the configuration")
+    parser.add_argument("--path", help="store path, overriding the configuration")
+    commands = parser.add_subparsers(dest="command", required=True)
+    show_cmd = commands.add_parser("show", help="print one cell with percentiles")
+    show_cmd.add_argument("scale", choices=SCALE_COLUMNS)
+    show_cmd.add_argument("--age", default=ALL)
+    show_cmd.add_argument("--lang", default=ALL)
+    commands.add_parser("verify", help="compare the file with a fresh rebuild")
+    commands.add_parser("rebuild", help="rebuild the file from the store")
+    args = parser.parse_args(argv)
+
+    store = get_store(args.backend, args.path)
+    agg_file = AggregateFile(aggregates_path(store))
+
+    if args.command == "show":
+        stats = agg_file.aggregates.stats(args.scale, args.age, args.lang)
+        if stats is None:
+            print("No data")
+            return 1
+        print(f"{args.scale} age={args.age} lang={args.lang}: n={stats['count']} "
+              f"mean={stats['mean']:.2f} std={stats['std']:.2f} min={stats['min']} max={stats['max']}")
+        for pct in (10, 25, 50, 75, 90):
+            print(f"  p{pct}: {agg_file.aggregates.percentile(args.scale, pct, args.age, args.lang)}")
+        return 0
+
+    fresh = rebuild(store)
+    if args.command == "rebuild":
+        agg_file.aggregates = fresh
+        agg_file.save()
+        print(f"Rebuilt {agg_file.path} from {fresh.rows} records")
+        return 0
+
+    if fresh == agg_file.aggregates:
+        print(f"{agg_file.path} matches the store ({fresh.rows} records)")
+        return 0
+    print(f"{agg_file.path} differs from the store: {agg_file.aggregates.rows} rows counted, "
+          f"{fresh.rows} stored; run 'rebuild'")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,438 @@
+"""
+Columnar analytics over stored responses.
+
+Responses are copied from the configured ResponseStore into a Parquet
+dataset partitioned by submission date and respondent language:
+
+    <root>/date=YYYY-MM-DD/lang=xx/part-*.parquet
+
+Queries stream record batches through pyarrow.dataset with only the columns
+they need and with filters pushed down to partitions and row groups, then
+merge small per-batch partial aggregates. Memory depends on the number of
+groups, not on the number of rows. Usage, from the repository root:
+
+    python analytics.py sync                       # copy new rows from the store
+    python analytics.py compact                    # merge small files per partition
+    python analytics.py dist cognitive_efficiency --by A1
+    python analytics.py dist sleep_quality --by B1 --lang hi --since 2026-01-01
+    python analytics.py crosstab A6 B1 --where A7=Urban
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import uuid
+from itertools import islice
+
+from storage import as_int, get_store
+from survey_schema import QUESTION_IDS
+from trail_core.scoring import SCALE_COLUMNS
+
+ANALYTICS_ROOT = os.environ.get("TRAIL_ANALYTICS_PATH", "analytics_parquet")
+SYNCED_IDS_NAME = "_synced_ids.sqlite3"  # SubmissionIndex of the survey_ids copied so far
+MANIFEST_NAME = "_manifest.json"  # row count kept by older syncs, replaced by the index
+COMPACT_MARKER = "_compacting.json"
+ROW_GROUP_SIZE = 128 * 1024
+COMPACT_MIN_FILES = 8  # sync compacts partitions that reached this many files
+PARTITION_COLUMNS = ("date", "lang")
+
+
+def dataset_schema():
+    """Fixed column layout of every file, so files from any source line up."""
+    import pyarrow as pa
+
+    return pa.schema(
+        [("survey_id", pa.string()), ("timestamp", pa.string())]
+        + [(q_id, pa.string()) for q_id in QUESTION_IDS]
+        + [(scale, pa.int32()) for scale in SCALE_COLUMNS]
+        + [(name, pa.string()) for name in PARTITION_COLUMNS]
+    )
+
+
+def _partitioning():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    return ds.partitioning(
+        pa.schema([(name, pa.string()) for name in PARTITION_COLUMNS]), flavor="hive"
+    )
+
+
+def normalise(record):
+    """One stored record as a row of dataset_schema()."""
+    timestamp = str(record.get("timestamp") or "")
+    row = {
+        "survey_id": str(record.get("survey_id", "")),
+        "timestamp": timestamp,
+        "date": timestamp[:10] or "unknown",
+        # The saved "lang" is always "en" (answers are stored in English);
+        # respondent_lang is the language the survey was taken in
+        "lang": record.get("respondent_lang") or "unknown",
+    }
+    for q_id in QUESTION_IDS:
+        value = record.get(q_id)
+        row[q_id] = None if value in (None, "") else str(value)
+    for scale in SCALE_COLUMNS:
+        row[scale] = as_int(record.get(scale))
+    return row
+
+
+# --------------------------------------------------
+# Ingest
+# --------------------------------------------------
+def write_rows(rows, root=ANALYTICS_ROOT, name=None):
+    """
+    Writes normalised rows as new files under their date/lang partitions,
+    named part-<name>-<i>.parquet (`name` defaults to a fresh uuid).
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    if not rows:
+        return
+    table = pa.Table.from_pylist(rows, schema=dataset_schema())
+    ds.write_dataset(
+        table,
+        root,
+        format="parquet",
+        partitioning=_partitioning(),
+        basename_template=f"part-{name or uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        # One row group per partition file instead of one per input slice
+        min_rows_per_group=ROW_GROUP_SIZE,
+        max_rows_per_group=ROW_GROUP_SIZE,
+    )
+
+
+def compact(root=ANALYTICS_ROOT, min_files=COMPACT_MIN_FILES):
+    """
+    Rewrites every partition holding `min_files` or more files as a single
+    file. One partition is one day in one language, so it fits in memory.
+    Returns the number of partitions rewritten.
+
+    A marker listing the files being replaced is written before the merged
+    file appears and removed after they are gone, so a crash in between
+    never leaves rows counted twice: readers skip the replaced files and
+    the next compact or sync deletes them.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    _recover(root)
+    rewritten = 0
+    for part_dir in sorted(glob.glob(os.path.join(root, "date=*", "lang=*"))):
+        files = sorted(glob.glob(os.path.join(part_dir, "*.parquet")))
+        if len(files) < min_files:
+            continue
+        table = pa.concat_tables([pq.ParquetFile(path).read() for path in files])
+        final_path = os.path.join(part_dir, f"part-{uuid.uuid4().hex}-c.parquet")
+        # Temp name first; the "." prefix keeps readers from picking it up
+        tmp_path = os.path.join(part_dir, "." + os.path.basename(final_path))
+        pq.write_table(table, tmp_path, row_group_size=ROW_GROUP_SIZE)
+        marker = {"merged": os.path.basename(final_path), "replaces": [os.path.basename(p) for p in files]}
+        _write_json(os.path.join(part_dir, COMPACT_MARKER), marker)
+        os.replace(tmp_path, final_path)
+        _finish_compaction(part_dir, marker)
+        rewritten += 1
+    return rewritten
+
+
+def _finish_compaction(part_dir, marker):
+    """Deletes the files a merged file replaced (if it made it), then the marker."""
+    if os.path.exists(os.path.join(part_dir, marker["merged"])):
+        for name in marker["replaces"]:
+            if os.path.exists(os.path.join(part_dir, name)):
+                os.remove(os.path.join(part_dir, name))
+    else:
+        tmp_path = os.path.join(part_dir, "." + marker["merged"])
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    os.remove(os.path.join(part_dir, COMPACT_MARKER))
+
+
+def _compaction_markers(root):
+    """(partition dir, marker) of every compaction a crash interrupted."""
+    for path in glob.glob(os.path.join(root, "date=*", "lang=*", COMPACT_MARKER)):
+        with open(path, "r", encoding="utf-8") as f:
+            yield os.path.dirname(path), json.load(f)
+
+
+def _superseded(root):
+    """Paths of files whose rows already are in a merged file."""
+    superseded = set()
+    for part_dir, marker in _compaction_markers(root):
+        if os.path.exists(os.path.join(part_dir, marker["merged"])):
+            superseded.update(os.path.normpath(os.path.join(part_dir, name)) for name in marker["replaces"])
+    return superseded
+
+
+def _write_json(path, value):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(value, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+
+
+def _synced_ids(root):
+    from dedup import SubmissionIndex
+
+    os.makedirs(root, exist_ok=True)
+    return SubmissionIndex(os.path.join(root, SYNCED_IDS_NAME))
+
+
+def _recover(root):
+    """
+    Cleans up after a crash: deletes the files of a sync chunk whose ids
+    were never recorded (sync writes them again) and finishes interrupted
+    compactions.
+    """
+    if os.path.exists(os.path.join(root, SYNCED_IDS_NAME)):
+        synced = _synced_ids(root)
+        chunk = synced.meta("pending_chunk")
+        if chunk:
+            for path in glob.glob(os.path.join(root, "date=*", "lang=*", f"part-{chunk}-*.parquet")):
+                os.remove(path)
+            synced.add((), meta={"pending_chunk": None})
+    for part_dir, marker in list(_compaction_markers(root)):
+        _finish_compaction(part_dir, marker)
+
+
+def sync(store, root=ANALYTICS_ROOT, chunk_size=50_000):
+    """
+    Appends the store rows not yet in the dataset, in chunks of `chunk_size`.
+    What was copied is tracked by survey_id, not by position, so rows the
+    store deletes, dedups or reorders never shift it. Each chunk's ids are
+    recorded only after its files are written; files of a chunk a crash cut
+    short are deleted and written again by the next sync. Returns the
+    number of new rows.
+    """
+    _recover(root)
+    synced = _synced_ids(root)
+    if not synced.is_built():
+        # New dataset, or one synced by row count: index what it already holds
+        synced.rebuild_from(_dataset_ids(root))
+        if os.path.exists(os.path.join(root, MANIFEST_NAME)):
+            os.remove(os.path.join(root, MANIFEST_NAME))
+
+    records = store.scan()
+    added = 0
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+        known = synced.known(str(r.get("survey_id", "")) for r in chunk)
+        rows = {}
+        for record in chunk:
+            row = normalise(record)
+            if row["survey_id"] not in known:
+                rows[row["survey_id"]] = row  # a repeat within the store keeps its latest copy
+        if not rows:
+            continue
+        name = uuid.uuid4().hex
+        synced.add((), meta={"pending_chunk": name})
+        write_rows(list(rows.values()), root, name)
+        synced.add(rows, meta={"pending_chunk": None})
+        added += len(rows)
+    if added:
+        compact(root)
+    return added
+
+
+def _dataset_ids(root):
+    for batch in _batches(["survey_id"], None, root):
+        yield from batch.column(0).to_pylist()
+
+
+# --------------------------------------------------
+# Queries
+# --------------------------------------------------
+def open_dataset(root=ANALYTICS_ROOT):
+    import pyarrow.dataset as ds
+
+    # Files starting with "_" or "." (the sync index, compaction markers and
+    # temp files) are skipped by pyarrow
+    return ds.dataset(root, format="parquet", partitioning=_partitioning(), schema=dataset_schema())
+
+
+def build_filter(where=None, lang=None, since=None, until=None):
+    """
+    Turns simple conditions into a pushed-down dataset filter.
+    `where` maps a column to a value or a list of values; `since` and
+    `until` are inclusive ISO dates matched against the date partition.
+    """
+    import pyarrow.dataset as ds
+
+    conditions = []
+    for column, value in (where or {}).items():
+        field = ds.field(column)
+        if isinstance(value, (list, tuple, set)):
+            conditions.append(field.isin(list(value)))
+        else:
+            conditions.append(field == value)
+    if lang:
+        conditions.append(ds.field("lang") == lang)
+    if since:
+        conditions.append(ds.field("date") >= since)
+    if until:
+        conditions.append(ds.field("date") <= until)
+    if not conditions:
+        return None
+    expression = conditions[0]
+    for condition in conditions[1:]:
+        expression = expression & condition
+    return expression
+
+
+def _batches(columns, filter, root, batch_size=64 * 1024):
+    """
+    Record batches of `columns` for rows matching `filter`, one file at a
+    time. Partitions the filter rules out are never opened.
+    """
+    dataset = open_dataset(root)
+    superseded = _superseded(root)
+    for fragment in dataset.get_fragments(filter=filter):
+        if os.path.normpath(fragment.path) in superseded:
+            continue  # a crash interrupted compaction; its rows are in the merged file
+        # A fresh fragment per file: the dataset's own fragments keep every
+        # footer they read, which adds up to hundreds of MB over many files
+        fresh = dataset.format.make_fragment(
+            fragment.path, filesystem=fragment.filesystem,
+            partition_expression=fragment.partition_expression,
+        )
+        for batch in fresh.to_batches(schema=dataset.schema, columns=list(columns),
+                                      filter=filter, batch_size=batch_size):
+            if batch.num_rows:
+                yield batch
+
+
+def score_summary(score, by, filter=None, root=ANALYTICS_ROOT):
+    """
+    count, mean, std, min and max of a score per value of `by` (a column
+    name or list of names). Returns a pandas DataFrame indexed by `by`.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    keys = [by] if isinstance(by, str) else list(by)
+    partials = []
+    for batch in _batches(keys + [score], filter, root):
+        table = pa.Table.from_batches([batch])
+        values = pc.cast(table[score], pa.float64())
+        table = table.append_column("_sq", pc.multiply(values, values))
+        partials.append(table.group_by(keys).aggregate([
+            (score, "count"), (score, "sum"), ("_sq", "sum"), (score, "min"), (score, "max"),
+        ]))
+    if not partials:
+        import pandas as pd
+        return pd.DataFrame(columns=keys + ["count", "mean", "std", "min", "max"]).set_index(keys)
+
+    merged = pa.concat_tables(partials).group_by(keys).aggregate([
+        (f"{score}_count", "sum"), (f"{score}_sum", "sum"), ("_sq_sum", "sum"),
+        (f"{score}_min", "min"), (f"{score}_max", "max"),
+    ]).to_pandas()
+
+    count = merged[f"{score}_count_sum"]
+    mean = merged[f"{score}_sum_sum"] / count
+    # Sample standard deviation from the running sums
+    var = (merged["_sq_sum_sum"] - count * mean * mean) / (count - 1)
+    out = merged[keys].copy()
+    out["count"] = count.astype("int64")
+    out["mean"] = mean
+    out["std"] = var.clip(lower=0) ** 0.5
+    out["min"] = merged[f"{score}_min_min"]
+    out["max"] = merged[f"{score}_max_max"]
+    return out.sort_values(keys).set_index(keys)
+
+
+def crosstab(rows, columns, filter=None, root=ANALYTICS_ROOT):
+    """Respondent counts for every pair of values of two columns."""
+    import pyarrow as pa
+
+    partials = []
+    for batch in _batches([rows, columns], filter, root):
+        partials.append(pa.Table.from_batches([batch]).group_by([rows, columns]).aggregate([([], "count_all")]))
+    if not partials:
+        import pandas as pd
+        return pd.DataFrame()
+    counts = pa.concat_tables(partials).group_by([rows, columns]).aggregate([("count_all", "sum")])
+    return (
+        counts.to_pandas()
+        .pivot(index=rows, columns=columns, values="count_all_sum")
+        .fillna(0)
+        .astype("int64")
+    )
+
+
+def score_distribution(score, by, filter=None, root=ANALYTICS_ROOT):
+    """Respondent counts per score value within each group of `by`."""
+    return crosstab(by, score, filter, root)
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+def _parse_where(items):
+    where = {}
+    for item in items or ():
+        column, _, value = item.partition("=")
+        if not value:
+            raise SystemExit(f"--where expects COLUMN=VALUE[,VALUE...], got {item!r}")
+        values = value.split(",")
+        where[column] = values if len(values) > 1 else values[0]
+    return where
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--root", default=ANALYTICS_ROOT, help="dataset directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sync_cmd = commands.add_parser("sync", help="copy rows not yet synced from the configured store")
+    sync_cmd.add_argument("--backend", help="store backend, overriding the configuration")
+    sync_cmd.add_argument("--path", help="store path, overriding the configuration")
+
+    compact_cmd = commands.add_parser("compact", help="merge each partition into one file")
+    compact_cmd.add_argument("--min-files", type=int, default=2)
+
+    dist_cmd = commands.add_parser("dist", help="score summary per group")
+    dist_cmd.add_argument("score", choices=SCALE_COLUMNS)
+    dist_cmd.add_argument("--by", nargs="+", default=["A1"])
+    dist_cmd.add_argument("--histogram", action="store_true", help="counts per score value instead")
+
+    tab_cmd = commands.add_parser("crosstab", help="counts for two items, e.g. A6 B1")
+    tab_cmd.add_argument("rows")
+    tab_cmd.add_argument("columns")
+
+    for cmd in (dist_cmd, tab_cmd):
+        cmd.add_argument("--where", nargs="*", metavar="COLUMN=VALUE")
+        cmd.add_argument("--lang")
+        cmd.add_argument("--since", help="first date, YYYY-MM-DD")
+        cmd.add_argument("--until", help="last date, YYYY-MM-DD")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "sync":
+        added = sync(get_store(args.backend, args.path), args.root)
+        print(f"Added {added} rows to {args.root}")
+        return 0
+
+    if args.command == "compact":
+        print(f"Compacted {compact(args.root, args.min_files)} partitions in {args.root}")
+        return 0
+
+    filter = build_filter(_parse_where(args.where), args.lang, args.since, args.until)
+    if args.command == "dist" and args.histogram:
+        result = score_distribution(args.score, args.by[0], filter, args.root)
+    elif args.command == "dist":
+        result = score_summary(args.score, args.by, filter, args.root)
+    else:
+        result = crosstab(args.rows, args.columns, filter, args.root)
+    print(result.to_string(float_format=lambda v: f"{v:.2f}"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
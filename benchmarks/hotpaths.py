@@ -0,0 +1,241 @@
+"""
+Micro-benchmarks for the scoring, translation and interpretation hot paths.
+
+Every benchmark runs over a synthetic respondent population per language
+(en/hi/mr) and size, --repeat times, and reports the median ops/sec,
+p50/p99 latency per call and the peak memory allocated while running.
+Latency percentiles come from a fixed-size reservoir sample, so memory does
+not grow with the number of calls. Usage, from the repository root:
+
+    python benchmarks/hotpaths.py                          # sizes 1, 100, 10000
+    python benchmarks/hotpaths.py --sizes 1 1000 1000000 --repeat 1
+    python benchmarks/hotpaths.py --save-baseline benchmarks/baseline.json
+    python benchmarks/hotpaths.py --baseline benchmarks/baseline.json --threshold 0.2
+
+With --baseline the run exits with status 1 when any benchmark's median
+ops/sec drops more than --threshold (a fraction) below the stored value.
+Benchmarks with fewer than --min-ops calls or under --min-seconds of timed
+work per run are too noisy to gate on and are only reported.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trail_core import compute_scores, interpret_score, map_to_english, score_numeric  # noqa: E402
+from trail_core.catalog import UI_KEYS, get_catalog, t, t_question  # noqa: E402
+from trail_core.interpretation import SCORE_INTERPRETATIONS  # noqa: E402
+
+LANGS = ("en", "hi", "mr")
+DEFAULT_SIZES = (1, 100, 10_000)
+RESERVOIR_SIZE = 100_000  # latency samples kept per benchmark, whatever its size
+
+
+def population(lang, size, seed=0):
+    """Yields `size` random respondents answering every question in `lang`."""
+    rng = random.Random(f"{seed}:{lang}")
+    questions = [
+        (q_id, data["opts"])
+        for q_id, data in get_catalog().translations[lang]["Q"].items()
+    ]
+    for _ in range(size):
+        yield {q_id: rng.choice(opts) for q_id, opts in questions}
+
+
+def _answers(lang, size, seed):
+    for res in population(lang, size, seed):
+        yield from res.items()
+
+
+def _scores(lang, size, seed):
+    rng = random.Random(f"{seed}:{lang}:scores")
+    scales = [
+        (name, min(r["range"][0] for r in bands["en"]), max(r["range"][1] for r in bands["en"]))
+        for name, bands in SCORE_INTERPRETATIONS.items()
+    ]
+    for _ in range(size):
+        name, low, high = rng.choice(scales)
+        yield name, rng.randint(low, high)
+
+
+def _cycle(items, size):
+    for i in range(size):
+        yield items[i % len(items)]
+
+
+# name -> (make work items, call one item); one item is one measured op
+BENCHMARKS = {
+    "compute_scores": (
+        lambda lang, size, seed: population(lang, size, seed),
+        lambda lang: lambda res: compute_scores(res, lang),
+    ),
+    "score_numeric": (
+        _answers,
+        lambda lang: lambda qa: score_numeric(qa[0], qa[1], lang),
+    ),
+    "map_to_english": (
+        _answers,
+        lambda lang: lambda qa: map_to_english(qa[0], qa[1], lang),
+    ),
+    "interpret_score": (
+        _scores,
+        lambda lang: lambda s: interpret_score(s[0], s[1], lang),
+    ),
+    "t": (
+        lambda lang, size, seed: _cycle(UI_KEYS, size),
+        lambda lang: lambda key: t(lang, key),
+    ),
+    "t_question": (
+        lambda lang, size, seed: _cycle(list(get_catalog().translations[lang]["Q"]), size),
+        lambda lang: lambda q_id: t_question(lang, q_id),
+    ),
+}
+
+
+class Reservoir:
+    """Uniform sample of at most `size` values from a stream (Vitter's algorithm R)."""
+
+    def __init__(self, size, seed=0):
+        self.size = size
+        self.values = array("d")
+        self.seen = 0
+        self._rng = random.Random(seed)
+
+    def add(self, value):
+        self.seen += 1
+        if len(self.values) < self.size:
+            self.values.append(value)
+            return
+        slot = self._rng.randrange(self.seen)
+        if slot < self.size:
+            self.values[slot] = value
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_one(name, lang, size, seed=0, repeat=1):
+    make_items, make_call = BENCHMARKS[name]
+    call = make_call(lang)
+    clock = time.perf_counter_ns
+
+    # Timing passes: items generated and latencies sampled outside the timed region
+    latencies = Reservoir(RESERVOIR_SIZE, seed)
+    rates, seconds = [], []
+    for _ in range(repeat):
+        ops = total_ns = 0
+        for item in make_items(lang, size, seed):
+            start = clock()
+            call(item)
+            elapsed = clock() - start
+            total_ns += elapsed
+            ops += 1
+            latencies.add(elapsed)
+        rates.append(ops / (total_ns / 1e9) if total_ns else 0.0)
+        seconds.append(total_ns / 1e9)
+
+    # Memory pass: tracemalloc skews timings, so it runs separately
+    tracemalloc.start()
+    for item in make_items(lang, size, seed):
+        call(item)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ordered = sorted(latencies.values)
+    return {
+        "ops": ops,
+        "repeat": repeat,
+        "seconds": round(statistics.median(seconds), 6),
+        "ops_per_sec": round(statistics.median(rates), 1),
+        "p50_us": round(_percentile(ordered, 50) / 1000, 3),
+        "p99_us": round(_percentile(ordered, 99) / 1000, 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline, threshold, min_ops=1_000, min_seconds=0.05):
+    """
+    (regressions, skipped): benchmarks whose median ops/sec fell more than
+    `threshold` below the baseline, and keys too small on either side to judge.
+    """
+    regressions, skipped = [], []
+    for key, result in results.items():
+        base = baseline.get("results", {}).get(key)
+        if not base or not base.get("ops_per_sec"):
+            continue
+        base_seconds = base.get("seconds", base["ops"] / base["ops_per_sec"])
+        if min(result["ops"], base["ops"]) < min_ops or min(result["seconds"], base_seconds) < min_seconds:
+            skipped.append(key)
+            continue
+        ratio = result["ops_per_sec"] / base["ops_per_sec"]
+        if ratio < 1 - threshold:
+            regressions.append((key, base["ops_per_sec"], result["ops_per_sec"], ratio))
+    return regressions, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--langs", nargs="+", default=list(LANGS), choices=LANGS)
+    parser.add_argument("--bench", nargs="+", default=list(BENCHMARKS), choices=list(BENCHMARKS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark; the median counts")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write results as a baseline JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a stored baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed ops/sec drop against the baseline (default 0.2 = 20%%)")
+    parser.add_argument("--min-ops", type=int, default=1_000, help="smallest call count the gate judges")
+    parser.add_argument("--min-seconds", type=float, default=0.05,
+                        help="shortest timed run, in seconds, the gate judges")
+    args = parser.parse_args(argv)
+
+    get_catalog()  # load once up front so the first benchmark does not pay for it
+
+    results = {}
+    print(f"{'benchmark':<32} {'ops/sec':>14} {'p50 µs':>10} {'p99 µs':>10} {'peak KiB':>10}")
+    for name in args.bench:
+        for lang in args.langs:
+            for size in args.sizes:
+                key = f"{name}/{lang}/{size}"
+                result = run_one(name, lang, size, args.seed, args.repeat)
+                results[key] = result
+                print(f"{key:<32} {result['ops_per_sec']:>14,.0f} {result['p50_us']:>10.3f}"
+                      f" {result['p99_us']:>10.3f} {result['peak_kb']:>10.1f}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": results,
+            }, f, indent=2)
+        print(f"Baseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions, skipped = compare(results, baseline, args.threshold, args.min_ops, args.min_seconds)
+        if skipped:
+            print(f"Not gated (under {args.min_ops:,} ops or {args.min_seconds} s): {', '.join(skipped)}")
+        for key, before, after, ratio in regressions:
+            print(f"REGRESSION {key}: {before:,.0f} -> {after:,.0f} ops/sec ({ratio:.0%} of baseline)")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Cold-start import cost of the app and of trail_core.
+
+Runs `python -X importtime -c "import ..."` in fresh interpreters and reports
+the cumulative import time of each profile's top-level modules (median of
+--runs). Usage, from the repository root:
+
+    python benchmarks/importtime.py
+    python benchmarks/importtime.py --runs 10 --json importtime.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What App.py imports vs what an offline scorer or worker imports
+PROFILES = {
+    "app": ["streamlit", "utils", "UI", "survey_schema", "trail_core"],
+    "core": ["trail_core"],
+}
+
+
+def import_time_us(modules, python=sys.executable):
+    """Sum of the top-level cumulative import times (µs) of `modules`."""
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", "import " + ", ".join(modules)],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    wanted = set(modules)
+    total = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Top-level imports are the ones without indentation after the bar
+        if name.startswith(" ") and not name.startswith("  ") and name.strip() in wanted:
+            total += int(cumulative)
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--profile", choices=sorted(PROFILES), action="append")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.profile or sorted(PROFILES):
+        samples = [import_time_us(PROFILES[name]) / 1000 for _ in range(args.runs)]
+        results[name] = {
+            "modules": PROFILES[name],
+            "median_ms": round(statistics.median(samples), 2),
+            "min_ms": round(min(samples), 2),
+            "max_ms": round(max(samples), 2),
+        }
+        print(f"{name:<6} median {results[name]['median_ms']:>9.2f} ms"
+              f"  (min {results[name]['min_ms']:.2f}, max {results[name]['max_ms']:.2f}, {args.runs} runs)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+"""
+Headless load generator for App.py.
+
+Starts one real `streamlit run App.py` server and drives N simulated
+respondents through the whole flow (intro, sections A–F, final page) over
+its websocket, --concurrency of them at once, with random answers and
+languages, the way browsers would. Submissions go to a throwaway local
+SQLite store and submission log, never to Google Sheets. Usage, from the
+repository root:
+
+    python benchmarks/load_app.py --sessions 50 --concurrency 8
+    python benchmarks/load_app.py --sessions 200 --report load_report.json
+
+The report holds per-rerun wall time, per-page latency percentiles (each
+rerun counted against the page it rendered), server memory per session
+and completed surveys per minute, so releases can be compared.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_ROOT, "App.py")
+
+
+def _stub_storage(workdir):
+    """Environment pointing the app at a local store and log instead of Sheets."""
+    env = dict(os.environ)
+    env["TRAIL_STORAGE_BACKEND"] = "sqlite"
+    env["TRAIL_STORAGE_PATH"] = os.path.join(workdir, "responses.sqlite3")
+    env["TRAIL_SUBMISSION_LOG"] = os.path.join(workdir, "submissions.wal.jsonl")
+    return env
+
+
+def _percentiles(values):
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 2),
+        "p50_ms": round(pct(50), 2),
+        "p90_ms": round(pct(90), 2),
+        "p99_ms": round(pct(99), 2),
+        "max_ms": round(ordered[-1], 2),
+    }
+
+
+# --------------------------------------------------
+# Server
+# --------------------------------------------------
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(env, port, timeout=60.0):
+    """`streamlit run App.py` in a subprocess; returns it once /_stcore/health answers."""
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", APP_PATH,
+            "--server.headless", "true",
+            "--server.port", str(port),
+            "--server.address", "127.0.0.1",
+            "--server.fileWatcherType", "none",
+            "--browser.gatherUsageStats", "false",
+        ],
+        cwd=REPO_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"streamlit exited with status {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"streamlit did not start within {timeout:.0f}s")
+
+
+def _rss_kb(pid):
+    """Resident set size of a process in KiB (Linux /proc), or None."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+# --------------------------------------------------
+# Browser session
+# --------------------------------------------------
+class _TornadoSocket:
+    """send()/recv() over tornado's client, for Streamlit releases without `websockets`."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    async def send(self, data):
+        await self._conn.write_message(data, binary=True)
+
+    async def recv(self):
+        data = await self._conn.read_message()
+        if data is None:
+            raise ConnectionError("websocket closed by the server")
+        return data
+
+
+@contextlib.asynccontextmanager
+async def _websocket(url):
+    """
+    The app's websocket. Newer Streamlit serves it with starlette and
+    depends on `websockets`; older releases run on tornado, which has a
+    client of its own.
+    """
+    try:
+        from websockets.asyncio.client import connect
+    except ImportError:
+        from tornado.websocket import websocket_connect
+
+        conn = await websocket_connect(url, subprotocols=["streamlit"], max_message_size=256 * 1024 * 1024)
+        try:
+            yield _TornadoSocket(conn)
+        finally:
+            conn.close()
+        return
+    async with connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+        yield ws
+
+
+class Session:
+    """
+    One browser tab on the app's websocket. Sends rerun requests with the
+    tab's widget values, as the frontend does, and reads back the elements
+    the script rendered.
+    """
+
+    def __init__(self, ws, timeout):
+        self.ws = ws
+        self.timeout = timeout
+        self.values = {}  # widget id -> WidgetState the tab would send
+        self.elements = {}  # delta path -> (kind, proto) of the last finished run
+
+    async def rerun(self, trigger=None):
+        """
+        Reruns the script with the current widget values (plus a one-off
+        button `trigger`) and waits until it has finished, including any
+        st.rerun() it asks for. Returns the wall time in ms.
+        """
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+
+        msg = BackMsg()
+        msg.rerun_script.SetInParent()  # a rerun with no widget values yet is still a rerun
+        states = msg.rerun_script.widget_states.widgets
+        for state in self.values.values():
+            states.add().CopyFrom(state)
+        if trigger is not None:
+            pressed = states.add()
+            pressed.id = trigger
+            pressed.trigger_value = True
+
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        await asyncio.wait_for(self._read_run(), self.timeout)
+        return (time.perf_counter() - start) * 1000
+
+    async def _read_run(self):
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        while True:
+            msg = ForwardMsg()
+            msg.ParseFromString(await self.ws.recv())
+            kind = msg.WhichOneof("type")
+            if kind == "new_session":
+                # Every script run starts with one; st.rerun() starts another
+                self.elements = {}
+            elif kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                which = element.WhichOneof("type")
+                self.elements[tuple(msg.metadata.delta_path)] = (which, getattr(element, which))
+            elif kind == "script_finished":
+                if msg.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                if msg.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise RuntimeError("App.py failed to compile")
+                # Widgets that are gone are no longer sent, as in the browser
+                shown = {proto.id for which, proto in self.elements.values() if hasattr(proto, "id")}
+                self.values = {wid: state for wid, state in self.values.items() if wid in shown}
+                return
+
+    def widgets(self, kind):
+        """Rendered elements of one kind, in page order."""
+        return [proto for path, (which, proto) in sorted(self.elements.items()) if which == kind]
+
+    def choose(self, widget, index):
+        """Picks an option of a radio or selectbox; both send the option label."""
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        state = WidgetState(id=widget.id)
+        state.string_value = widget.options[index]
+        self.values[widget.id] = state
+
+    def check(self):
+        """Raises on an exception or st.error the last run rendered."""
+        from streamlit.proto.Alert_pb2 import Alert
+
+        for which, proto in self.elements.values():
+            if which == "exception":
+                raise RuntimeError(f"{proto.type}: {proto.message}")
+            if which == "alert" and proto.format == Alert.ERROR:
+                raise RuntimeError(proto.body)
+
+    def page(self):
+        """
+        Page number the last run rendered: 1 for the intro (the language
+        picker), the section page from its progress bar, else the final page.
+        """
+        from survey_schema import FINAL_PAGE, TOTAL_PAGES
+
+        if self.widgets("selectbox"):
+            return 1
+        bars = self.widgets("progress")
+        if bars:
+            # show_progress() draws (page - 1) / TOTAL_PAGES as a 0–100 value
+            return round(bars[0].value * TOTAL_PAGES / 100) + 1
+        return FINAL_PAGE
+
+
+async def run_session(url, seed, timings, timeout, form_mode):
+    """
+    One respondent from intro to final page. Appends (page, ms) for every
+    rerun, `page` being the page that rerun rendered, and returns True when
+    the survey was saved.
+    """
+    from survey_schema import FINAL_PAGE
+
+    rng = random.Random(seed)
+    async with _websocket(url) as ws:
+        session = Session(ws, timeout)
+
+        async def timed(trigger=None):
+            ms = await session.rerun(trigger)
+            session.check()
+            timings.append((session.page(), ms))
+
+        await timed()
+        # Picking a language reruns and relabels the Start button, as in a browser
+        lang_choice = session.widgets("selectbox")[0]
+        session.choose(lang_choice, rng.randrange(len(lang_choice.options)))
+        await timed()
+        await timed(session.widgets("button")[0].id)
+
+        # Batched forms only rerun on Back/Next; otherwise every click reruns
+        while session.page() < FINAL_PAGE:
+            radios = session.widgets("radio")
+            if not radios:
+                raise RuntimeError(f"no questions on page {session.page()}")
+            for radio in radios:
+                session.choose(radio, rng.randrange(len(radio.options)))
+                if not form_mode:
+                    await timed()
+            # Next is the last button of every section page, whatever the language
+            await timed(session.widgets("button")[-1].id)
+        return True
+
+
+async def run_load(url, seeds, concurrency, timeout, form_mode):
+    """
+    Runs every seed's session, `concurrency` at a time. Returns the
+    timings, failures and completed count.
+    """
+    slots = asyncio.Semaphore(concurrency)
+    timings, failures = [], []
+
+    async def one(seed):
+        async with slots:
+            try:
+                return await run_session(url, seed, timings, timeout, form_mode)
+            except Exception as e:
+                failures.append(f"{type(e).__name__}: {e}")
+                return False
+
+    completed = sum(await asyncio.gather(*(one(seed) for seed in seeds)))
+    return {"timings": timings, "failures": failures, "completed": completed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-rerun timeout, seconds")
+    parser.add_argument("--port", type=int, default=0, help="server port (default: a free one)")
+    parser.add_argument("--report", default="load_report.json")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, REPO_ROOT)
+    form_mode = os.environ.get("TRAIL_BATCHED_FORMS", "1") != "0"
+    port = args.port or _free_port()
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    seeds = [args.seed * 100_000 + i for i in range(args.sessions)]
+
+    server = start_server(_stub_storage(tempfile.mkdtemp(prefix="trail-load-")), port)
+    try:
+        # One untimed survey first, so imports and caches are not billed to the load
+        warmup = asyncio.run(run_load(url, [-1], 1, args.timeout, form_mode))
+        if warmup["failures"]:
+            raise RuntimeError(f"warm-up survey failed: {warmup['failures'][0]}")
+        rss_start_kb = _rss_kb(server.pid)
+
+        started = time.perf_counter()
+        result = asyncio.run(run_load(url, seeds, args.concurrency, args.timeout, form_mode))
+        elapsed_s = time.perf_counter() - started
+        rss_end_kb = _rss_kb(server.pid)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    timings, failures, completed = result["timings"], result["failures"], result["completed"]
+    by_page = {}
+    for page, ms in timings:
+        by_page.setdefault(page, []).append(ms)
+    reruns = [ms for _, ms in timings]
+    memory_kb = None
+    if rss_start_kb is not None and rss_end_kb is not None:
+        # Streamlit keeps a finished session's state in memory until it expires
+        memory_kb = round((rss_end_kb - rss_start_kb) / max(args.sessions, 1), 1)
+    report = {
+        "python": platform.python_version(),
+        "sessions": args.sessions,
+        "concurrency": args.concurrency,
+        "batched_forms": form_mode,
+        "completed": completed,
+        "failed": len(failures),
+        "failures": failures[:10],
+        "elapsed_s": round(elapsed_s, 2),
+        "surveys_per_minute": round(completed / elapsed_s * 60, 1) if elapsed_s else 0.0,
+        "reruns_per_survey": round(len(reruns) / max(completed, 1), 1),
+        "rerun": _percentiles(reruns),
+        "pages": {str(page): _percentiles(times) for page, times in sorted(by_page.items())},
+        "server_rss_kb": rss_end_kb,
+        "memory_per_session_kb": memory_kb,
+    }
+
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{completed}/{args.sessions} surveys in {elapsed_s:.1f}s "
+          f"({report['surveys_per_minute']} per minute, concurrency {args.concurrency})")
+    print(f"rerun p50 {report['rerun'].get('p50_ms')} ms, p99 {report['rerun'].get('p99_ms')} ms, "
+          f"{report['reruns_per_survey']} reruns per survey")
+    for page, stats in report["pages"].items():
+        print(f"  page {page}: p50 {stats['p50_ms']} ms, p99 {stats['p99_ms']} ms ({stats['count']} reruns)")
+    if memory_kb is not None:
+        print(f"server memory: {memory_kb:,} KiB per session ({rss_end_kb:,} KiB resident)")
+    print(f"Report written to {args.report}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Cost of one complete survey session, measured with Streamlit's AppTest.
+
+Drives a respondent from the intro to the final page with seeded random
+answers, once with batched forms and once with per-click widgets
+(TRAIL_BATCHED_FORMS=0), and counts the script reruns each needs. The
+batched run also records the messages and bytes sent to the browser for
+each page (TRAIL_SHOW_PAYLOAD's counter). Submissions go to a throwaway
+SQLite store. Last, it compares the memory one full set of answers takes
+as an AnswerSheet with the {question id: option text} dict it replaced.
+Usage, from the repository root:
+
+    python benchmarks/session_cost.py
+    python benchmarks/session_cost.py --lang mr --report session_cost.json
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_ROOT, "App.py")
+
+
+def _setup(workdir):
+    """Local store and log, and metrics on so every rerun is counted."""
+    os.environ["TRAIL_STORAGE_BACKEND"] = "sqlite"
+    os.environ["TRAIL_STORAGE_PATH"] = os.path.join(workdir, "responses.sqlite3")
+    os.environ["TRAIL_SUBMISSION_LOG"] = os.path.join(workdir, "submissions.wal.jsonl")
+    os.environ["TRAIL_METRICS"] = "1"
+    os.environ["TRAIL_SHOW_PAYLOAD"] = "1"
+    sys.path.insert(0, REPO_ROOT)
+    os.chdir(REPO_ROOT)
+
+
+def _script_runs():
+    """Script runs so far: App.py times every run as trail_page_seconds."""
+    import metrics
+
+    return sum(
+        float(value)
+        for value in re.findall(r"^trail_page_seconds_count\{[^}]*\} (\S+)$", metrics.render(), re.M)
+    )
+
+
+def run_survey(lang, seed, per_click, after_run=None):
+    """
+    One respondent through the whole flow. In per-click mode every radio
+    answer is its own run, as a click is in the browser. `after_run(at)` is
+    called after each run. Returns the AppTest at the final page.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    os.environ["TRAIL_BATCHED_FORMS"] = "0" if per_click else "1"
+    rng = random.Random(seed)
+    at = AppTest.from_file(APP_PATH, default_timeout=60)
+
+    def run(action):
+        action.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        if after_run is not None:
+            after_run(at)
+
+    run(at)
+    run(at.selectbox(key="lang_choice").set_value(lang))
+    run(at.button[0].click())
+    while not at.session_state.data_saved and at.radio:
+        for radio in at.radio:
+            radio.set_value(rng.randint(1, len(radio.options)))
+            if per_click:
+                run(radio)
+        run(at.button[-1].click())  # Next
+    if not at.session_state.data_saved:
+        raise RuntimeError("survey did not reach the final page")
+    return at
+
+
+def measure_reruns(lang, seed):
+    import metrics
+
+    reruns = {}
+    for mode, per_click in (("batched_forms", False), ("per_click", True)):
+        metrics.reset()
+        run_survey(lang, seed, per_click)
+        reruns[mode] = int(_script_runs())
+    return reruns
+
+
+def measure_payload(lang, seed):
+    """{page: {"messages", "bytes"}} of the run that first rendered each page (batched forms)."""
+    pages = {}
+
+    def record(at):
+        # Counts of the script run that just finished; see UI.track_forward_messages
+        counts = at.session_state["_forward_msg_stats"]["current"]
+        page = "final" if at.session_state.data_saved else str(at.session_state.page)
+        pages.setdefault(page, dict(counts))
+
+    run_survey(lang, seed, per_click=False, after_run=record)
+    return pages
+
+
+def measure_answer_storage(lang, seed):
+    """
+    Bytes held per session for one full set of random answers: the
+    AnswerSheet (object, code array, details dict) against a dict of the
+    chosen option texts with those strings counted, as session_state held
+    them before. Question ids and the slot map are shared, so not counted.
+    """
+    from survey_schema import QUESTION_IDS
+    from trail_core.answers import AnswerSheet
+    from trail_core.catalog import get_catalog
+
+    catalog = get_catalog()
+    rng = random.Random(seed)
+    sheet, texts = AnswerSheet(QUESTION_IDS), {}
+    for q_id in QUESTION_IDS:
+        options = catalog.question(lang, q_id).get("opts") or ()
+        if options:
+            code = rng.randint(1, len(options))
+            sheet.set(q_id, code)
+            texts[q_id] = options[code - 1]
+    return {
+        "answers": len(texts),
+        "text_dict_bytes": sys.getsizeof(texts) + sum(sys.getsizeof(text) for text in texts.values()),
+        "answer_sheet_bytes": sys.getsizeof(sheet) + sys.getsizeof(sheet.codes) + sys.getsizeof(sheet.details),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lang", default="en", choices=["en", "hi", "mr"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    _setup(tempfile.mkdtemp(prefix="trail-session-"))
+    report = {
+        "lang": args.lang,
+        "reruns_per_survey": measure_reruns(args.lang, args.seed),
+        "payload_per_page": measure_payload(args.lang, args.seed),
+        "answer_storage": measure_answer_storage(args.lang, args.seed),
+    }
+
+    reruns = report["reruns_per_survey"]
+    print(f"Script reruns per completed survey ({args.lang}):")
+    print(f"  per-click widgets: {reruns['per_click']}")
+    print(f"  batched forms:     {reruns['batched_forms']}")
+    print("Sent to the browser per page (batched forms):")
+    for page, counts in report["payload_per_page"].items():
+        print(f"  page {page}: {counts['messages']} msgs / {counts['bytes']:,} B")
+    storage = report["answer_storage"]
+    print(f"Answer storage for {storage['answers']} answers:")
+    print(f"  dict of option text: {storage['text_dict_bytes']:,} B")
+    print(f"  AnswerSheet:         {storage['answer_sheet_bytes']:,} B")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
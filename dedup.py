@@ -0,0 +1,119 @@
+"""
+Persistent index of survey_ids already written to the response store.
+
+SubmissionWriter checks each batch against it before writing, so a record
+that arrives twice (a log replay after a crash, a retry after a timeout) is
+written once. A lookup is one primary-key probe in a local SQLite file,
+whatever the size of the store or its backend; for Google Sheets that
+replaces downloading every row. The index can be rebuilt from the store:
+
+    python dedup.py rebuild
+    python dedup.py check <survey_id>
+"""
+import argparse
+import sys
+import threading
+from itertools import islice
+
+from storage import get_store, select_in, sidecar_path, sqlite_connection
+
+
+def index_path(store):
+    """Where the index of a store is kept: beside its file or directory."""
+    return sidecar_path(store, "submitted_ids.sqlite3", env="TRAIL_DEDUP_INDEX_PATH")
+
+
+class SubmissionIndex:
+    """survey_ids in a WITHOUT ROWID table keyed by the id itself."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS submitted (survey_id TEXT PRIMARY KEY) WITHOUT ROWID")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def _connect(self):
+        return sqlite_connection(self._local, self.path)
+
+    def __contains__(self, survey_id):
+        row = self._connect().execute(
+            "SELECT 1 FROM submitted WHERE survey_id = ?", (survey_id,)
+        ).fetchone()
+        return row is not None
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM submitted").fetchone()[0]
+
+    def known(self, survey_ids):
+        """The subset of `survey_ids` already in the index."""
+        rows = select_in(self._connect(), "SELECT survey_id FROM submitted WHERE survey_id IN ({})", survey_ids)
+        return {row[0] for row in rows}
+
+    def add(self, survey_ids, meta=None):
+        """
+        Adds survey_ids; `meta` ({key: value}, None deleting a key) is
+        updated in the same transaction.
+        """
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO submitted (survey_id) VALUES (?)",
+                ((survey_id,) for survey_id in survey_ids),
+            )
+            for key, value in (meta or {}).items():
+                if value is None:
+                    conn.execute("DELETE FROM meta WHERE key = ?", (key,))
+                else:
+                    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def meta(self, key):
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def is_built(self):
+        """False until a rebuild from the store has finished once."""
+        return self.meta("built") is not None
+
+    def rebuild(self, store, chunk_size=10_000):
+        """Replaces the index with every survey_id in the store. Returns the count."""
+        return self.rebuild_from((r.get("survey_id") for r in store.scan()), chunk_size)
+
+    def rebuild_from(self, survey_ids, chunk_size=10_000):
+        """Replaces the index with the given survey_ids. Returns the count."""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM meta WHERE key = 'built'")
+            conn.execute("DELETE FROM submitted")
+        survey_ids = iter(survey_ids)
+        while True:
+            chunk = list(islice(survey_ids, chunk_size))
+            if not chunk:
+                break
+            self.add(survey_id for survey_id in chunk if survey_id)
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('built', datetime('now'))")
+        return len(self)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backend", help="store backend, overriding the configuration")
+    parser.add_argument("--path", help="store path, overriding the configuration")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild", help="rebuild the index from the store")
+    check_cmd = commands.add_parser("check", help="is a survey_id already written?")
+    check_cmd.add_argument("survey_id")
+    args = parser.parse_args(argv)
+
+    store = get_store(args.backend, args.path)
+    index = SubmissionIndex(index_path(store))
+    if args.command == "rebuild":
+        print(f"Indexed {index.rebuild(store):,} survey_ids in {index.path}")
+        return 0
+    found = args.survey_id in index
+    print(f"{args.survey_id}: {'written' if found else 'not written'}")
+    return 0 if found else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
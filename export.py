@@ -0,0 +1,186 @@
+"""
+Streaming export of stored responses as CSV, JSONL or Arrow.
+
+Records are pulled from ResponseStore.scan() one at a time (Google Sheets
+is read in pages of rows), filtered, projected and encoded in small
+batches, so no step holds the whole dataset. Usage, from the repository root:
+
+    python export.py responses.csv
+    python export.py responses.jsonl --since 2026-01-01 --lang hi mr
+    python export.py scores.arrow --columns survey_id timestamp WHO_total distress_total
+    python export.py - --format csv | gzip > responses.csv.gz
+
+The admin dashboard offers the same formats as downloads of at most
+DOWNLOAD_PART_ROWS rows each (export_part): Streamlit holds a download in
+the app's memory until it is sent, so full exports are run here instead.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from itertools import islice
+
+from storage import as_int, get_store, record_columns
+
+FORMATS = {
+    "csv": ("text/csv", ".csv"),
+    "jsonl": ("application/x-ndjson", ".jsonl"),
+    "arrow": ("application/vnd.apache.arrow.stream", ".arrow"),
+}
+BATCH_ROWS = 1000
+DOWNLOAD_PART_ROWS = 10_000  # rows per dashboard download
+
+
+def iter_records(store, since=None, until=None, langs=None):
+    """
+    Store records filtered by submission date (inclusive YYYY-MM-DD bounds on
+    the timestamp) and respondent language.
+    """
+    langs = set(langs) if langs else None
+    for record in store.scan():
+        date = str(record.get("timestamp") or "")[:10]
+        if since and date < since:
+            continue
+        if until and date > until:
+            continue
+        if langs is not None and record.get("respondent_lang") not in langs:
+            continue
+        yield record
+
+
+def _columns(columns):
+    """The projection, or every column a stored record can have."""
+    return list(columns) if columns else record_columns()
+
+
+def _batches(records, size=BATCH_ROWS):
+    records = iter(records)
+    while True:
+        batch = list(islice(records, size))
+        if not batch:
+            return
+        yield batch
+
+
+def iter_csv(records, columns=None):
+    """CSV text, yielded in chunks of BATCH_ROWS rows after a header."""
+    columns = _columns(columns)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, columns, extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    for batch in _batches(records):
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_jsonl(records, columns=None):
+    """JSON Lines text, yielded in chunks of BATCH_ROWS records."""
+    for batch in _batches(records):
+        if columns:
+            batch = [{col: record.get(col) for col in columns} for record in batch]
+        yield "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in batch)
+
+
+def iter_record_batches(records, columns=None, batch_rows=BATCH_ROWS * 10):
+    """
+    pyarrow RecordBatches with one schema for the whole stream: string
+    columns, except the five scales, which are int64.
+    """
+    import pyarrow as pa
+
+    from trail_core.scoring import SCALE_COLUMNS
+
+    columns = _columns(columns)
+    schema = pa.schema([(col, pa.int64() if col in SCALE_COLUMNS else pa.string()) for col in columns])
+
+    def cell(value, field):
+        if value in (None, ""):
+            return None
+        if pa.types.is_integer(field.type):
+            return as_int(value)  # None for Sheets text that is not a number
+        return str(value)
+
+    for batch in _batches(records, batch_rows):
+        yield pa.RecordBatch.from_pydict(
+            {field.name: [cell(r.get(field.name), field) for r in batch] for field in schema},
+            schema=schema,
+        )
+
+
+def write_export(out, records, fmt, columns=None):
+    """Writes the whole export to a binary file object, batch by batch. Returns rows written."""
+    rows = 0
+
+    def counted(records):
+        nonlocal rows
+        for record in records:
+            rows += 1
+            yield record
+
+    records = counted(records)
+    if fmt == "arrow":
+        import pyarrow as pa
+
+        writer = None
+        for batch in iter_record_batches(records, columns):
+            if writer is None:
+                writer = pa.ipc.new_stream(out, batch.schema)
+            writer.write_batch(batch)
+        if writer is not None:
+            writer.close()
+        return rows
+
+    chunks = iter_csv(records, columns) if fmt == "csv" else iter_jsonl(records, columns)
+    for chunk in chunks:
+        out.write(chunk.encode("utf-8"))
+    return rows
+
+
+def export_part(records, fmt, part, part_rows=DOWNLOAD_PART_ROWS, columns=None):
+    """
+    Part `part` (0-based) of an export as bytes: records part * part_rows
+    up to the next part, each part a complete file with its own header.
+    Memory is bounded by `part_rows`, whatever the size of the store.
+    """
+    out = io.BytesIO()
+    write_export(out, islice(records, part * part_rows, (part + 1) * part_rows), fmt, columns)
+    return out.getvalue()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output", help="output file, or - for stdout")
+    parser.add_argument("--format", choices=FORMATS, help="default: from the output file extension")
+    parser.add_argument("--columns", nargs="+", help="only these columns, in this order (default: every column of the store)")
+    parser.add_argument("--since", help="first submission date, YYYY-MM-DD")
+    parser.add_argument("--until", help="last submission date, YYYY-MM-DD")
+    parser.add_argument("--lang", nargs="+", help="respondent languages to keep")
+    parser.add_argument("--backend", help="store backend, overriding the configuration")
+    parser.add_argument("--path", help="store path, overriding the configuration")
+    args = parser.parse_args(argv)
+
+    fmt = args.format
+    if fmt is None:
+        ext = os.path.splitext(args.output)[1].lower()
+        fmt = next((name for name, (_, suffix) in FORMATS.items() if suffix == ext), "csv")
+
+    store = get_store(args.backend, args.path)
+    records = iter_records(store, args.since, args.until, args.lang)
+    columns = args.columns or store.columns()
+    if args.output == "-":
+        rows = write_export(sys.stdout.buffer, records, fmt, columns)
+    else:
+        with open(args.output, "wb") as out:
+            rows = write_export(out, records, fmt, columns)
+    print(f"Exported {rows:,} rows as {fmt}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+"""
+In-process metrics in Prometheus text format.
+
+Off unless TRAIL_METRICS=1, TRAIL_METRICS_PORT or TRAIL_METRICS_FILE is set.
+When off, timer() hands back one shared no-op context manager and timed()
+returns the function unchanged, so instrumented code pays next to nothing.
+
+    TRAIL_METRICS_PORT=9464   serve /metrics on 127.0.0.1:9464
+    TRAIL_METRICS_FILE=path   rewrite a textfile-collector file every 15 s
+
+Standard library only: the app, workers and CLI tools can all import it.
+"""
+import bisect
+import contextlib
+import functools
+import os
+import threading
+import time
+
+ENABLED = bool(
+    os.environ.get("TRAIL_METRICS") == "1"
+    or os.environ.get("TRAIL_METRICS_PORT")
+    or os.environ.get("TRAIL_METRICS_FILE")
+)
+
+# Upper bounds in seconds, tuned for reruns (ms) up to Sheets calls (s)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# name -> (type, help); every metric the app emits is declared here
+METRICS = {
+    "trail_page_seconds": ("histogram", "Wall time of one script rerun, by navigator branch."),
+    "trail_scoring_seconds": ("histogram", "Time spent computing the five scale scores."),
+    "trail_interpretation_seconds": ("histogram", "Time spent rendering score interpretations."),
+    "trail_sheets_seconds": ("histogram", "Latency of Google Sheets calls, by operation."),
+    "trail_save_seconds": ("histogram", "Latency of one batch write to the response store."),
+    "trail_saved_rows_total": ("counter", "Rows written to the response store."),
+    "trail_errors_total": ("counter", "Exceptions raised inside instrumented code, by exception type."),
+    "trail_sheets_throttled_seconds_total": ("counter", "Seconds Sheets calls waited for a quota token."),
+    "trail_sheets_retries_total": ("counter", "Sheets calls retried after a transient error, by exception type."),
+    "trail_sheets_circuit_opened_total": ("counter", "Times the Sheets circuit breaker opened."),
+    "trail_sheets_circuit_rejected_total": ("counter", "Sheets calls failed fast by the open circuit."),
+    "trail_sheets_tokens_available": ("gauge", "Sheets quota tokens in the bucket."),
+    "trail_sheets_circuit_state": ("gauge", "Sheets circuit breaker: 0 closed, 1 half open, 2 open."),
+    "trail_sheets_consecutive_failures": ("gauge", "Transient Sheets failures since the last success."),
+}
+
+_lock = threading.Lock()
+_counters = {}  # (name, labels) -> float
+_histograms = {}  # (name, labels) -> [bucket counts..., sum, count]
+_collectors = []  # callables yielding (name, labels dict, value) gauges at scrape time
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def inc(name, value=1, **labels):
+    """Adds to a counter."""
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name, value, **labels):
+    """Records one histogram observation (seconds for the *_seconds metrics)."""
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        state = _histograms.get(key)
+        if state is None:
+            state = _histograms[key] = [0] * (len(DEFAULT_BUCKETS) + 2)
+        index = bisect.bisect_left(DEFAULT_BUCKETS, value)
+        if index < len(DEFAULT_BUCKETS):
+            state[index] += 1
+        state[-2] += value
+        state[-1] += 1
+
+
+def error(where, exc):
+    """Counts an exception under trail_errors_total{where, exception}."""
+    inc("trail_errors_total", where=where, exception=type(exc).__name__)
+
+
+class _Timer:
+    __slots__ = ("name", "labels", "started")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.name, time.perf_counter() - self.started, **self.labels)
+        # Only real errors: st.rerun()/st.stop() raise BaseException subclasses
+        if exc_type is not None and issubclass(exc_type, Exception):
+            error(self.name, exc)
+        return False
+
+
+_NULL_TIMER = contextlib.nullcontext()
+
+
+def timer(name, **labels):
+    """Context manager timing its block into a histogram and counting its errors."""
+    if not ENABLED:
+        return _NULL_TIMER
+    return _Timer(name, labels)
+
+
+def timed(name, **labels):
+    """Decorator form of timer(); a no-op when metrics are off."""
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Timer(name, labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def register_collector(fn):
+    """Adds a callable yielding (name, labels, value) gauges read at scrape time."""
+    with _lock:
+        if fn not in _collectors:
+            _collectors.append(fn)
+
+
+# --------------------------------------------------
+# Exposition
+# --------------------------------------------------
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render():
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    with _lock:
+        counters = dict(_counters)
+        histograms = {key: list(state) for key, state in _histograms.items()}
+        collectors = list(_collectors)
+
+    gauges = {}
+    for collect in collectors:
+        try:
+            for name, labels, value in collect():
+                gauges[_key(name, labels)] = value
+        except Exception as e:  # a broken collector must not break the scrape
+            error("collector", e)
+
+    lines = []
+    declared = set()
+
+    def header(name, kind):
+        if name in declared:
+            return
+        declared.add(name)
+        default = "Reported by a registered collector." if kind == "gauge" else name
+        help_text = METRICS.get(name, (kind, default))[1]
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    for (name, labels), value in sorted(counters.items()):
+        header(name, "counter")
+        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    for (name, labels), state in sorted(histograms.items()):
+        header(name, "histogram")
+        cumulative = 0
+        for bound, count in zip(DEFAULT_BUCKETS, state):
+            cumulative += count
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', bound)])} {cumulative}")
+        lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {state[-1]}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(state[-2])}")
+        lines.append(f"{name}_count{_format_labels(labels)} {state[-1]}")
+
+    for (name, labels), value in sorted(gauges.items()):
+        header(name, "gauge")
+        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    """Drops every recorded value; for benchmarks and tools."""
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+# --------------------------------------------------
+# Exporters
+# --------------------------------------------------
+_exporter_lock = threading.Lock()
+_exporter_started = False
+
+
+def serve(port, host="127.0.0.1"):
+    """Serves render() at /metrics from a daemon thread. Returns the server."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass  # scrapes are not worth a log line each
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def write_file(path):
+    """Writes render() to `path` atomically, for a textfile collector."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(render())
+    os.replace(tmp_path, path)
+
+
+def _file_loop(path, interval):
+    while True:
+        try:
+            write_file(path)
+        except OSError as e:
+            error("metrics_file", e)
+        time.sleep(interval)
+
+
+def start_exporter():
+    """
+    Starts the exporters configured in the environment, at most once per
+    process. Safe to call on every rerun.
+    """
+    global _exporter_started
+    if not ENABLED or _exporter_started:
+        return
+    with _exporter_lock:
+        if _exporter_started:
+            return
+        _exporter_started = True
+        port = os.environ.get("TRAIL_METRICS_PORT")
+        if port:
+            try:
+                serve(int(port))
+            except OSError as e:  # port taken, e.g. by another app process
+                error("metrics_http", e)
+        path = os.environ.get("TRAIL_METRICS_FILE")
+        if path:
+            threading.Thread(target=_file_loop, args=(path, 15.0), name="metrics-file", daemon=True).start()
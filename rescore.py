@@ -0,0 +1,169 @@
+"""
+Re-scores a CSV or JSONL export of stored responses.
+
+The export is read in fixed-size chunks. Each chunk's English answers are
+mapped to option codes and scored with compute_scores_batch, and each new
+score gets its interpretation band. Chunks go to a pool of worker processes
+with a bounded number in flight, and results are written in input order as
+soon as they are ready. Memory depends on --chunk-size and --workers, not on
+the size of the file. Usage, from the repository root:
+
+    python rescore.py responses.csv rescored.csv
+    python rescore.py responses.jsonl rescored.jsonl --workers 8 --chunk-size 20000
+    python rescore.py responses.csv - --changed-only      # audit: rows whose scores moved
+
+For each scale the output has the new score, <scale>_band and, when the
+export had that scale, <scale>_stored. A "changed" column is True where any
+new score differs from the stored one.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from trail_core.interpretation import interpret_scores
+from trail_core.scoring import SCALE_COLUMNS, compute_scores_batch
+
+ID_COLUMNS = ["survey_id", "timestamp", "respondent_lang"]
+FORMATS = ("csv", "jsonl")
+
+
+def detect_format(path, explicit=None):
+    if explicit:
+        return explicit
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext in ("jsonl", "ndjson", "json"):
+        return "jsonl"
+    return "csv"
+
+
+def read_chunks(path, fmt, chunk_size):
+    """DataFrames of at most `chunk_size` rows, read lazily."""
+    import pandas as pd
+
+    if fmt == "csv":
+        # Every cell as text, and "" stays "", exactly what the store hands compute_scores
+        return pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunk_size)
+    return pd.read_json(path, lines=True, dtype=False, chunksize=chunk_size)
+
+
+def rescore_chunk(df, lang="en", band_lang="en", passthrough=False):
+    """Scores one chunk and returns the output rows for it."""
+    import pandas as pd
+
+    scores = compute_scores_batch(df, lang)
+
+    if passthrough:
+        out = df.drop(columns=[c for c in SCALE_COLUMNS if c in df.columns])
+    else:
+        out = df[[c for c in ID_COLUMNS if c in df.columns]].copy()
+
+    changed = pd.Series(False, index=df.index)
+    for scale in SCALE_COLUMNS:
+        new = scores[scale]
+        if scale in df.columns:
+            stored = pd.to_numeric(df[scale], errors="coerce")
+            out[f"{scale}_stored"] = stored.astype("Int64")
+            changed |= stored.ne(new).fillna(True)
+        out[scale] = new
+        out[f"{scale}_band"] = interpret_scores(scale, new.to_numpy(), band_lang)
+    out["changed"] = changed
+    return out
+
+
+class ChunkWriter:
+    """Appends output chunks to a CSV or JSONL file (or stdout for "-")."""
+
+    def __init__(self, path, fmt):
+        self.fmt = fmt
+        self._file = sys.stdout if path == "-" else open(path, "w", encoding="utf-8", newline="")
+        self._header = True
+
+    def write(self, df):
+        if df.empty and not (self.fmt == "csv" and self._header):
+            return  # nothing to add; JSONL would get a blank line
+        if self.fmt == "csv":
+            df.to_csv(self._file, header=self._header, index=False)
+        else:
+            text = df.to_json(orient="records", lines=True, force_ascii=False)
+            self._file.write(text if text.endswith("\n") else text + "\n")
+        self._header = False
+        self._file.flush()
+
+    def close(self):
+        if self._file is not sys.stdout:
+            self._file.close()
+
+
+def run(chunks, write, workers, **options):
+    """
+    Scores `chunks` and hands each result to `write` in input order.
+    At most 2 x workers chunks are in flight, which bounds memory.
+    Returns (rows, changed rows).
+    """
+    rows = changed = 0
+
+    def emit(result):
+        nonlocal rows, changed
+        rows += len(result)
+        changed += int(result["changed"].sum())
+        if options.get("changed_only"):
+            result = result[result["changed"]]
+        write(result)
+
+    score_options = {k: options[k] for k in ("lang", "band_lang", "passthrough") if k in options}
+
+    if workers <= 1:
+        for chunk in chunks:
+            emit(rescore_chunk(chunk, **score_options))
+        return rows, changed
+
+    in_flight = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in chunks:
+            in_flight.append(pool.submit(rescore_chunk, chunk, **score_options))
+            if len(in_flight) >= 2 * workers:
+                emit(in_flight.popleft().result())
+        while in_flight:
+            emit(in_flight.popleft().result())
+    return rows, changed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", help="CSV or JSONL export")
+    parser.add_argument("output", help="output file, or - for stdout")
+    parser.add_argument("--input-format", choices=FORMATS)
+    parser.add_argument("--output-format", choices=FORMATS)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--lang", default="en", help="language of the answers in the export")
+    parser.add_argument("--band-lang", default="en", help="language of the band labels")
+    parser.add_argument("--passthrough", action="store_true", help="keep every input column")
+    parser.add_argument("--changed-only", action="store_true", help="only write rows whose scores changed")
+    args = parser.parse_args(argv)
+
+    in_fmt = detect_format(args.input, args.input_format)
+    out_fmt = args.output_format or (in_fmt if args.output == "-" else detect_format(args.output))
+
+    started = time.perf_counter()
+    writer = ChunkWriter(args.output, out_fmt)
+    try:
+        rows, changed = run(
+            read_chunks(args.input, in_fmt, args.chunk_size), writer.write, args.workers,
+            lang=args.lang, band_lang=args.band_lang,
+            passthrough=args.passthrough, changed_only=args.changed_only,
+        )
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - started
+
+    print(f"Re-scored {rows:,} rows in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:,.0f} rows/s, "
+          f"{args.workers} workers); {changed:,} changed", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+Rate limiting, retries and circuit breaking for calls to a quota-limited API.
+
+GuardedClient wraps every call in three layers, outermost first:
+
+    retry      tenacity, jittered exponential backoff on transient errors;
+               calls that are not idempotent only on errors they were
+               certainly not applied through
+    breaker    fails fast with CircuitOpenError once the API keeps failing
+    bucket     token bucket sized to the API's per-minute quota
+
+One GuardedClient is shared per process, so all sessions draw from the same
+quota. State is published through metrics (trail_<name>_* series).
+"""
+import threading
+import time
+
+import metrics
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the API while the circuit is open."""
+
+
+class TokenBucket:
+    """`rate_per_minute` tokens per minute, at most `burst` saved up."""
+
+    def __init__(self, rate_per_minute, burst):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self):
+        """Takes a token if one is available; otherwise returns the seconds to wait."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self, timeout=None):
+        """Blocks until a token is free. Returns the seconds waited; raises TimeoutError past `timeout`."""
+        started = time.monotonic()
+        while True:
+            wait = self.try_acquire()
+            if wait == 0:
+                return time.monotonic() - started
+            if timeout is not None and time.monotonic() - started + wait > timeout:
+                raise TimeoutError(f"no API quota token within {timeout} s")
+            time.sleep(wait)
+
+    def available(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            return self.tokens
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures. After `reset_timeout`
+    seconds one trial call is let through (half open): success closes the
+    circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    raise CircuitOpenError(f"circuit open after {self.failures} consecutive failures")
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN:
+                if self._trial_running:
+                    raise CircuitOpenError("circuit half open; trial call in progress")
+                self._trial_running = True
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        """Returns True when this failure opened the circuit."""
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                opened = self.state != OPEN
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                return opened
+            return False
+
+    def release(self):
+        """Ends a call that neither succeeded nor failed transiently (e.g. a 400)."""
+        with self._lock:
+            self._trial_running = False
+
+
+class GuardedClient:
+    """
+    Runs calls through the retry / breaker / bucket stack.
+    `is_transient(exc)` decides which errors are retried and count
+    against the breaker; any other error is raised at once.
+
+    A timeout or a 5xx can arrive after the API has applied a write, so
+    calls made with idempotent=False (appends) are only retried when
+    `is_unapplied(exc)` says the request never took effect, e.g. a 429 or
+    a connection that was never opened. Without it they are not retried.
+    """
+
+    def __init__(self, name, is_transient, rate_per_minute=60, burst=10,
+                 failure_threshold=5, reset_timeout=30.0, max_attempts=5,
+                 backoff_initial=1.0, backoff_max=32.0, acquire_timeout=60.0, is_unapplied=None):
+        self.name = name
+        self.is_transient = is_transient
+        self.is_unapplied = is_unapplied or (lambda exc: False)
+        self.bucket = TokenBucket(rate_per_minute, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_attempts = max_attempts
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.acquire_timeout = acquire_timeout
+        metrics.register_collector(self.collect_metrics)
+
+    def _attempt(self, fn):
+        self.breaker.before_call()
+        try:
+            waited = self.bucket.acquire(self.acquire_timeout)
+        except TimeoutError:
+            self.breaker.release()
+            raise
+        if waited:
+            metrics.inc(f"trail_{self.name}_throttled_seconds_total", waited)
+        try:
+            result = fn()
+        except Exception as e:
+            if self.is_transient(e):
+                if self.breaker.record_failure():
+                    metrics.inc(f"trail_{self.name}_circuit_opened_total")
+            else:
+                self.breaker.release()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def call(self, fn, idempotent=True):
+        """
+        fn() with quota, retries and the breaker applied. Pass
+        idempotent=False for calls that must not run twice.
+        """
+        from tenacity import (
+            Retrying,
+            retry_if_exception,
+            stop_after_attempt,
+            wait_random_exponential,
+        )
+
+        if idempotent:
+            retryable = self.is_transient
+        else:
+            def retryable(exc):
+                return self.is_transient(exc) and self.is_unapplied(exc)
+
+        def before_sleep(retry_state):
+            exc = retry_state.outcome.exception()
+            metrics.inc(f"trail_{self.name}_retries_total", reason=type(exc).__name__)
+
+        try:
+            for attempt in Retrying(
+                # An open circuit is not retried here: failing fast is the point
+                retry=retry_if_exception(retryable),
+                wait=wait_random_exponential(multiplier=self.backoff_initial, max=self.backoff_max),
+                stop=stop_after_attempt(self.max_attempts),
+                before_sleep=before_sleep,
+                reraise=True,
+            ):
+                with attempt:
+                    return self._attempt(fn)
+        except CircuitOpenError:
+            metrics.inc(f"trail_{self.name}_circuit_rejected_total")
+            raise
+
+    def collect_metrics(self):
+        yield f"trail_{self.name}_tokens_available", {}, round(self.bucket.available(), 3)
+        yield f"trail_{self.name}_circuit_state", {}, _STATE_VALUES[self.breaker.state]
+        yield f"trail_{self.name}_consecutive_failures", {}, self.breaker.failures
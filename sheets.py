@@ -0,0 +1,262 @@
+"""
+Google Sheets access: the cached worksheet handle, its header schema and
+the guarded client every Sheets call goes through.
+
+The handle and the client are cached per process. Credentials and quota
+settings come from Streamlit secrets, read on first use, so the stores,
+workers and CLI tools can import this module without Streamlit.
+"""
+import functools
+import os
+import threading
+
+import metrics
+from resilience import GuardedClient
+
+HEADER_WRITE_ATTEMPTS = 3
+
+_cache_lock = threading.Lock()  # one handle and one client per process, even on a cold race
+_sheets_client = None
+
+
+class HeaderConflictError(RuntimeError):
+    """Row 1 kept changing while new columns were being added; the write is retried later."""
+
+
+class SheetSchema:
+    """
+    Column layout of the response sheet: the header row in order and a
+    header-to-index map. Columns are only ever appended, so existing rows
+    never shift.
+    """
+
+    __slots__ = ("columns", "index")
+
+    def __init__(self, columns=()):
+        self.columns = tuple(columns)
+        # First occurrence wins if a header name is repeated
+        self.index = {}
+        for i, name in enumerate(self.columns):
+            self.index.setdefault(name, i)
+
+    def missing(self, records):
+        """Keys of `records` that have no column yet, in first-seen order."""
+        new = {}
+        for record in records:
+            for key in record:
+                if key not in self.index:
+                    new[key] = None
+        return list(new)
+
+    def row(self, record):
+        """The record's cells in column order; absent keys and None become ""."""
+        cells = [""] * len(self.columns)
+        index = self.index
+        for key, value in record.items():
+            i = index.get(key)
+            if i is not None and value is not None:
+                cells[i] = value
+        return cells
+
+
+class SheetHandle:
+    """Authorized client, 'Responses' worksheet and cached column schema."""
+
+    def __init__(self, client, worksheet):
+        self.client = client
+        self.worksheet = worksheet
+        self.schema = None  # SheetSchema; None until row 1 has been read once
+        self.extended = False  # columns were added since row 1 was last checked
+        self.lock = threading.Lock()
+
+    def _read_schema(self):
+        self.schema = SheetSchema(self.worksheet.row_values(1))
+
+    def align_rows(self, records):
+        """
+        Cell lists for `records` in header order. Row 1 is read once per
+        handle, and again when a record has keys with no column, in case
+        another process added them first. Keys still missing are added past
+        the header's end and confirmed by reading row 1 back; when another
+        process won the same cells they are added again, up to
+        HEADER_WRITE_ATTEMPTS times, then HeaderConflictError is raised and
+        nothing is written.
+
+        The first call after columns were added reads row 1 again: a process
+        that read it before our write can still overwrite the new cells after
+        our read-back. Columns found renamed are counted as
+        trail_errors_total{where="sheets_header_overwritten"}, and their keys
+        are added again.
+        """
+        records = list(records)
+        with self.lock:
+            if self.schema is None or self.extended or self.schema.missing(records):
+                previous = self.schema
+                self._read_schema()
+                if self.extended and self.schema.columns[:len(previous.columns)] != previous.columns:
+                    metrics.error("sheets_header_overwritten", HeaderConflictError("header row changed after a write"))
+                self.extended = False
+            for _ in range(HEADER_WRITE_ATTEMPTS):
+                new = self.schema.missing(records)
+                if not new:
+                    break
+                self._add_columns(new)
+            if self.schema.missing(records):
+                raise HeaderConflictError(f"header row kept changing while adding {self.schema.missing(records)}")
+            schema = self.schema
+        return [schema.row(record) for record in records]
+
+    def _add_columns(self, keys):
+        """
+        Writes `keys` into the header cells past its current end, never over
+        existing ones, then reads row 1 back. Another process that read row 1
+        before this write may have written its own keys into the same cells;
+        the keys it replaced then show up as missing and are added again.
+        """
+        from gspread.utils import rowcol_to_a1
+
+        start = len(self.schema.columns) + 1
+        end = start + len(keys) - 1
+        if end > self.worksheet.col_count:
+            self.worksheet.add_cols(end - self.worksheet.col_count)
+        self.worksheet.update(range_name=f"{rowcol_to_a1(1, start)}:{rowcol_to_a1(1, end)}", values=[list(keys)])
+        self._read_schema()
+        self.extended = True
+
+
+def _secrets():
+    # Streamlit is only imported once a sheet is actually used
+    import streamlit as st
+
+    return st.secrets
+
+
+def _creds_fingerprint(creds_info):
+    """Identifies a service account without hashing the private key itself."""
+    return f"{creds_info.get('client_email')}:{creds_info.get('private_key_id')}"
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_sheet_handle(creds_fingerprint, sheet_name):
+    """
+    Authorizes with the Streamlit secrets service account and opens the
+    'Responses' worksheet, creating it if missing. Cached per
+    (credentials, sheet name); google-auth refreshes the access token on
+    expiry inside the authorized session.
+    """
+    # Google client libraries are only imported once a sheet is actually used
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+    # Load credentials from Streamlit secrets
+    creds_info = _secrets()["gcp_service_account"]
+    scopes = [
+        "https://www.googleapis.com/auth/spreadsheets",
+        "https://www.googleapis.com/auth/drive"
+    ]
+    creds = Credentials.from_service_account_info(creds_info, scopes=scopes)
+    client = gspread.authorize(creds)
+
+    # Open sheet, create worksheet if missing
+    sh = client.open(sheet_name)
+    try:
+        worksheet = sh.worksheet("Responses")
+    except gspread.exceptions.WorksheetNotFound:
+        worksheet = sh.add_worksheet(title="Responses", rows=1000, cols=20)
+    return SheetHandle(client, worksheet)
+
+
+def get_sheet_handle(sheet_name="Database"):
+    """Returns the cached SheetHandle for the configured service account."""
+    creds_info = _secrets()["gcp_service_account"]
+    with _cache_lock:
+        return _cached_sheet_handle(_creds_fingerprint(creds_info), sheet_name)
+
+
+def _is_stale_handle_error(e):
+    """Auth and not-found errors mean the cached handle has to be rebuilt."""
+    import gspread
+
+    if isinstance(e, (gspread.exceptions.SpreadsheetNotFound, gspread.exceptions.WorksheetNotFound)):
+        return True
+    return isinstance(e, gspread.exceptions.APIError) and e.code in (401, 403, 404)
+
+
+def _is_transient_sheets_error(e):
+    """Quota (429), server and network errors: worth retrying, and count towards the breaker."""
+    import gspread
+    import requests
+
+    if isinstance(e, gspread.exceptions.APIError):
+        return e.code in (408, 429, 500, 502, 503, 504)
+    return isinstance(e, (requests.ConnectionError, requests.Timeout))
+
+
+def _is_unapplied_sheets_error(e):
+    """
+    Errors a Sheets write certainly did not get through: a 429 is rejected
+    before the request is processed, and a connection that was never opened
+    sent nothing. A 5xx or a read timeout may come after the write landed.
+    """
+    import gspread
+    import requests
+    from urllib3.exceptions import NewConnectionError
+
+    if isinstance(e, gspread.exceptions.APIError):
+        return e.code == 429
+    if isinstance(e, requests.ConnectTimeout):
+        return True
+    if isinstance(e, requests.ConnectionError) and e.args:
+        return isinstance(getattr(e.args[0], "reason", None), NewConnectionError)
+    return False
+
+
+def sheets_quota_config():
+    """
+    Limiter and breaker settings from the [sheets] block of Streamlit secrets,
+    with TRAIL_SHEETS_RATE_PER_MIN overriding the rate. The default stays under
+    the Sheets API's 60 requests per minute per user.
+    """
+    config = {"rate_per_minute": 55, "burst": 10, "failure_threshold": 5, "reset_timeout": 30.0}
+    try:
+        config.update(_secrets().get("sheets", {}))
+    except Exception:
+        pass  # no secrets file
+    if os.environ.get("TRAIL_SHEETS_RATE_PER_MIN"):
+        config["rate_per_minute"] = float(os.environ["TRAIL_SHEETS_RATE_PER_MIN"])
+    return config
+
+
+def get_sheets_client():
+    """The process-wide GuardedClient every Sheets call goes through."""
+    global _sheets_client
+    with _cache_lock:
+        if _sheets_client is None:
+            _sheets_client = GuardedClient(
+                "sheets", _is_transient_sheets_error, is_unapplied=_is_unapplied_sheets_error, **sheets_quota_config()
+            )
+    return _sheets_client
+
+
+def _call_with_handle(fn, sheet_name):
+    try:
+        return fn(get_sheet_handle(sheet_name))
+    except Exception as e:
+        if not _is_stale_handle_error(e):
+            raise
+        metrics.error("sheets_stale_handle", e)
+        with _cache_lock:
+            _cached_sheet_handle.cache_clear()
+        return fn(get_sheet_handle(sheet_name))
+
+
+def with_sheet_handle(fn, sheet_name="Database", op="call", idempotent=True):
+    """
+    Calls fn(handle) with the cached handle, rebuilding it once on an
+    auth or not-found error. The call takes a quota token, is retried with
+    backoff on 429/5xx (appends, idempotent=False, only on errors they
+    cannot have got through), and raises CircuitOpenError while Sheets is
+    down. Timed as trail_sheets_seconds{op}.
+    """
+    with metrics.timer("trail_sheets_seconds", op=op):
+        return get_sheets_client().call(lambda: _call_with_handle(fn, sheet_name), idempotent=idempotent)
@@ -0,0 +1,369 @@
+import glob
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from abc import ABC, abstractmethod
+
+from resilience import CircuitOpenError
+from sheets import HeaderConflictError, _is_transient_sheets_error, with_sheet_handle
+
+LOOKUP_CHUNK = 500  # ids per IN (...) query, under SQLite's variable limit
+
+
+def sidecar_path(store, name, env=None):
+    """
+    Where a file kept alongside `store` goes: `env` when that variable is
+    set, else inside the store's directory or beside its file. Remote stores
+    such as Google Sheets get `name` in the working directory.
+    """
+    if env and os.environ.get(env):
+        return os.environ[env]
+    if getattr(store, "root", None):
+        return os.path.join(store.root, f"_{name}")
+    if getattr(store, "path", None):
+        return f"{store.path}.{name}"
+    return name
+
+
+def record_columns():
+    """
+    Every key of a stored record, in the order show_final builds it: ids,
+    answers each followed by its follow-up, scales, respondent language.
+    """
+    from survey_schema import FOLLOWUP_KEYS, QUESTION_IDS
+    from trail_core.scoring import SCALE_COLUMNS
+
+    columns = ["survey_id", "timestamp", "lang"]
+    for q_id in QUESTION_IDS:
+        columns.append(q_id)
+        if q_id in FOLLOWUP_KEYS:
+            columns.append(FOLLOWUP_KEYS[q_id])
+    return columns + list(SCALE_COLUMNS) + ["respondent_lang"]
+
+
+def as_int(value):
+    """An int, or None when the value does not parse; Sheets hands scores back as strings."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def sqlite_connection(local, path):
+    """The calling thread's connection to `path`, kept on the threading.local `local`, in WAL mode."""
+    conn = getattr(local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        local.conn = conn
+    return conn
+
+
+def select_in(conn, query, values):
+    """
+    Runs `query`, whose "{}" stands for an IN list, over `values` in
+    LOOKUP_CHUNK sized chunks, and yields every row.
+    """
+    values = list(values)
+    for start in range(0, len(values), LOOKUP_CHUNK):
+        chunk = values[start:start + LOOKUP_CHUNK]
+        yield from conn.execute(query.format(",".join("?" * len(chunk))), chunk)
+
+
+class ResponseStore(ABC):
+    """
+    Interface of a response storage backend.
+    Records are flat dicts as built by show_final (survey_id, timestamp,
+    answers and scores).
+    """
+
+    def append(self, record):
+        self.append_many([record])
+
+    @abstractmethod
+    def append_many(self, records):
+        """Stores a batch of records."""
+
+    @abstractmethod
+    def scan(self):
+        """Yields every stored record as a dict, oldest first."""
+
+    @abstractmethod
+    def count(self):
+        """Number of stored records."""
+
+    def columns(self):
+        """Every key a stored record can have, in column order."""
+        return record_columns()
+
+    def is_transient(self, exc):
+        """True if a failed write may succeed unchanged later (outage, quota, lock)."""
+        return isinstance(exc, (OSError, TimeoutError))
+
+    def existing_ids(self, survey_ids):
+        """
+        The subset of `survey_ids` already stored. A write that failed may
+        still have landed, so the writer asks before writing it again.
+        """
+        wanted = set(survey_ids)
+        return {r.get("survey_id") for r in self.scan() if r.get("survey_id") in wanted}
+
+
+class SheetsStore(ResponseStore):
+    """The 'Responses' worksheet of a Google Sheet."""
+
+    def __init__(self, sheet_name="Database"):
+        self.sheet_name = sheet_name
+
+    def append_many(self, records):
+        records = list(records)
+        if not records:
+            return
+
+        def write(handle):
+            # Aligned to the header by name; new keys become new columns first
+            handle.worksheet.append_rows(handle.align_rows(records), table_range="A1")
+
+        with_sheet_handle(write, self.sheet_name, op="append_rows", idempotent=False)
+
+    def is_transient(self, exc):
+
+        return isinstance(exc, (CircuitOpenError, TimeoutError, HeaderConflictError)) or _is_transient_sheets_error(exc)
+
+    def scan(self, page_rows=1000):
+        """
+        Reads the sheet `page_rows` rows per request instead of all at once,
+        down to the grid's current last row, so a run of blank rows does not
+        end the scan. Blank rows are skipped.
+        """
+        def last_row(handle):
+            # row_count is cached from when the worksheet was opened; appends grow the grid
+            worksheet = handle.worksheet
+            for sheet in worksheet.spreadsheet.fetch_sheet_metadata()["sheets"]:
+                if sheet["properties"]["sheetId"] == worksheet.id:
+                    return sheet["properties"]["gridProperties"]["rowCount"]
+            return worksheet.row_count
+
+        def read(start, end):
+            return with_sheet_handle(
+                lambda handle: handle.worksheet.get(f"{start}:{end}"), self.sheet_name, op="scan"
+            )
+
+        end = with_sheet_handle(last_row, self.sheet_name, op="scan")
+        header = read(1, 1)
+        if not header:
+            return
+        header = header[0]
+        for start in range(2, end + 1, page_rows):
+            for row in read(start, min(start + page_rows - 1, end)):
+                if not any(row):
+                    continue
+                # get() trims trailing empty cells; pad like get_all_values() did
+                yield dict(zip(header, row + [""] * (len(header) - len(row))))
+
+    def columns(self):
+        # Row 1 has a column for every key ever written
+        header = with_sheet_handle(lambda handle: handle.worksheet.row_values(1), self.sheet_name, op="columns")
+        return header or record_columns()
+
+    def count(self):
+        return max(len(self._survey_id_column("count")) - 1, 0)
+
+    def existing_ids(self, survey_ids):
+        # One column read instead of the whole sheet
+        return set(survey_ids) & set(self._survey_id_column("existing_ids")[1:])
+
+    def _survey_id_column(self, op):
+        # survey_id is the first key of every record, so column A
+        return with_sheet_handle(lambda handle: handle.worksheet.col_values(1), self.sheet_name, op=op)
+
+
+class SQLiteStore(ResponseStore):
+    """
+    Local SQLite file in WAL mode; each batch is one transaction.
+    survey_id is unique and writes are upserts, so writing a record twice
+    leaves one row holding the latest copy.
+    """
+
+    SCHEMA_VERSION = 1  # kept in PRAGMA user_version
+
+    def __init__(self, path="responses.sqlite3"):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connect()
+        if conn.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+            self._migrate(conn)
+
+    def _migrate(self, conn):
+        """Brings a new or pre-upsert file to SCHEMA_VERSION, once per file."""
+        with conn:
+            # Write lock first, then re-check: another process may have just migrated
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= self.SCHEMA_VERSION:
+                return
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " survey_id TEXT NOT NULL,"
+                " timestamp TEXT,"
+                " data TEXT NOT NULL)"
+            )
+            # Files written before upserts may hold repeats: keep the latest row of each
+            conn.execute(
+                "DELETE FROM responses WHERE id NOT IN"
+                " (SELECT MAX(id) FROM responses GROUP BY survey_id)"
+                " AND NOT EXISTS (SELECT 1 FROM sqlite_master WHERE name = 'responses_survey_id')"
+            )
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS responses_survey_id ON responses (survey_id)")
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def _connect(self):
+        # One connection per thread: the writer thread and script threads never share one
+        return sqlite_connection(self._local, self.path)
+
+    def append_many(self, records):
+        rows = [
+            (r["survey_id"], r.get("timestamp"), json.dumps(r, ensure_ascii=False))
+            for r in records
+        ]
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO responses (survey_id, timestamp, data) VALUES (?, ?, ?)"
+                " ON CONFLICT (survey_id) DO UPDATE SET timestamp = excluded.timestamp, data = excluded.data",
+                rows,
+            )
+
+    def is_transient(self, exc):
+        # "database is locked" and friends
+        return isinstance(exc, sqlite3.OperationalError) or super().is_transient(exc)
+
+    def scan(self):
+        cur = self._connect().execute("SELECT data FROM responses ORDER BY id")
+        for (data,) in cur:
+            yield json.loads(data)
+
+    def count(self):
+        return self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def existing_ids(self, survey_ids):
+        rows = select_in(self._connect(), "SELECT survey_id FROM responses WHERE survey_id IN ({})", survey_ids)
+        return {row[0] for row in rows}
+
+
+class ParquetStore(ResponseStore):
+    """
+    Directory of Parquet files partitioned by submission date
+    (<root>/date=YYYY-MM-DD/part-*.parquet); each batch adds one file per date.
+    """
+
+    def __init__(self, root="responses_parquet"):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def _files(self):
+        return sorted(
+            glob.glob(os.path.join(self.root, "date=*", "*.parquet")),
+            key=lambda path: os.stat(path).st_mtime_ns,
+        )
+
+    def append_many(self, records):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        by_date = {}
+        for r in records:
+            by_date.setdefault(str(r.get("timestamp", ""))[:10] or "unknown", []).append(r)
+
+        for date, rows in by_date.items():
+            part_dir = os.path.join(self.root, f"date={date}")
+            os.makedirs(part_dir, exist_ok=True)
+            # Write to a temp name first so readers never see half a file
+            final_path = os.path.join(part_dir, f"part-{uuid.uuid4().hex}.parquet")
+            tmp_path = final_path + ".tmp"
+            pq.write_table(self._table(rows), tmp_path)
+            os.replace(tmp_path, final_path)
+
+    @staticmethod
+    def _table(rows):
+        """
+        The rows with every key of the batch as a column: int64 for the
+        scales, strings for everything else. from_pylist alone would take the
+        columns from the first row and the types from the values.
+        """
+        import pyarrow as pa
+
+        from trail_core.scoring import SCALE_COLUMNS
+
+        columns = {}
+        for row in rows:
+            columns.update(dict.fromkeys(row))
+        arrays = {}
+        for name in columns:
+            values = [row.get(name) for row in rows]
+            if name in SCALE_COLUMNS:
+                arrays[name] = pa.array([as_int(v) for v in values], pa.int64())
+            else:
+                arrays[name] = pa.array([None if v is None else str(v) for v in values], pa.string())
+        return pa.table(arrays)
+
+    def scan(self):
+        import pyarrow.parquet as pq
+
+        for path in self._files():
+            for batch in pq.ParquetFile(path).iter_batches():
+                yield from batch.to_pylist()
+
+    def count(self):
+        import pyarrow.parquet as pq
+
+        return sum(pq.ParquetFile(path).metadata.num_rows for path in self._files())
+
+    def existing_ids(self, survey_ids):
+        import pyarrow.parquet as pq
+
+        wanted, found = set(survey_ids), set()
+        for path in self._files():
+            found.update(i for i in pq.read_table(path, columns=["survey_id"]).column(0).to_pylist() if i in wanted)
+        return found
+
+
+BACKENDS = {
+    "sheets": SheetsStore,
+    "sqlite": SQLiteStore,
+    "parquet": ParquetStore,
+}
+
+
+def storage_config():
+    """
+    Backend settings from the [storage] block of Streamlit secrets,
+    overridden by TRAIL_STORAGE_BACKEND / TRAIL_STORAGE_PATH.
+    Defaults to Google Sheets.
+    """
+    config = {"backend": "sheets"}
+    try:
+        import streamlit as st
+
+        config.update(st.secrets.get("storage", {}))
+    except Exception:
+        pass  # no secrets file: offline tools and workers
+    if os.environ.get("TRAIL_STORAGE_BACKEND"):
+        config["backend"] = os.environ["TRAIL_STORAGE_BACKEND"]
+    if os.environ.get("TRAIL_STORAGE_PATH"):
+        config["path"] = os.environ["TRAIL_STORAGE_PATH"]
+    return config
+
+
+def get_store(backend=None, path=None):
+    """Builds the configured ResponseStore; arguments override the config."""
+    config = storage_config()
+    backend = backend or config["backend"]
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown storage backend: {backend!r}")
+    path = path or config.get("path")
+    if backend == "sheets":
+        return SheetsStore(config.get("sheet_name", "Database"))
+    return BACKENDS[backend](path) if path else BACKENDS[backend]()
@@ -0,0 +1,153 @@
+"""
+Local append-only write-ahead log of survey submissions.
+
+Records a writer could not store even on their own are parked: they stay in
+the log but are no longer handed out. With the app stopped, they can be
+inspected and put back in line:
+
+    python submission_log.py status
+    python submission_log.py requeue
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from itertools import islice
+
+
+class SubmissionLog:
+    """
+    Local append-only write-ahead log of survey submissions.
+
+    Every record is written as one JSON line and fsync'd before any remote
+    write is attempted. Records are keyed by survey_id; once a record has
+    reached the remote store an "ack" line is appended. The unacknowledged
+    records are rebuilt from the file on start-up, so they survive process
+    restarts, and the file is compacted back to the parked records once
+    everything else has been acknowledged.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending = OrderedDict()  # survey_id -> record, in write order
+        self._parked = OrderedDict()  # survey_id -> (record, reason)
+        self._load()
+        self._fh = open(self.path, "a", encoding="utf-8")
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line from a crash mid-write
+                op, survey_id = entry.get("op"), entry.get("survey_id")
+                if op == "put":
+                    self._pending[survey_id] = entry["record"]
+                elif op == "ack":
+                    self._pending.pop(survey_id, None)
+                elif op == "park" and survey_id in self._pending:
+                    self._parked[survey_id] = (self._pending.pop(survey_id), entry.get("reason"))
+                elif op == "requeue" and survey_id in self._parked:
+                    self._pending[survey_id] = self._parked.pop(survey_id)[0]
+
+    def _write(self, entries):
+        for entry in entries:
+            self._fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def append(self, record):
+        """Durably records one submission before it is sent anywhere."""
+        survey_id = record["survey_id"]
+        with self._lock:
+            self._write([{"op": "put", "survey_id": survey_id, "record": record}])
+            self._pending[survey_id] = record
+
+    def ack(self, survey_ids):
+        """Marks records as synced; compacts the log once nothing is pending."""
+        with self._lock:
+            acked = [sid for sid in survey_ids if sid in self._pending]
+            if not acked:
+                return
+            self._write([{"op": "ack", "survey_id": sid} for sid in acked])
+            for sid in acked:
+                del self._pending[sid]
+            if not self._pending:
+                self._compact()
+
+    def park(self, survey_id, reason=None):
+        """Sets a pending record aside: kept in the log, no longer handed out. False if not pending."""
+        with self._lock:
+            if survey_id not in self._pending:
+                return False
+            self._write([{"op": "park", "survey_id": survey_id, "reason": reason}])
+            self._parked[survey_id] = (self._pending.pop(survey_id), reason)
+            return True
+
+    def requeue(self):
+        """Puts every parked record back at the end of the pending records. Returns how many."""
+        with self._lock:
+            survey_ids = list(self._parked)
+            if survey_ids:
+                self._write([{"op": "requeue", "survey_id": sid} for sid in survey_ids])
+            for sid in survey_ids:
+                self._pending[sid] = self._parked.pop(sid)[0]
+        return len(survey_ids)
+
+    def pending(self, limit=None):
+        """Unacknowledged records, oldest first."""
+        with self._lock:
+            return list(islice(self._pending.values(), limit))
+
+    def parked(self):
+        """{survey_id: reason} of the parked records."""
+        with self._lock:
+            return {sid: reason for sid, (_, reason) in self._parked.items()}
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _compact(self):
+        """Rewrites the log with only the pending and parked records. Caller holds the lock."""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for survey_id, (record, reason) in self._parked.items():
+                f.write(json.dumps({"op": "put", "survey_id": survey_id, "record": record}, ensure_ascii=False) + "\n")
+                f.write(json.dumps({"op": "park", "survey_id": survey_id, "reason": reason}, ensure_ascii=False) + "\n")
+            for survey_id, record in self._pending.items():
+                f.write(json.dumps({"op": "put", "survey_id": survey_id, "record": record}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._fh.close()
+        os.replace(tmp_path, self.path)
+        self._fh = open(self.path, "a", encoding="utf-8")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--path", default=os.environ.get("TRAIL_SUBMISSION_LOG", "submissions.wal.jsonl"))
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="pending and parked records")
+    commands.add_parser("requeue", help="retry the parked records (stop the app first)")
+    args = parser.parse_args(argv)
+
+    log = SubmissionLog(args.path)
+    if args.command == "requeue":
+        print(f"Requeued {log.requeue():,} parked records in {args.path}")
+        return 0
+    print(f"{len(log):,} pending")
+    parked = log.parked()
+    print(f"{len(parked):,} parked")
+    for survey_id, reason in parked.items():
+        print(f"  {survey_id}: {reason}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
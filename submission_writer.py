@@ -0,0 +1,271 @@
+"""
+SubmissionWriter: the background thread that takes survey submissions off
+the request path and writes them to a ResponseStore in batches. Standard
+library only besides the repo's own modules, so it runs without Streamlit.
+"""
+import queue
+import threading
+import time
+
+import metrics
+
+
+class SubmissionWriter:
+    """
+    Process-wide write-behind queue for survey submissions.
+
+    submit() only enqueues and returns immediately. A single writer thread
+    writes rows in batches with store.append_many, flushing when
+    `batch_size` rows are waiting or `flush_interval` seconds have passed.
+    Because only this thread writes, concurrent sessions can no longer race
+    to write the sheet's header row.
+
+    With a SubmissionLog, every record is logged durably on submit and the
+    log is the queue: batches are its oldest unacknowledged records, so
+    records left over from a previous process go out first and everything
+    reaches the store in submission order. A record is acknowledged once it
+    is in the store. The in-memory queue only holds records the log could
+    not take (and every record when there is no log).
+
+    A failed batch is retried before anything newer, and since a write can
+    fail after it reached the store (a timeout, a 5xx), the store is asked
+    which of its records it already holds before each retry. Transient errors
+    (outages, quota, locks) are retried until they pass. A batch that fails
+    otherwise `max_attempts` times is written one record at a time, and a
+    record that still fails is parked in the log, so one bad row cannot
+    block every later submission.
+
+    With an AggregateFile, every batch that reaches the store is also added
+    to the running population statistics.
+
+    With a SubmissionIndex, records whose survey_id was already written are
+    dropped before the write, so each submission reaches the store (and the
+    aggregates) once. An empty index is rebuilt from the store at startup.
+    A previous process may have died after writing a batch but before adding
+    it to the index, so records replayed from the log are checked against the
+    store like a retry.
+    """
+
+    def __init__(self, store, batch_size=20, flush_interval=2.0, max_queue=1000, log=None, aggregates=None,
+                 index=None, max_attempts=3):
+        self.store = store
+        self.aggregates = aggregates
+        self.index = index
+        self._backend = type(store).__name__
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.log = log
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._wakeup = threading.Event()
+        self._retry = []  # the failed batch, written before anything newer
+        self._attempts = 0  # non-transient failures of self._retry
+        self._parked = []  # records set aside when there is no log to park them in
+        # Left over from a previous process, which may have stored them before dying
+        self._replayed = {row["survey_id"] for row in log.pending()} if log is not None else set()
+        self._lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "rejected": 0,
+            "log_errors": 0,
+            "replayed": len(log) if log is not None else 0,
+            "duplicates": 0,
+            "recovered": 0,
+            "parked": 0,
+            "flushed_rows": 0,
+            "flushes": 0,
+            "failed_flushes": 0,
+            "loop_errors": 0,
+            "last_flush_seconds": None,
+            "last_error": None,
+        }
+        self._thread = threading.Thread(target=self._run, name="submission-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, data_dict):
+        """
+        Queues one submission. Returns False only if it could not be kept:
+        the log failed and the in-memory queue is full.
+        """
+        record = dict(data_dict)
+        if self.log is not None:
+            try:
+                self.log.append(record)
+            except OSError as e:
+                self._bump("log_errors")
+                metrics.error("submission_log", e)
+            else:
+                self._accepted()
+                return True
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self._bump("rejected")
+            return False
+        self._accepted()
+        return True
+
+    def _accepted(self):
+        self._bump("submitted")
+        if self._waiting() >= self.batch_size:
+            self._wakeup.set()
+
+    def stats(self):
+        """Snapshot of flush latency, queue depth and failure counters."""
+        with self._lock:
+            snapshot = dict(self._stats)
+        snapshot["queue_depth"] = self._queue.qsize()
+        snapshot["pending_retry"] = len(self._retry)
+        snapshot["log_pending"] = len(self.log) if self.log is not None else 0
+        return snapshot
+
+    def _bump(self, name, value=1):
+        with self._lock:
+            self._stats[name] += value
+
+    def _failed(self, where, e, counter=None):
+        metrics.error(where, e)
+        with self._lock:
+            if counter:
+                self._stats[counter] += 1
+            self._stats["last_error"] = f"{type(e).__name__}: {e}"
+
+    def _run(self):
+        if self.index is not None and not self.index.is_built():
+            try:
+                self.index.rebuild(self.store)
+            except Exception as e:  # writes fall back to the store's own idempotency
+                self._failed("dedup_rebuild", e)
+        while True:
+            try:
+                self._step()
+            except Exception as e:  # the thread must outlive any one failure (disk full, EIO)
+                self._failed("submission_writer", e, "loop_errors")
+                time.sleep(self.flush_interval)
+
+    def _step(self):
+        batch = self._retry or self._collect()
+        if not batch:
+            return
+        error = self._flush(batch, recheck=bool(self._retry))
+        if error is None:
+            self._retry, self._attempts = [], 0
+            return
+        self._retry = batch
+        if self.store.is_transient(error):
+            self._attempts = 0  # an outage: nothing is lost by waiting it out
+        else:
+            self._attempts += 1
+            if self._attempts >= self.max_attempts:
+                self._retry, self._attempts = [], 0
+                self._isolate(batch)
+                return
+        time.sleep(self.flush_interval)  # back off before retrying
+
+    def _isolate(self, batch):
+        """Writes a batch that keeps failing one record at a time, parking records that still fail."""
+        for i, record in enumerate(batch):
+            error = self._flush([record])
+            if error is None:
+                continue
+            if self.store.is_transient(error):
+                self._retry = batch[i:]  # the store went away; back to retrying in order
+                return
+            self._park(record, error)
+
+    def _park(self, record, error):
+        reason = f"{type(error).__name__}: {error}"
+        if self.log is None or not self.log.park(record["survey_id"], reason):
+            self._parked.append((record, reason))  # not logged: kept for this process only
+        metrics.error("submission_parked", error)
+        self._bump("parked")
+
+    def _waiting(self):
+        return (len(self.log) if self.log is not None else 0) + self._queue.qsize()
+
+    def _collect(self):
+        """Waits for a full batch or the flush interval, then takes the oldest records."""
+        deadline = time.monotonic() + self.flush_interval
+        while self._waiting() < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._wakeup.wait(remaining)
+            self._wakeup.clear()
+        batch = self.log.pending(self.batch_size) if self.log is not None else []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _unwritten(self, batch):
+        """The batch without survey_ids already in the index or repeated in the batch."""
+        seen = set()
+        if self.index is not None:
+            try:
+                seen = self.index.known(row["survey_id"] for row in batch)
+            except Exception as e:
+                metrics.error("dedup_lookup", e)
+        fresh = []
+        for row in batch:
+            if row["survey_id"] not in seen:
+                seen.add(row["survey_id"])
+                fresh.append(row)
+        return fresh
+
+    def _flush(self, batch, recheck=False):
+        """
+        Writes one batch. Returns the store's exception, or None once the
+        batch is stored. With `recheck`, and for replayed records, records
+        the store already holds (written by an attempt that then failed) are
+        not written again.
+        """
+        fresh = self._unwritten(batch)
+        recheck = recheck or not self._replayed.isdisjoint(row["survey_id"] for row in fresh)
+        started = time.perf_counter()
+        stored = set()
+        try:
+            if fresh and recheck:
+                stored = self.store.existing_ids(row["survey_id"] for row in fresh)
+            # Stored rows still count as written below, for the index and aggregates
+            unsent = [row for row in fresh if row["survey_id"] not in stored]
+            if unsent:
+                self.store.append_many(unsent)
+        except Exception as e:
+            metrics.observe("trail_save_seconds", time.perf_counter() - started, backend=self._backend)
+            self._failed("submission_flush", e, "failed_flushes")
+            return e
+
+        elapsed = time.perf_counter() - started
+        metrics.observe("trail_save_seconds", elapsed, backend=self._backend)
+        metrics.inc("trail_saved_rows_total", len(fresh), backend=self._backend)
+        if self.index is not None and fresh:
+            try:
+                self.index.add(row["survey_id"] for row in fresh)
+            except Exception as e:
+                metrics.error("dedup_add", e)
+        if self.aggregates is not None and fresh:
+            try:
+                self.aggregates.add_many(fresh)
+            except Exception as e:  # rebuildable from the store; never blocks writes
+                self._failed("aggregates", e)
+        with self._lock:
+            self._stats["flushes"] += 1
+            self._stats["flushed_rows"] += len(fresh)
+            self._stats["duplicates"] += len(batch) - len(fresh)
+            self._stats["recovered"] += len(stored)
+            self._stats["last_flush_seconds"] = elapsed
+        self._replayed.difference_update(row["survey_id"] for row in batch)
+        if self.log is not None:
+            # Raises on a failing disk; the batch is stored, so the writer loop
+            # only logs it and the index drops the records when they come round again
+            self.log.ack([row["survey_id"] for row in batch])
+        return None
+
+    def collect_metrics(self):
+        """Numeric stats() values as trail_submission_* gauges, for metrics.register_collector."""
+        for name, value in self.stats().items():
+            if isinstance(value, (int, float)):
+                yield f"trail_submission_{name}", {}, value
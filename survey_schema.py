@@ -0,0 +1,180 @@
+# survey_schema.py
+
+# ======================================================
+# The survey as data.
+#
+# SURVEY lists the sections in page order. page_plans(lang, catalog) compiles
+# it once per language into immutable page plans that already carry the headings,
+# question text and options, so rendering a page is a straight iteration.
+#
+# Section keys:
+#   id          section id, also the "sections.<id>" translation key
+#   groups      question groups; each has "questions" and optionally
+#               "sub_header" (translation key) and "divider" (rule above)
+#   heading     "header" (title as header, section as subheader) or
+#               "title" (title as title, section as header)
+#   followups   {question id: follow-up text input shown for some answers};
+#               "when" names those answers by English option text and is
+#               compiled to option codes, so it holds for every language.
+#               A follow-up for a question outside the section, or naming
+#               an option the question does not have, fails compilation
+# ======================================================
+from functools import lru_cache
+from typing import NamedTuple
+
+SURVEY = (
+    {
+        "id": "A",
+        "groups": [{"questions": [f"A{i}" for i in range(1, 8)]}],
+    },
+    {
+        "id": "B",
+        "groups": [{"questions": [f"B{i}" for i in range(1, 14)]}],
+    },
+    {
+        "id": "C",
+        "heading": "title",
+        "groups": [
+            # WHO-5 questions
+            {"sub_header": "sections.C_sub_who", "questions": [f"C{i}" for i in range(1, 6)]},
+            # Distress questions
+            {"divider": True, "questions": [f"C{i}" for i in range(6, 13)]},
+        ],
+    },
+    {
+        "id": "D",
+        "groups": [{"questions": [f"D{i}" for i in range(1, 10)]}],
+    },
+    {
+        "id": "E",
+        "groups": [{"questions": [f"E{i}" for i in range(1, 5)]}],
+    },
+    {
+        "id": "F",
+        "groups": [{"questions": [f"F{i}" for i in range(1, 7)]}],
+    },
+)
+
+# Every question id in page order; the slots of a respondent's AnswerSheet
+QUESTION_IDS = tuple(q_id for section in SURVEY for group in section["groups"] for q_id in group["questions"])
+
+# Key under which each question's follow-up answer is stored, if it has one
+FOLLOWUP_KEYS = {
+    q_id: followup["key"] for section in SURVEY for q_id, followup in section.get("followups", {}).items()
+}
+
+FIRST_SECTION_PAGE = 2  # page 1 is the intro
+TOTAL_PAGES = len(SURVEY)  # excluding intro
+FINAL_PAGE = FIRST_SECTION_PAGE + TOTAL_PAGES
+
+
+class Followup(NamedTuple):
+    key: str
+    label: str
+    when: frozenset  # option codes
+
+
+class QuestionPlan(NamedTuple):
+    q_id: str
+    text: str
+    options: tuple
+    followup: Followup = None
+
+
+class GroupPlan(NamedTuple):
+    sub_header: str
+    divider: bool
+    questions: tuple
+
+
+class PagePlan(NamedTuple):
+    number: int
+    section_id: str
+    heading: str
+    title: str
+    section_title: str
+    groups: tuple
+    question_ids: tuple
+    next_page: int
+
+
+def compile_followup(section_id, q_id, followup, catalog):
+    """
+    The Followup of one question. Raises ValueError for an option the
+    question does not have in English; with no English options at all (the
+    empty fallback catalog) the follow-up is simply never shown.
+    """
+    en_options = catalog.en_options.get(q_id)
+    if en_options is None:
+        return Followup(followup["key"], followup["label"], frozenset())
+    unknown = [text for text in followup["when"] if text not in en_options]
+    if unknown:
+        raise ValueError(f"Section {section_id}: follow-up of {q_id} names unknown options {unknown}")
+    en_index = catalog.option_index["en"]
+    when = frozenset(en_index[(q_id, text)] for text in followup["when"])
+    return Followup(followup["key"], followup["label"], when)
+
+
+def compile_page_plans(lang, catalog, survey=SURVEY):
+    """
+    Builds the PagePlan of every section page for one language. Raises
+    ValueError for a follow-up configured on a question outside its section.
+    """
+    pages = []
+    for offset, section in enumerate(survey):
+        section_id = section["id"]
+        followups = section.get("followups", {})
+        section_questions = {q_id for group in section["groups"] for q_id in group["questions"]}
+        stray = sorted(set(followups) - section_questions)
+        if stray:
+            raise ValueError(f"Section {section_id}: follow-ups for questions not in the section: {stray}")
+        groups = []
+        for group in section["groups"]:
+            questions = []
+            for q_id in group["questions"]:
+                data = catalog.question(lang, q_id)
+                followup = followups.get(q_id)
+                if followup:
+                    followup = compile_followup(section_id, q_id, followup, catalog)
+                questions.append(QuestionPlan(
+                    q_id=q_id,
+                    text=data.get("q", f"Question {q_id}"),
+                    options=tuple(data.get("opts", [])),
+                    followup=followup,
+                ))
+            sub_header = group.get("sub_header")
+            groups.append(GroupPlan(
+                sub_header=catalog.text(lang, sub_header) if sub_header else None,
+                divider=group.get("divider", False),
+                questions=tuple(questions),
+            ))
+
+        number = FIRST_SECTION_PAGE + offset
+        pages.append(PagePlan(
+            number=number,
+            section_id=section_id,
+            heading=section.get("heading", "header"),
+            title=catalog.text(lang, "title"),
+            section_title=catalog.text(lang, f"sections.{section_id}", f"Section {section_id}"),
+            groups=tuple(groups),
+            question_ids=tuple(q.q_id for g in groups for q in g.questions),
+            next_page=number + 1,
+        ))
+    return tuple(pages)
+
+
+@lru_cache(maxsize=None)
+def page_plans(lang, catalog):
+    """
+    Page plans for a language, compiled on first use and then shared.
+    The app passes utils.app_catalog(), so a broken translations file
+    gives the fallback catalog's placeholders rather than an exception.
+    """
+    return compile_page_plans(lang, catalog)
+
+
+def page_plan(lang, page, catalog):
+    """The PagePlan for a page number, or None for the intro and final pages."""
+    index = page - FIRST_SECTION_PAGE
+    plans = page_plans(lang, catalog)
+    return plans[index] if 0 <= index < len(plans) else None
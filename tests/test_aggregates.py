@@ -0,0 +1,61 @@
+import json
+import random
+import time
+
+import pytest
+
+from aggregates import ALL, AggregateFile, RunningAggregates, rebuild
+from dedup import SubmissionIndex
+from storage import SQLiteStore
+from submission_log import SubmissionLog
+from submission_writer import SubmissionWriter
+from trail_core.scoring import SCALE_COLUMNS
+
+
+def response(n, rng):
+    record = {"survey_id": f"s{n}", "A1": rng.choice(["18–25", "26–35", None]), "respondent_lang": rng.choice("em")}
+    for scale in SCALE_COLUMNS:
+        if rng.random() < 0.9:
+            record[scale] = rng.randint(0, 30) if rng.random() < 0.5 else str(rng.randint(0, 30))
+    return record
+
+
+def test_writer_built_aggregates_equal_a_rebuild(tmp_path):
+    rng = random.Random(0)
+    store = SQLiteStore(str(tmp_path / "responses.sqlite3"))
+    agg_file = AggregateFile(str(tmp_path / "aggregates.json"))
+    log = SubmissionLog(str(tmp_path / "wal.jsonl"))
+    index = SubmissionIndex(str(tmp_path / "ids.sqlite3"))
+    writer = SubmissionWriter(store, batch_size=7, flush_interval=0.01, log=log, aggregates=agg_file, index=index)
+    records = [response(n, rng) for n in range(60)]
+    for record in records + records[:5]:  # resubmissions are dropped
+        writer.submit(record)
+
+    deadline = time.monotonic() + 5
+    while len(log) or store.count() < len(records):
+        if time.monotonic() > deadline:
+            pytest.fail("timed out")
+        time.sleep(0.01)
+
+    assert AggregateFile(agg_file.path).aggregates == rebuild(store)
+    assert rebuild(store).rows == 60
+
+
+def test_percentiles_of_a_known_cell():
+    aggregates = RunningAggregates()
+    aggregates.add_many({"WHO_total": score} for score in (10, 20, 20, 30, 40))
+
+    assert aggregates.stats("WHO_total", ALL, ALL)["histogram"] == {10: 1, 20: 2, 30: 1, 40: 1}
+    assert [aggregates.percentile("WHO_total", pct) for pct in (0, 20, 21, 60, 61, 100)] == [10, 10, 20, 20, 30, 40]
+    assert [aggregates.percentile_rank("WHO_total", score) for score in (5, 10, 25, 40)] == [0, 20, 60, 100]
+    assert aggregates.percentile("sleep_quality", 50) is None
+
+
+def test_other_format_versions_are_rejected(tmp_path):
+    data = RunningAggregates().to_dict()
+    with pytest.raises(ValueError, match="Unsupported"):
+        RunningAggregates.from_dict({**data, "version": data["version"] + 1})
+
+    path = tmp_path / "aggregates.json"
+    path.write_text(json.dumps({**data, "version": 0, "rows": 9}), encoding="utf-8")
+    assert AggregateFile(str(path)).aggregates == RunningAggregates()  # started over, not crashed
@@ -0,0 +1,96 @@
+import glob
+import json
+import os
+
+import pytest
+
+import analytics
+from storage import SQLiteStore
+
+
+def record(n, day=1, lang="en"):
+    return {
+        "survey_id": f"s{n}",
+        "timestamp": f"2026-01-0{day} 10:00:00",
+        "respondent_lang": lang,
+        "sleep_quality": str(n % 15),
+    }
+
+
+def dataset_ids(root):
+    return sorted(analytics._dataset_ids(str(root)))
+
+
+def test_sync_copies_each_survey_once(tmp_path):
+    store = SQLiteStore(str(tmp_path / "responses.sqlite3"))
+    root = tmp_path / "analytics"
+    store.append_many([record(n) for n in range(5)])
+    assert analytics.sync(store, str(root), chunk_size=2) == 5
+    store.append_many([record(n, day=2) for n in range(5, 8)])
+    assert analytics.sync(store, str(root)) == 3
+    assert analytics.sync(store, str(root)) == 0
+    assert dataset_ids(root) == sorted(f"s{n}" for n in range(8))
+
+
+def test_sync_is_not_shifted_by_rows_leaving_the_store(tmp_path):
+    store = SQLiteStore(str(tmp_path / "responses.sqlite3"))
+    root = tmp_path / "analytics"
+    store.append_many([record(n) for n in range(4)])
+    analytics.sync(store, str(root))
+    with store._connect() as conn:
+        conn.execute("DELETE FROM responses WHERE survey_id IN ('s0', 's1')")
+    store.append_many([record(4), record(5)])
+    assert analytics.sync(store, str(root)) == 2
+    assert dataset_ids(root) == [f"s{n}" for n in range(6)]
+
+
+def test_sync_redoes_a_chunk_cut_short_by_a_crash(tmp_path, monkeypatch):
+    store = SQLiteStore(str(tmp_path / "responses.sqlite3"))
+    root = tmp_path / "analytics"
+    store.append_many([record(n, day=n % 2 + 1) for n in range(6)])
+
+    real_write_rows = analytics.write_rows
+
+    def write_then_crash(rows, root, name=None):
+        real_write_rows(rows, root, name)
+        raise KeyboardInterrupt  # files are on disk, their ids never recorded
+
+    monkeypatch.setattr(analytics, "write_rows", write_then_crash)
+    with pytest.raises(KeyboardInterrupt):
+        analytics.sync(store, str(root))
+    monkeypatch.setattr(analytics, "write_rows", real_write_rows)
+
+    assert analytics.sync(store, str(root)) == 6
+    assert dataset_ids(root) == [f"s{n}" for n in range(6)]
+
+
+def test_sync_indexes_a_dataset_synced_by_row_count(tmp_path):
+    store = SQLiteStore(str(tmp_path / "responses.sqlite3"))
+    root = tmp_path / "analytics"
+    store.append_many([record(n) for n in range(3)])
+    analytics.write_rows([analytics.normalise(record(n)) for n in range(2)], str(root))
+    with open(root / analytics.MANIFEST_NAME, "w", encoding="utf-8") as f:
+        json.dump({"rows": 2}, f)
+
+    assert analytics.sync(store, str(root)) == 1
+    assert dataset_ids(root) == ["s0", "s1", "s2"]
+    assert not os.path.exists(root / analytics.MANIFEST_NAME)
+
+
+def test_crash_after_merge_never_counts_rows_twice(tmp_path, monkeypatch):
+    root = str(tmp_path / "analytics")
+    for n in range(3):
+        analytics.write_rows([analytics.normalise(record(n))], root)
+    monkeypatch.setattr(analytics, "_finish_compaction", lambda part_dir, marker: None)
+    assert analytics.compact(root, min_files=2) == 1
+    monkeypatch.undo()
+
+    # Merged file and the files it replaces are both on disk
+    part_dir = os.path.join(root, "date=2026-01-01", "lang=en")
+    assert len(glob.glob(os.path.join(part_dir, "*.parquet"))) == 4
+    assert dataset_ids(root) == ["s0", "s1", "s2"]
+
+    analytics.compact(root, min_files=2)
+    assert len(glob.glob(os.path.join(part_dir, "*.parquet"))) == 1
+    assert not os.path.exists(os.path.join(part_dir, analytics.COMPACT_MARKER))
+    assert dataset_ids(root) == ["s0", "s1", "s2"]
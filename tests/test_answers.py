@@ -0,0 +1,47 @@
+from trail_core import AnswerSheet
+from trail_core.catalog import get_catalog
+
+
+def test_set_get_and_clear():
+    sheet = AnswerSheet(["A1", "A2", "B1"])
+    sheet.set("A1", 3)
+    sheet.set("B1", 1)
+    assert (sheet.get("A1"), sheet.get("A2"), sheet.get("B1")) == (3, None, 1)
+    assert sheet.get("ZZ") is None
+
+    sheet.set("A1", None)
+    assert sheet.get("A1") is None
+    assert sheet.answered_codes() == {"B1": 1}
+
+    sheet.details["B1_details"] = "x"
+    sheet.clear()
+    assert sheet.answered_codes() == {} and sheet.details == {}
+
+
+def test_unanswered_keeps_the_order_asked_for():
+    sheet = AnswerSheet(["A1", "A2", "A3"])
+    sheet.set("A2", 2)
+    assert sheet.unanswered(["A3", "A2", "A1"]) == ["A3", "A1"]
+    assert sheet.unanswered(["ZZ"]) == ["ZZ"]
+
+
+def test_default_slots_are_the_catalog_questions():
+    assert AnswerSheet().question_ids == tuple(get_catalog().en_options)
+
+
+def test_to_english_with_details_last():
+    en = get_catalog().en_options
+    sheet = AnswerSheet(["A1", "B13"])
+    sheet.set("B13", 1)
+    sheet.set("A1", 2)
+    sheet.details["B13_details"] = "knee"
+
+    out = sheet.to_english()
+    assert out == {"A1": en["A1"][1], "B13": en["B13"][0], "B13_details": "knee"}
+    assert list(out) == ["A1", "B13", "B13_details"]
+
+
+def test_codes_past_the_options_are_saved_as_the_code():
+    sheet = AnswerSheet(["A1"])
+    sheet.set("A1", len(get_catalog().en_options["A1"]) + 1)
+    assert sheet.to_english() == {"A1": str(len(get_catalog().en_options["A1"]) + 1)}
@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+import survey_schema
+from survey_schema import compile_page_plans
+from trail_core.catalog import get_catalog
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "App.py")
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """The app on a B12/B13 page whose B13 asks for details after "Yes"."""
+    from streamlit.testing.v1 import AppTest
+
+    survey = ({
+        "id": "B",
+        "groups": [{"questions": ["B12", "B13"]}],
+        "followups": {"B13": {"key": "B13_details", "label": "Please specify", "when": ["Yes"]}},
+    },)
+    (plan,) = compile_page_plans("en", get_catalog(), survey)
+    monkeypatch.setattr(survey_schema, "page_plan", lambda lang, page, catalog: plan if page == 2 else None)
+    monkeypatch.setenv("TRAIL_BATCHED_FORMS", "1")
+
+    at = AppTest.from_file(APP_PATH, default_timeout=30)
+    at.session_state.page = 2
+    at.session_state.locked_lang = "en"
+    return at.run()
+
+
+def test_batched_form_keeps_the_page_until_a_triggered_followup_is_filled(app):
+    yes = get_catalog().en_options["B13"].index("Yes") + 1
+    app.radio(key="ans_B12").set_value(1)
+    app.radio(key="ans_B13").set_value(yes)
+    app.button[-1].click().run()  # Next
+
+    assert app.session_state.page == 2
+    assert [field.label for field in app.text_input] == ["Please specify"]
+
+    app.text_input(key="input_B13_details").input("knee pain")
+    app.button[-1].click().run()
+    assert app.session_state.page == 3
+    assert app.session_state.responses.details == {"B13_details": "knee pain"}
@@ -0,0 +1,79 @@
+import json
+import marshal
+import os
+
+import pytest
+
+from trail_core import catalog as catalog_module
+from trail_core.catalog import CatalogError, load_catalog
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / "cache"
+    monkeypatch.setattr(catalog_module, "CACHE_DIR", str(path))
+    return path
+
+
+def snapshots(cache_dir):
+    return sorted(os.listdir(cache_dir)) if cache_dir.exists() else []
+
+
+def test_warm_load_matches_cold_load(cache_dir):
+    cold = load_catalog()
+    assert len(snapshots(cache_dir)) == 1
+    assert snapshots(cache_dir)[0].endswith(".marshal")
+    warm = load_catalog()
+
+    assert warm.digest == cold.digest
+    assert dict(warm.flat) == dict(cold.flat)
+    assert warm.missing == cold.missing
+    assert warm.en_options == cold.en_options
+    assert {k: dict(v) for k, v in warm.option_index.items()} == {k: dict(v) for k, v in cold.option_index.items()}
+    assert warm.question("mr", "B1") == cold.question("mr", "B1")
+    # Flat values are parts of the translations, not copies
+    assert warm.flat[("en", "Q.B1")] is warm.translations["en"]["Q"]["B1"]
+
+
+def test_catalog_is_read_only_all_the_way_down(cache_dir):
+    catalog = load_catalog(use_cache=False)
+    with pytest.raises(AttributeError):
+        catalog.translations = {}
+    with pytest.raises(TypeError):
+        catalog.translations["en"] = {}
+    question = catalog.question("en", "B1")
+    with pytest.raises(TypeError):
+        question["q"] = "changed"
+    with pytest.raises(AttributeError):
+        question["opts"].append("another option")
+
+
+def test_snapshot_key_covers_ui_keys(cache_dir, monkeypatch):
+    load_catalog()
+    monkeypatch.setattr(catalog_module, "UI_KEYS", catalog_module.UI_KEYS + ["brand_new_key"])
+    catalog = load_catalog()
+    assert len(snapshots(cache_dir)) == 2
+    assert "en:brand_new_key" in catalog.missing
+
+
+def test_foreign_or_corrupt_snapshot_is_rebuilt(cache_dir, tmp_path):
+    source = tmp_path / "translations.json"
+    source.write_text(json.dumps({"langs": ["en"], "en": {"Q": {"X1": {"q": "?", "opts": ["a", "b"]}}}}))
+    digest = load_catalog(str(source)).digest
+    snapshot = cache_dir / snapshots(cache_dir)[0]
+
+    other = load_catalog(use_cache=False)
+    snapshot.write_bytes(marshal.dumps(other.snapshot()))  # another file's catalog under this name
+    assert load_catalog(str(source)).en_options == {"X1": ("a", "b")}
+
+    snapshot.write_bytes(b"not marshal data")
+    assert load_catalog(str(source)).digest == digest
+
+
+def test_broken_file_raises_catalog_error(tmp_path, cache_dir):
+    source = tmp_path / "translations.json"
+    source.write_text("{not json")
+    with pytest.raises(CatalogError):
+        load_catalog(str(source))
+    with pytest.raises(CatalogError):
+        load_catalog(str(tmp_path / "missing.json"))
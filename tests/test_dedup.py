@@ -0,0 +1,34 @@
+from dedup import SubmissionIndex, index_path
+from storage import SQLiteStore
+
+
+def test_add_is_idempotent(tmp_path):
+    index = SubmissionIndex(str(tmp_path / "ids.sqlite3"))
+    index.add(["s1", "s2"])
+    index.add(["s2", "s3", "s3"])
+    assert len(index) == 3
+    assert "s2" in index and "s4" not in index
+
+
+def test_known_spans_lookup_chunks(tmp_path):
+    index = SubmissionIndex(str(tmp_path / "ids.sqlite3"))
+    index.add(f"s{n}" for n in range(0, 1200, 2))
+    assert index.known(f"s{n}" for n in range(1200)) == {f"s{n}" for n in range(0, 1200, 2)}
+
+
+def test_index_survives_reopening(tmp_path):
+    path = str(tmp_path / "ids.sqlite3")
+    SubmissionIndex(path).add(["s1"])
+    assert "s1" in SubmissionIndex(path)
+
+
+def test_rebuild_from_store(tmp_path):
+    store = SQLiteStore(str(tmp_path / "responses.sqlite3"))
+    store.append_many([{"survey_id": f"s{n}"} for n in range(5)] + [{"survey_id": "s1"}])
+    index = SubmissionIndex(index_path(store))
+    assert not index.is_built()
+    index.add(["gone"])
+
+    assert index.rebuild(store, chunk_size=2) == 5
+    assert index.is_built()
+    assert index.known(["s0", "s4", "gone"]) == {"s0", "s4"}
@@ -0,0 +1,40 @@
+import csv
+import io
+import json
+
+from export import export_part, iter_records
+from storage import SQLiteStore
+
+
+def test_parts_are_bounded_and_each_a_complete_file(tmp_path):
+    store = SQLiteStore(str(tmp_path / "responses.sqlite3"))
+    store.append_many([{"survey_id": f"s{n}", "respondent_lang": "mr" if n % 2 else "en"} for n in range(25)])
+
+    parts = [export_part(iter_records(store), "csv", part, part_rows=10) for part in range(3)]
+    rows = [list(csv.DictReader(io.StringIO(data.decode("utf-8")))) for data in parts]
+    assert [len(part) for part in rows] == [10, 10, 5]
+    assert [row["survey_id"] for part in rows for row in part] == [f"s{n}" for n in range(25)]
+    assert not export_part(iter_records(store), "jsonl", 3, part_rows=10)
+
+    lines = export_part(iter_records(store, langs=["mr"]), "jsonl", 1, part_rows=10).decode("utf-8").splitlines()
+    assert [json.loads(line)["survey_id"] for line in lines] == [f"s{n}" for n in range(21, 25, 2)]
+
+
+def test_keys_missing_from_the_first_record_are_still_exported(tmp_path):
+    store = SQLiteStore(str(tmp_path / "responses.sqlite3"))
+    store.append_many([
+        {"survey_id": "s0", "A1": "18–25"},
+        {"survey_id": "s1", "A1": "26–35", "WHO_total": 14, "respondent_lang": "hi"},
+    ])
+
+    text = export_part(iter_records(store), "csv", 0, columns=store.columns()).decode("utf-8")
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert rows[1]["WHO_total"] == "14" and rows[1]["respondent_lang"] == "hi"
+    assert rows[0]["WHO_total"] == ""
+
+    import pyarrow as pa
+
+    table = pa.ipc.open_stream(export_part(iter_records(store), "arrow", 0, columns=store.columns())).read_all()
+    assert table.column("WHO_total").to_pylist() == [None, 14]
+    assert table.column("respondent_lang").to_pylist() == [None, "hi"]
+    assert table.column_names[:3] == ["survey_id", "timestamp", "lang"]
@@ -0,0 +1,86 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from trail_core.interpretation import (
+    SCORE_INTERPRETATIONS,
+    build_band_tables,
+    interpret_score,
+    interpret_scores,
+)
+from trail_core.scoring import SCALE_COLUMNS, SCORED_KEYS, score_codes
+
+
+def band(low, high, level):
+    return {"range": (low, high), "level": level}
+
+
+def linear_scan(scale_name, score, lang="en"):
+    """interpret_score as it was before the tables: first range holding the score."""
+    items = SCORE_INTERPRETATIONS[scale_name].get(lang) or SCORE_INTERPRETATIONS[scale_name]["en"]
+    for item in items:
+        low, high = item["range"]
+        if low <= score <= high:
+            return item
+    return None
+
+
+def test_rejects_gap():
+    with pytest.raises(ValueError, match="gap"):
+        build_band_tables({"s": {"en": [band(0, 4, "Low"), band(6, 9, "High")]}})
+
+
+def test_rejects_overlap():
+    with pytest.raises(ValueError, match="overlap"):
+        build_band_tables({"s": {"en": [band(0, 5, "Low"), band(5, 9, "High")]}})
+
+
+def test_unsorted_bands_compile():
+    tables = build_band_tables({"s": {"en": [band(5, 9, "High"), band(0, 4, "Low")]}})
+    low, entries = tables[("s", "en")]
+    assert low == 0
+    assert [item["level"] for item in entries] == ["Low"] * 5 + ["High"] * 5
+
+
+@pytest.mark.parametrize("scale_name", list(SCORE_INTERPRETATIONS))
+@pytest.mark.parametrize("lang", ["en", "hi", "mr"])
+def test_tables_match_linear_scan_inside_the_bands(scale_name, lang):
+    items = SCORE_INTERPRETATIONS[scale_name].get(lang) or SCORE_INTERPRETATIONS[scale_name]["en"]
+    low = min(item["range"][0] for item in items)
+    high = max(item["range"][1] for item in items)
+    for score in range(low, high + 1):
+        assert interpret_score(scale_name, score, lang) is linear_scan(scale_name, score, lang)
+
+
+@pytest.mark.parametrize("scale_name", list(SCORE_INTERPRETATIONS))
+def test_out_of_range_scores_clamp_to_the_end_bands(scale_name):
+    items = sorted(SCORE_INTERPRETATIONS[scale_name]["en"], key=lambda item: item["range"][0])
+    assert interpret_score(scale_name, items[0]["range"][0] - 50) is items[0]
+    assert interpret_score(scale_name, items[-1]["range"][1] + 50) is items[-1]
+    assert interpret_score(scale_name, math.inf) is items[-1]
+    assert interpret_score(scale_name, math.nan) is None
+    assert interpret_score(scale_name, None) is None
+
+
+def test_every_reachable_score_has_a_band():
+    rng = random.Random(0)
+    # Corners (every code 0, which an explicit None answer produces, or every
+    # code at its maximum) plus random mixes, with and without answers
+    answer_sets = [dict.fromkeys(SCORED_KEYS, code) for code in range(0, 6)]
+    answer_sets += [{k: rng.randint(0, 5) for k in SCORED_KEYS if rng.random() < 0.9} for _ in range(2000)]
+    for answers in answer_sets:
+        for scale_name, score in score_codes(answers).items():
+            if scale_name in SCORE_INTERPRETATIONS:
+                for lang in ("en", "hi", "mr"):
+                    assert interpret_score(scale_name, score, lang) is not None, (scale_name, score, lang)
+
+
+@pytest.mark.parametrize("scale_name", [s for s in SCALE_COLUMNS if s in SCORE_INTERPRETATIONS])
+def test_bulk_matches_scalar(scale_name):
+    scores = np.array([-5, 0, 3, 7.5, 12, 20, 40, 100, 130, np.nan, np.inf, -np.inf])
+    for lang in ("en", "mr"):
+        items = [interpret_score(scale_name, score, lang) for score in scores]
+        expected = [item["level"] if item else None for item in items]
+        assert list(interpret_scores(scale_name, scores, lang)) == expected
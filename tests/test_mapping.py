@@ -0,0 +1,77 @@
+import json
+import os
+
+import pytest
+
+from trail_core.mapping import map_to_english
+from trail_core.scoring import score_numeric
+
+with open(os.path.join(os.path.dirname(os.path.dirname(__file__)), "translations.json"), encoding="utf-8") as f:
+    TRANSLATIONS = json.load(f)
+
+LANGS = ["en", "hi", "mr", "xx"]
+QUESTION_IDS = sorted({q for lang in ("en", "hi", "mr") for q in TRANSLATIONS[lang]["Q"]} | {"ZZ"})
+
+
+def list_index_score(qkey, option_text, lang="en"):
+    """score_numeric as it was before the option index: a list.index walk."""
+    if option_text is None:
+        return 0
+    s = str(option_text).strip()
+    if s.isdigit():
+        return int(s)
+    lang_code = lang if lang in TRANSLATIONS else "en"
+    opts = TRANSLATIONS.get(lang_code, {}).get("Q", {}).get(qkey, {}).get("opts")
+    if not opts:
+        opts = TRANSLATIONS.get("en", {}).get("Q", {}).get(qkey, {}).get("opts")
+    if isinstance(opts, list):
+        try:
+            return opts.index(s) + 1
+        except ValueError:
+            return None
+    return None
+
+
+def list_index_to_english(q_id, selected_option, lang_code):
+    """map_to_english as it was before the option index."""
+    if lang_code == "en":
+        return selected_option
+    en_opts = TRANSLATIONS.get("en", {}).get("Q", {}).get(q_id, {}).get("opts", [])
+    lang_opts = TRANSLATIONS.get(lang_code, {}).get("Q", {}).get(q_id, {}).get("opts", [])
+    if not en_opts or not lang_opts:
+        return selected_option
+    try:
+        return en_opts[lang_opts.index(selected_option)]
+    except ValueError:
+        return selected_option
+
+
+def candidate_texts(q_id):
+    """Every option of the question in every language, plus values no list holds."""
+    texts = [None, "", "3", "  2 ", "not an option"]
+    for lang in ("en", "hi", "mr"):
+        for text in TRANSLATIONS[lang]["Q"].get(q_id, {}).get("opts") or ():
+            texts += [text, f" {text} "]
+    return texts
+
+
+@pytest.mark.parametrize("lang", LANGS)
+def test_score_numeric_matches_the_list_walk(lang):
+    mismatches = [
+        (q_id, text, score_numeric(q_id, text, lang), list_index_score(q_id, text, lang))
+        for q_id in QUESTION_IDS
+        for text in candidate_texts(q_id)
+        if score_numeric(q_id, text, lang) != list_index_score(q_id, text, lang)
+    ]
+    assert mismatches == []
+
+
+@pytest.mark.parametrize("lang", LANGS)
+def test_map_to_english_matches_the_list_walk(lang):
+    mismatches = [
+        (q_id, text, map_to_english(q_id, text, lang), list_index_to_english(q_id, text, lang))
+        for q_id in QUESTION_IDS
+        for text in candidate_texts(q_id)
+        if map_to_english(q_id, text, lang) != list_index_to_english(q_id, text, lang)
+    ]
+    assert mismatches == []
@@ -0,0 +1,72 @@
+import pytest
+
+import metrics
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", True)
+    monkeypatch.setattr(metrics, "_collectors", [])
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_histogram_buckets_are_cumulative_up_to_inf(enabled):
+    for value in (0.003, 0.02, 0.02, 7.0, 60.0):
+        metrics.observe("trail_save_seconds", value, backend="sqlite")
+    lines = metrics.render().splitlines()
+
+    assert "# TYPE trail_save_seconds histogram" in lines
+    buckets = [line for line in lines if line.startswith("trail_save_seconds_bucket")]
+    assert len(buckets) == len(metrics.DEFAULT_BUCKETS) + 1
+    assert 'trail_save_seconds_bucket{backend="sqlite",le="0.005"} 1' in buckets
+    assert 'trail_save_seconds_bucket{backend="sqlite",le="0.025"} 3' in buckets
+    assert 'trail_save_seconds_bucket{backend="sqlite",le="10.0"} 4' in buckets
+    assert buckets[-1] == 'trail_save_seconds_bucket{backend="sqlite",le="+Inf"} 5'
+    counts = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+    assert counts == sorted(counts)
+    assert 'trail_save_seconds_count{backend="sqlite"} 5' in lines
+
+
+def test_label_values_are_escaped(enabled):
+    metrics.inc("trail_errors_total", where='say "hi"\nback\\slash', exception="ValueError")
+    metrics.register_collector(lambda: [("trail_submission_queue_depth", {}, float("inf"))])
+    text = metrics.render()
+    assert 'trail_errors_total{exception="ValueError",where="say \\"hi\\"\\nback\\\\slash"} 1' in text
+    assert "trail_submission_queue_depth +Inf" in text
+    assert "# TYPE trail_submission_queue_depth gauge" in text
+
+
+def test_disabled_metrics_record_nothing(monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", False)
+    metrics.reset()
+    metrics.inc("trail_saved_rows_total", 3)
+    metrics.observe("trail_save_seconds", 0.1)
+    with metrics.timer("trail_page_seconds", page="1"):
+        pass
+
+    def fn():
+        return 1
+
+    assert metrics.timed("trail_scoring_seconds")(fn) is fn
+    assert metrics.timer("trail_page_seconds") is metrics.timer("trail_scoring_seconds")
+    assert metrics.render() == "\n"
+
+
+class RerunRequested(BaseException):
+    """Like the exception st.rerun() raises to end the script early."""
+
+
+def test_timer_counts_exceptions_but_not_base_exceptions(enabled):
+    with pytest.raises(RerunRequested):
+        with metrics.timer("trail_page_seconds", page="2"):
+            raise RerunRequested()
+    with pytest.raises(KeyError):
+        with metrics.timer("trail_page_seconds", page="2"):
+            raise KeyError("x")
+
+    text = metrics.render()
+    assert 'trail_page_seconds_count{page="2"} 2' in text
+    assert 'trail_errors_total{exception="KeyError",where="trail_page_seconds"} 1' in text
+    assert "RerunRequested" not in text
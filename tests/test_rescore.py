@@ -0,0 +1,78 @@
+import io
+import json
+import random
+
+import pandas as pd
+import pytest
+
+from rescore import ChunkWriter, rescore_chunk, run
+from trail_core.catalog import get_catalog
+from trail_core.interpretation import interpret_score
+from trail_core.scoring import SCALE_COLUMNS, SCORED_KEYS, compute_scores
+
+
+def export_frame(rows, seed=0):
+    """An export as read_chunks hands it over: every cell text, blanks as ""."""
+    rng = random.Random(seed)
+    en = get_catalog().translations["en"]["Q"]
+    records = []
+    for n in range(rows):
+        record = {"survey_id": f"s{n}", "timestamp": "2026-01-01 10:00:00", "respondent_lang": "en"}
+        for q_id in SCORED_KEYS:
+            record[q_id] = "" if rng.random() < 0.1 else rng.choice(en[q_id]["opts"])
+        record.update(compute_scores(record))
+        if n % 3 == 0:
+            record["WHO_total"] += 4  # stored under an older scoring
+        records.append({k: "" if v is None else str(v) for k, v in record.items()})
+    return pd.DataFrame(records)
+
+
+def test_chunk_matches_the_scalar_scorer_and_bands():
+    df = export_frame(60)
+    out = rescore_chunk(df)
+    for i, row in df.iterrows():
+        scores = compute_scores({q_id: row[q_id] for q_id in SCORED_KEYS})
+        for scale in SCALE_COLUMNS:
+            assert out.loc[i, scale] == scores[scale]
+            band = interpret_score(scale, scores[scale])
+            assert out.loc[i, f"{scale}_band"] == (band["level"] if band else None)
+        assert out.loc[i, "changed"] == (i % 3 == 0)
+
+
+class Collect:
+    def __init__(self):
+        self.chunks = []
+
+    def __call__(self, df):
+        self.chunks.append(df)
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_run_writes_chunks_in_input_order(workers):
+    df = export_frame(50)
+    chunks = [df.iloc[start:start + 7] for start in range(0, len(df), 7)]
+    collect = Collect()
+
+    assert run(iter(chunks), collect, workers) == (50, 17)
+    assert [list(chunk["survey_id"]) for chunk in collect.chunks] == [list(chunk["survey_id"]) for chunk in chunks]
+
+
+def test_empty_chunks_write_a_csv_header_once_and_no_blank_jsonl_lines(tmp_path):
+    out = rescore_chunk(export_frame(6))
+    unchanged = out[~out["changed"]]
+    for fmt in ("csv", "jsonl"):
+        path = str(tmp_path / f"out.{fmt}")
+        writer = ChunkWriter(path, fmt)
+        writer.write(out.iloc[:0])
+        writer.write(unchanged)
+        writer.write(out.iloc[:0])
+        writer.close()
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        if fmt == "csv":
+            assert len(pd.read_csv(io.StringIO(text))) == len(unchanged)
+            assert text.count("survey_id") == 1
+        else:
+            lines = text.split("\n")
+            assert lines[-1] == "" and all(lines[:-1])
+            assert [json.loads(line)["survey_id"] for line in lines[:-1]] == list(unchanged["survey_id"])
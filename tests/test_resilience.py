@@ -0,0 +1,63 @@
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from resilience import GuardedClient
+from sheets import _is_transient_sheets_error, _is_unapplied_sheets_error
+
+
+class ServerError(Exception):
+    """A 5xx: the request may or may not have been applied."""
+
+
+class Throttled(Exception):
+    """A 429: rejected before it was applied."""
+
+
+def client():
+    return GuardedClient(
+        "test", lambda e: isinstance(e, (ServerError, Throttled)), rate_per_minute=6000, burst=100,
+        failure_threshold=100, max_attempts=3, backoff_initial=0, backoff_max=0,
+        is_unapplied=lambda e: isinstance(e, Throttled),
+    )
+
+
+def flaky(*errors):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return "ok"
+
+    return fn, calls
+
+
+def test_idempotent_calls_retry_transient_errors():
+    fn, calls = flaky(ServerError(), Throttled())
+    assert client().call(fn) == "ok"
+    assert len(calls) == 3
+
+
+def test_appends_are_not_retried_when_they_may_have_landed():
+    fn, calls = flaky(ServerError())
+    with pytest.raises(ServerError):
+        client().call(fn, idempotent=False)
+    assert len(calls) == 1
+
+
+def test_appends_are_retried_when_they_cannot_have_landed():
+    fn, calls = flaky(Throttled(), Throttled())
+    assert client().call(fn, idempotent=False) == "ok"
+    assert len(calls) == 3
+
+
+def test_sheets_unapplied_errors():
+    refused = requests.ConnectionError(MaxRetryError(None, "/", NewConnectionError(None, "Connection refused")))
+    assert _is_unapplied_sheets_error(requests.ConnectTimeout())
+    assert _is_unapplied_sheets_error(refused)
+    assert _is_transient_sheets_error(requests.ReadTimeout())
+    assert not _is_unapplied_sheets_error(requests.ReadTimeout())
+    assert not _is_unapplied_sheets_error(requests.ConnectionError("connection reset"))
+
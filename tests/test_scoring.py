@@ -0,0 +1,76 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trail_core.catalog import get_catalog
+from trail_core.scoring import (
+    MISSING_CODE,
+    SCALE_COLUMNS,
+    SCORED_KEYS,
+    compute_scores,
+    compute_scores_batch,
+    score_codes,
+)
+
+
+def random_answers(rng, lang):
+    """One respondent: real options, numeric strings, junk, None and gaps."""
+    q_block = get_catalog().translations[lang]["Q"]
+    answers = {}
+    for qkey in SCORED_KEYS:
+        roll = rng.random()
+        if roll < 0.1:
+            continue  # never shown
+        if roll < 0.15:
+            answers[qkey] = None
+        elif roll < 0.2:
+            answers[qkey] = str(rng.randint(0, 6))
+        elif roll < 0.25:
+            answers[qkey] = "not an option"
+        else:
+            opts = q_block.get(qkey, {}).get("opts") or get_catalog().translations["en"]["Q"][qkey]["opts"]
+            answers[qkey] = rng.choice(opts)
+    return answers
+
+
+@pytest.mark.parametrize("lang", ["en", "hi", "mr"])
+def test_batch_matches_scalar_row_for_row(lang):
+    rng = random.Random(lang)
+    df = pd.DataFrame([random_answers(rng, lang) for _ in range(500)])
+    batch = compute_scores_batch(df, lang)
+
+    for i, row in df.iterrows():
+        # A null cell in the frame is an explicit None answer
+        answers = {k: (None if pd.isna(v) else v) for k, v in row.items()}
+        assert batch.loc[i].to_dict() == compute_scores(answers, lang)
+
+
+def test_batch_treats_absent_columns_as_unanswered():
+    df = pd.DataFrame({"C1": ["1", "5"], "F3": ["2", None]})
+    batch = compute_scores_batch(df)
+    for i, row in df.iterrows():
+        answers = {k: (None if pd.isna(v) else v) for k, v in row.items()}
+        assert batch.loc[i].to_dict() == compute_scores(answers)
+
+
+def test_coded_array_matches_score_codes():
+    rng = np.random.default_rng(0)
+    codes = rng.integers(MISSING_CODE, 6, size=(300, len(SCORED_KEYS)))
+    batch = compute_scores_batch(codes, columns=SCORED_KEYS)
+
+    for i, row in enumerate(codes):
+        answered = {k: int(c) for k, c in zip(SCORED_KEYS, row) if c != MISSING_CODE}
+        assert batch.loc[i].to_dict() == score_codes(answered)
+
+
+def test_batch_result_dtype_and_columns():
+    batch = compute_scores_batch(pd.DataFrame({"B6": ["1"]}))
+    assert list(batch.columns) == SCALE_COLUMNS
+    assert all(dtype == np.int64 for dtype in batch.dtypes)
+
+
+def test_coded_array_needs_column_names():
+    with pytest.raises(ValueError):
+        compute_scores_batch(np.zeros((2, 3)))
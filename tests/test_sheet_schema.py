@@ -0,0 +1,115 @@
+import re
+
+import pytest
+
+from sheets import HeaderConflictError, SheetHandle, SheetSchema
+
+
+class FakeWorksheet:
+    """Cells of a sheet; `on_update` runs just after each update, as another process would."""
+
+    def __init__(self, header, col_count=26):
+        self.rows = [list(header)]
+        self.col_count = col_count
+        self.updates = []
+        self.on_update = None
+
+    def row_values(self, row):
+        values = list(self.rows[row - 1])
+        while values and values[-1] == "":
+            values.pop()
+        return values
+
+    def add_cols(self, n):
+        self.col_count += n
+
+    def write(self, col, values):
+        header = self.rows[0]
+        header.extend([""] * (col - 1 + len(values) - len(header)))
+        header[col - 1:col - 1 + len(values)] = values
+
+    def update(self, range_name, values):
+        first = re.match(r"([A-Z]+)1:", range_name).group(1)
+        col = 0
+        for letter in first:
+            col = col * 26 + ord(letter) - ord("A") + 1
+        assert col - 1 + len(values[0]) <= self.col_count, "exceeds grid limits"
+        self.updates.append(range_name)
+        self.write(col, values[0])
+        if self.on_update:
+            self.on_update(self)
+
+
+def test_rows_follow_the_header_whatever_the_key_order():
+    handle = SheetHandle(None, FakeWorksheet(["survey_id", "A1", "A2", "score"]))
+    rows = handle.align_rows([
+        {"score": 7, "A2": "No", "survey_id": "s1", "A1": "Yes"},
+        {"survey_id": "s2", "A1": None, "score": 3},
+    ])
+    assert rows == [["s1", "Yes", "No", 7], ["s2", "", "", 3]]
+    assert handle.worksheet.updates == []
+
+
+def test_new_keys_are_added_past_the_end_in_one_write():
+    worksheet = FakeWorksheet(["survey_id", "A1"], col_count=2)
+    handle = SheetHandle(None, worksheet)
+    rows = handle.align_rows([
+        {"survey_id": "s1", "A1": "Yes", "B14_details": "x"},
+        {"survey_id": "s2", "respondent_lang": "mr", "A1": "No"},
+    ])
+    assert worksheet.rows[0] == ["survey_id", "A1", "B14_details", "respondent_lang"]
+    assert worksheet.updates == ["C1:D1"]
+    assert worksheet.col_count == 4
+    assert rows == [["s1", "Yes", "x", ""], ["s2", "No", "", "mr"]]
+
+
+def test_keys_another_process_added_are_reused():
+    worksheet = FakeWorksheet(["survey_id"])
+    handle = SheetHandle(None, worksheet)
+    handle.align_rows([{"survey_id": "s0"}])
+    worksheet.write(2, ["A1"])  # another process, after our first read
+
+    assert handle.align_rows([{"survey_id": "s1", "A1": "Yes"}]) == [["s1", "Yes"]]
+    assert worksheet.updates == []
+
+
+def test_a_column_lost_to_a_concurrent_writer_is_added_again():
+    worksheet = FakeWorksheet(["survey_id", "A1"])
+
+    def other_process_overwrites(ws):
+        # It read row 1 before our write and puts its own key in the same cell
+        ws.on_update = None
+        ws.write(3, ["C9"])
+
+    worksheet.on_update = other_process_overwrites
+    handle = SheetHandle(None, worksheet)
+    rows = handle.align_rows([{"survey_id": "s1", "A1": "Yes", "B14_details": "x"}])
+
+    assert worksheet.rows[0] == ["survey_id", "A1", "C9", "B14_details"]
+    assert worksheet.updates == ["C1:C1", "D1:D1"]
+    assert rows == [["s1", "Yes", "", "x"]]
+
+
+def test_an_overwrite_after_the_read_back_is_caught_on_the_next_append():
+    worksheet = FakeWorksheet(["survey_id", "A1"])
+    handle = SheetHandle(None, worksheet)
+    handle.align_rows([{"survey_id": "s1", "B14_details": "x"}])
+    worksheet.write(3, ["C9"])  # another process that read row 1 before our write
+
+    rows = handle.align_rows([{"survey_id": "s2", "B14_details": "y"}])
+    assert worksheet.rows[0] == ["survey_id", "A1", "C9", "B14_details"]
+    assert rows == [["s2", "", "", "y"]]
+
+
+def test_a_header_that_keeps_changing_raises_before_any_row_is_built():
+    worksheet = FakeWorksheet(["survey_id"])
+    worksheet.on_update = lambda ws: ws.write(len(ws.row_values(1)), ["theirs"])
+    handle = SheetHandle(None, worksheet)
+    with pytest.raises(HeaderConflictError):
+        handle.align_rows([{"survey_id": "s1", "mine": "x"}])
+
+
+def test_missing_keys_in_first_seen_order():
+    schema = SheetSchema(["survey_id", "A1", "A1"])
+    assert schema.index == {"survey_id": 0, "A1": 1}
+    assert schema.missing([{"b": 1, "A1": 2}, {"a": 3, "b": 4}]) == ["b", "a"]
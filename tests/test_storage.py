@@ -0,0 +1,166 @@
+import sqlite3
+
+import pytest
+
+import storage
+from storage import ParquetStore, ResponseStore, SheetsStore, SQLiteStore
+
+
+class FakeSpreadsheet:
+    def __init__(self, worksheet):
+        self.worksheet = worksheet
+
+    def fetch_sheet_metadata(self):
+        return {"sheets": [{"properties": {"sheetId": 7, "gridProperties": {"rowCount": len(self.worksheet.cells)}}}]}
+
+
+class FakeWorksheet:
+    """Rows of cells; get("a:b") trims trailing blanks the way the Sheets API does."""
+
+    id = 7
+    row_count = 1  # stale, as gspread caches it when the worksheet is opened
+
+    def __init__(self, cells):
+        self.cells = cells
+        self.spreadsheet = FakeSpreadsheet(self)
+        self.reads = []
+
+    def get(self, a1):
+        start, end = (int(part) for part in a1.split(":"))
+        self.reads.append(a1)
+        rows = [list(row) for row in self.cells[start - 1:end]]
+        for row in rows:
+            while row and row[-1] == "":
+                row.pop()
+        while rows and not rows[-1]:
+            rows.pop()
+        return rows
+
+    def row_values(self, row):
+        return self.get(f"{row}:{row}")[0] if self.cells else []
+
+
+class FakeHandle:
+    def __init__(self, worksheet):
+        self.worksheet = worksheet
+
+
+@pytest.fixture
+def sheet(monkeypatch):
+    def use(cells):
+        handle = FakeHandle(FakeWorksheet(cells))
+        monkeypatch.setattr(storage, "with_sheet_handle", lambda fn, sheet_name="Database", op="call": fn(handle))
+        return handle.worksheet
+
+    return use
+
+
+def test_incomplete_backend_fails_when_built():
+    class WriteOnly(ResponseStore):
+        def append_many(self, records):
+            pass
+
+    with pytest.raises(TypeError):
+        WriteOnly()
+
+
+def test_sheets_scan_reads_past_blank_rows(sheet):
+    cells = [["survey_id", "A1"]] + [[f"s{n}", str(n)] for n in range(5)]
+    cells += [[""] * 2] * 7 + [["s5", ""], ["s6", "6"]] + [[""] * 2] * 3
+    worksheet = sheet(cells)
+
+    rows = list(SheetsStore().scan(page_rows=4))
+    assert [row["survey_id"] for row in rows] == [f"s{n}" for n in range(7)]
+    assert rows[5] == {"survey_id": "s5", "A1": ""}
+    assert worksheet.reads[-1] == "18:18"
+
+
+def test_sheets_scan_of_an_empty_sheet(sheet):
+    sheet([])
+    assert list(SheetsStore().scan()) == []
+
+
+def test_sheets_columns_are_the_header_row(sheet):
+    sheet([["survey_id", "A1", "B14_details"], ["s1", "x", ""]])
+    assert SheetsStore().columns() == ["survey_id", "A1", "B14_details"]
+    sheet([])
+    assert SheetsStore().columns() == storage.record_columns()
+
+
+@pytest.mark.parametrize("make_store", [
+    lambda tmp_path: SQLiteStore(str(tmp_path / "responses.sqlite3")),
+    lambda tmp_path: ParquetStore(str(tmp_path / "parquet")),
+])
+def test_local_backends_round_trip(tmp_path, make_store):
+    store = make_store(tmp_path)
+    records = [{"survey_id": f"s{n}", "timestamp": f"2026-01-0{n % 3 + 1} 10:00:00", "A1": str(n)} for n in range(6)]
+    store.append_many(records[:4])
+    store.append(records[4])
+    store.append_many(records[5:])
+    assert store.count() == 6
+    assert sorted(r["survey_id"] for r in store.scan()) == [r["survey_id"] for r in records]
+    assert store.existing_ids(["s1", "s5", "s9"]) == {"s1", "s5"}
+
+
+def test_parquet_keeps_every_key_of_a_mixed_batch(tmp_path):
+    store = ParquetStore(str(tmp_path / "parquet"))
+    store.append_many([
+        {"survey_id": "s1", "timestamp": "2026-01-01 10:00:00", "B14": "No", "WHO_total": 12},
+        {"survey_id": "s2", "timestamp": "2026-01-01 11:00:00", "B14": "Yes", "B14_details": "knee",
+         "WHO_total": "15", "respondent_lang": "hi"},
+        {"survey_id": "s3", "timestamp": "2026-01-01 12:00:00", "WHO_total": "n/a"},
+    ])
+    rows = {r["survey_id"]: r for r in store.scan()}
+    assert rows["s2"]["B14_details"] == "knee" and rows["s2"]["respondent_lang"] == "hi"
+    assert rows["s1"]["B14_details"] is None and rows["s3"]["B14"] is None
+    assert [rows[s]["WHO_total"] for s in ("s1", "s2", "s3")] == [12, 15, None]
+
+
+def test_sqlite_upsert_keeps_one_row_per_survey_id(tmp_path):
+    store = SQLiteStore(str(tmp_path / "responses.sqlite3"))
+    store.append_many([{"survey_id": "s1", "A1": "old"}, {"survey_id": "s2", "A1": "x"}])
+    store.append_many([{"survey_id": "s1", "A1": "new"}])
+    store.append({"survey_id": "s1", "A1": "new"})
+    assert store.count() == 2
+    assert {r["survey_id"]: r["A1"] for r in store.scan()} == {"s1": "new", "s2": "x"}
+
+
+def test_sqlite_migration_dedups_an_old_file_once(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE responses (id INTEGER PRIMARY KEY AUTOINCREMENT,"
+        " survey_id TEXT NOT NULL, timestamp TEXT, data TEXT NOT NULL)"
+    )
+    conn.executemany(
+        "INSERT INTO responses (survey_id, data) VALUES (?, ?)",
+        [("s1", '{"survey_id": "s1", "A1": "old"}'), ("s2", '{"survey_id": "s2"}'),
+         ("s1", '{"survey_id": "s1", "A1": "new"}')],
+    )
+    conn.commit()
+
+    store = SQLiteStore(path)
+    assert {r["survey_id"]: r.get("A1") for r in store.scan()} == {"s2": None, "s1": "new"}
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == SQLiteStore.SCHEMA_VERSION
+
+    # Later opens skip the migration: a row it would have deleted survives
+    conn.execute("DROP INDEX responses_survey_id")
+    conn.execute("INSERT INTO responses (survey_id, data) VALUES ('s2', '{\"survey_id\": \"s2\"}')")
+    conn.commit()
+    assert SQLiteStore(path).count() == 3
+
+
+def test_sidecar_files_sit_beside_the_store(tmp_path, monkeypatch):
+    monkeypatch.delenv("TRAIL_SIDECAR", raising=False)
+    assert storage.sidecar_path(ParquetStore(str(tmp_path / "pq")), "x.json") == str(tmp_path / "pq" / "_x.json")
+    assert storage.sidecar_path(SQLiteStore(str(tmp_path / "r.db")), "x.json") == str(tmp_path / "r.db") + ".x.json"
+    assert storage.sidecar_path(SheetsStore(), "x.json", env="TRAIL_SIDECAR") == "x.json"
+    monkeypatch.setenv("TRAIL_SIDECAR", "elsewhere.json")
+    assert storage.sidecar_path(SheetsStore(), "x.json", env="TRAIL_SIDECAR") == "elsewhere.json"
+
+
+def test_sqlite_lookup_spans_several_chunks(tmp_path):
+    store = SQLiteStore(str(tmp_path / "responses.sqlite3"))
+    store.append_many([{"survey_id": f"s{n}"} for n in range(storage.LOOKUP_CHUNK + 10)])
+    wanted = [f"s{n}" for n in range(0, storage.LOOKUP_CHUNK * 3, 7)]
+    assert store.existing_ids(wanted) == {i for i in wanted if int(i[1:]) < storage.LOOKUP_CHUNK + 10}
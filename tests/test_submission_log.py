@@ -0,0 +1,59 @@
+import json
+
+from submission_log import SubmissionLog
+
+
+def record(n):
+    return {"survey_id": f"s{n}", "A1": str(n)}
+
+
+def test_pending_survives_restart_in_order(tmp_path):
+    path = str(tmp_path / "wal.jsonl")
+    log = SubmissionLog(path)
+    for n in range(5):
+        log.append(record(n))
+    log.ack(["s1", "s3"])
+
+    reopened = SubmissionLog(path)
+    assert [r["survey_id"] for r in reopened.pending()] == ["s0", "s2", "s4"]
+    assert [r["survey_id"] for r in reopened.pending(2)] == ["s0", "s2"]
+
+
+def test_compacts_once_everything_is_acked(tmp_path):
+    path = tmp_path / "wal.jsonl"
+    log = SubmissionLog(str(path))
+    log.append(record(0))
+    log.append(record(1))
+    log.ack(["s0", "s1", "unknown"])
+    assert len(log) == 0
+    assert path.read_text() == ""
+    log.append(record(2))
+    assert [r["survey_id"] for r in SubmissionLog(str(path)).pending()] == ["s2"]
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    path = tmp_path / "wal.jsonl"
+    log = SubmissionLog(str(path))
+    log.append(record(0))
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"op": "put", "survey_id": "s1", "rec')
+    assert [r["survey_id"] for r in SubmissionLog(str(path)).pending()] == ["s0"]
+
+
+def test_parked_records_are_kept_through_compaction_and_requeued(tmp_path):
+    path = tmp_path / "wal.jsonl"
+    log = SubmissionLog(str(path))
+    log.append(record(0))
+    log.append(record(1))
+    assert log.park("s0", "ValueError: bad row")
+    assert not log.park("missing")
+    log.ack(["s1"])  # compacts: only the parked record is left
+
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [e["op"] for e in entries] == ["put", "park"]
+
+    reopened = SubmissionLog(str(path))
+    assert reopened.pending() == []
+    assert reopened.parked() == {"s0": "ValueError: bad row"}
+    assert reopened.requeue() == 1
+    assert [r["survey_id"] for r in SubmissionLog(str(path)).pending()] == ["s0"]
@@ -0,0 +1,181 @@
+import time
+
+import pytest
+
+from dedup import SubmissionIndex
+from storage import ResponseStore
+from submission_log import SubmissionLog
+from submission_writer import SubmissionWriter
+
+
+class MemoryStore(ResponseStore):
+    """Keeps rows in a list; `fail` decides per batch whether append_many raises."""
+
+    def __init__(self, fail=None):
+        self.rows = []
+        self.fail = fail
+        self.calls = 0
+
+    def append_many(self, records):
+        self.calls += 1
+        error = self.fail(records) if self.fail else None
+        if error is not None:
+            raise error
+        self.rows.extend(records)
+
+    def scan(self):
+        return iter(list(self.rows))
+
+    def count(self):
+        return len(self.rows)
+
+
+def record(n):
+    return {"survey_id": f"s{n}", "A1": str(n)}
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("timed out")
+        time.sleep(0.01)
+
+
+def ids(rows):
+    return [row["survey_id"] for row in rows]
+
+
+def test_replays_leftovers_before_new_submissions(tmp_path):
+    log = SubmissionLog(str(tmp_path / "wal.jsonl"))
+    for n in range(3):
+        log.append(record(n))  # left over from a previous process
+
+    store = MemoryStore()
+    writer = SubmissionWriter(store, batch_size=2, flush_interval=0.05, log=log)
+    for n in range(3, 6):
+        assert writer.submit(record(n))
+    wait_for(lambda: len(store.rows) == 6)
+    assert ids(store.rows) == [f"s{n}" for n in range(6)]
+    wait_for(lambda: len(log) == 0)
+    assert writer.stats()["replayed"] == 3
+
+
+def test_transient_errors_are_retried_until_they_pass(tmp_path):
+    outage = {"left": 3}
+
+    def fail(records):
+        if outage["left"]:
+            outage["left"] -= 1
+            return ConnectionError("sheets unreachable")
+        return None
+
+    store = MemoryStore(fail)
+    log = SubmissionLog(str(tmp_path / "wal.jsonl"))
+    writer = SubmissionWriter(store, batch_size=5, flush_interval=0.01, log=log, max_attempts=2)
+    for n in range(5):
+        writer.submit(record(n))
+    wait_for(lambda: len(store.rows) == 5)
+    assert ids(store.rows) == [f"s{n}" for n in range(5)]
+    assert writer.stats()["parked"] == 0
+
+
+def test_poison_record_is_parked_and_later_records_still_saved(tmp_path):
+    def fail(records):
+        if any(r["survey_id"] == "s2" for r in records):
+            return ValueError("bad row")
+        return None
+
+    store = MemoryStore(fail)
+    log = SubmissionLog(str(tmp_path / "wal.jsonl"))
+    writer = SubmissionWriter(store, batch_size=4, flush_interval=0.01, log=log, max_attempts=2)
+    for n in range(8):
+        writer.submit(record(n))
+    wait_for(lambda: len(store.rows) == 7)
+    assert ids(store.rows) == [f"s{n}" for n in range(8) if n != 2]
+    assert list(log.parked()) == ["s2"]
+    assert writer.stats()["parked"] == 1
+
+
+def test_writer_survives_a_failing_log_disk(tmp_path):
+    log = SubmissionLog(str(tmp_path / "wal.jsonl"))
+    real_ack = log.ack
+    broken = {"left": 2}
+
+    def ack(survey_ids):
+        if broken["left"]:
+            broken["left"] -= 1
+            raise OSError(28, "No space left on device")
+        real_ack(survey_ids)
+
+    log.ack = ack
+    store = MemoryStore()
+    writer = SubmissionWriter(store, batch_size=1, flush_interval=0.01, log=log)
+    writer.submit(record(0))
+    wait_for(lambda: len(log) == 0)
+    writer.submit(record(1))
+    wait_for(lambda: "s1" in ids(store.rows))
+    assert writer._thread.is_alive()
+    assert writer.stats()["loop_errors"] == 2
+    assert "No space left" in writer.stats()["last_error"]
+
+
+def test_index_drops_records_already_written(tmp_path):
+    index = SubmissionIndex(str(tmp_path / "ids.sqlite3"))
+    log = SubmissionLog(str(tmp_path / "wal.jsonl"))
+    log.append(record(0))  # written, but the process died before the ack
+    store = MemoryStore()
+    store.rows.append(record(0))
+
+    writer = SubmissionWriter(store, batch_size=2, flush_interval=0.01, log=log, index=index)
+    writer.submit(record(1))
+    writer.submit(record(1))
+    wait_for(lambda: len(log) == 0)
+    assert ids(store.rows) == ["s0", "s1"]
+    assert index.known(["s0", "s1"]) == {"s0", "s1"}
+
+
+def test_replayed_records_stored_but_not_indexed_are_not_written_again(tmp_path):
+    # The previous process died between append_many and index.add
+    index = SubmissionIndex(str(tmp_path / "ids.sqlite3"))
+    index.rebuild_from([])  # built, so not rebuilt from the store at startup
+    log = SubmissionLog(str(tmp_path / "wal.jsonl"))
+    log.append(record(0))
+    log.append(record(1))
+    store = MemoryStore()
+    store.rows.append(record(0))
+
+    writer = SubmissionWriter(store, batch_size=2, flush_interval=0.01, log=log, index=index)
+    wait_for(lambda: len(log) == 0)
+    assert ids(store.rows) == ["s0", "s1"]
+    assert index.known(["s0", "s1"]) == {"s0", "s1"}
+    assert writer.stats()["recovered"] == 1
+
+
+def test_without_a_log_a_full_queue_rejects():
+    store = MemoryStore(lambda records: ConnectionError("down"))
+    writer = SubmissionWriter(store, batch_size=100, flush_interval=10, max_queue=2)
+    assert writer.submit(record(0))
+    assert writer.submit(record(1))
+    assert not writer.submit(record(2))
+    assert writer.stats()["rejected"] == 1
+
+
+def test_a_write_that_landed_before_failing_is_not_written_again(tmp_path):
+    timed_out = {"left": 1}
+
+    class LandsThenTimesOut(MemoryStore):
+        def append_many(self, records):
+            super().append_many(records)
+            if timed_out["left"]:
+                timed_out["left"] -= 1
+                raise TimeoutError("read timed out")
+
+    store = LandsThenTimesOut()
+    log = SubmissionLog(str(tmp_path / "wal.jsonl"))
+    writer = SubmissionWriter(store, batch_size=3, flush_interval=0.01, log=log)
+    for n in range(3):
+        writer.submit(record(n))
+    wait_for(lambda: len(log) == 0)
+    assert ids(store.rows) == ["s0", "s1", "s2"]
+    assert writer.stats()["recovered"] == 3
@@ -0,0 +1,50 @@
+import pytest
+
+from survey_schema import QUESTION_IDS, SURVEY, TOTAL_PAGES, compile_page_plans, page_plan
+from trail_core.catalog import EMPTY_CATALOG, get_catalog
+
+
+def survey_with_followup(q_id, when):
+    return ({
+        "id": "B",
+        "groups": [{"questions": ["B12", "B13"]}],
+        "followups": {q_id: {"key": f"{q_id}_details", "label": "Please specify", "when": when}},
+    },)
+
+
+@pytest.mark.parametrize("lang", ["en", "hi", "mr"])
+def test_every_question_is_in_the_catalog(lang):
+    plans = compile_page_plans(lang, get_catalog())
+    assert len(plans) == TOTAL_PAGES
+    assert tuple(q_id for plan in plans for q_id in plan.question_ids) == QUESTION_IDS
+    for plan in plans:
+        for group in plan.groups:
+            for question in group.questions:
+                assert question.options == get_catalog().question(lang, question.q_id)["opts"]
+
+
+def test_question_ids_are_unique():
+    assert len(set(QUESTION_IDS)) == len(QUESTION_IDS)
+
+
+def test_followup_compiles_to_option_codes_for_every_language():
+    for lang in ("en", "hi", "mr"):
+        (plan,) = compile_page_plans(lang, get_catalog(), survey_with_followup("B13", ["Yes"]))
+        b13 = plan.groups[0].questions[1]
+        assert b13.followup.when == frozenset({get_catalog().en_options["B13"].index("Yes") + 1})
+
+
+def test_followup_outside_the_section_is_rejected():
+    with pytest.raises(ValueError, match="not in the section"):
+        compile_page_plans("en", get_catalog(), survey_with_followup("B14", ["Yes"]))
+
+
+def test_followup_with_unknown_option_is_rejected():
+    with pytest.raises(ValueError, match="unknown options"):
+        compile_page_plans("en", get_catalog(), survey_with_followup("B13", ["Maybe"]))
+
+
+def test_fallback_catalog_still_compiles():
+    plan = page_plan("mr", 2, EMPTY_CATALOG)
+    assert plan.question_ids == tuple(SURVEY[0]["groups"][0]["questions"])
+    assert page_plan("en", 1, EMPTY_CATALOG) is None
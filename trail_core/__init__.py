@@ -0,0 +1,22 @@
+# trail_core: scoring, translation catalog, interpretation and English
+# mapping with no Streamlit, Google or network imports. NumPy and pandas are
+# imported only by the batch functions that need them.
+from .answers import AnswerSheet
+from .catalog import Catalog, CatalogError, get_catalog, load_catalog, t, t_question
+from .interpretation import (
+    INTERPRETATION_LABELS,
+    SCORE_INTERPRETATIONS,
+    get_interpretation_labels,
+    interpret_score,
+    interpret_scores,
+)
+from .mapping import map_to_english
+from .scoring import (
+    MISSING_CODE,
+    SCALE_COLUMNS,
+    compute_scores,
+    compute_scores_batch,
+    encode_answers,
+    score_codes,
+    score_numeric,
+)
@@ -0,0 +1,71 @@
+from array import array
+from functools import lru_cache
+
+from .catalog import get_catalog
+
+# --------------------------------------------------
+# Language-neutral answers
+# --------------------------------------------------
+# An answer is the 1-based option code of the chosen option, the same code
+# score_numeric returns. Code 0 means unanswered. Option text is looked up
+# only for display and for the English copy that gets saved.
+
+UNANSWERED = 0
+
+
+@lru_cache(maxsize=8)
+def _slot_map(question_ids):
+    # Shared by every sheet with the same question list
+    return {q_id: i for i, q_id in enumerate(question_ids)}
+
+
+def catalog_question_ids(catalog=None):
+    """Question ids in catalog (English) order, the default AnswerSheet slots."""
+    return tuple((catalog or get_catalog()).en_options)
+
+
+class AnswerSheet:
+    """
+    One respondent's answers: one byte per question in an array, plus a
+    small dict for free-text follow-ups (see survey_schema).
+    """
+
+    __slots__ = ("question_ids", "_slots", "codes", "details")
+
+    def __init__(self, question_ids=None):
+        self.question_ids = tuple(question_ids) if question_ids is not None else catalog_question_ids()
+        self._slots = _slot_map(self.question_ids)
+        self.codes = array("B", bytes(len(self.question_ids)))
+        self.details = {}
+
+    def get(self, q_id):
+        """Option code of an answer, or None when unanswered or unknown."""
+        slot = self._slots.get(q_id)
+        if slot is None:
+            return None
+        return self.codes[slot] or None
+
+    def set(self, q_id, code):
+        """Stores an option code; None clears the answer."""
+        self.codes[self._slots[q_id]] = code or UNANSWERED
+
+    def unanswered(self, q_ids):
+        return [q_id for q_id in q_ids if self.get(q_id) is None]
+
+    def answered_codes(self):
+        """{question id: option code} for every answered question."""
+        return {q_id: code for q_id, code in zip(self.question_ids, self.codes) if code}
+
+    def clear(self):
+        self.codes = array("B", bytes(len(self.question_ids)))
+        self.details = {}
+
+    def to_english(self, catalog=None):
+        """Answers as English option text, follow-up details last, ready to save."""
+        en_options = (catalog or get_catalog()).en_options
+        out = {}
+        for q_id, code in self.answered_codes().items():
+            opts = en_options.get(q_id, ())
+            out[q_id] = opts[code - 1] if code <= len(opts) else str(code)
+        out.update(self.details)
+        return out
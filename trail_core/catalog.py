@@ -0,0 +1,314 @@
+# trail_core/catalog.py
+
+# ======================================================
+# Single shared translation catalog.
+#
+# translations.json is parsed, validated and compiled once per process into
+# an immutable Catalog shared by the app, the scorer and offline tools. The
+# compiled form is also saved under .cache/ as a marshal snapshot of plain
+# dicts, lists and strings (never pickle, which can run code on load), keyed
+# by the SHA-256 of the source file and UI_KEYS, so a warm start skips JSON
+# parsing and compilation.
+# ======================================================
+import hashlib
+import json
+import marshal
+import os
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+
+# translations.json sits at the repository root, next to App.py
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRANS_PATH = os.path.join(BASE_DIR, "translations.json")
+# Private to the checkout: not configurable, created owner-only
+CACHE_DIR = os.path.join(BASE_DIR, ".cache")
+
+# Bump when the compiled layout changes so stale snapshots are ignored
+CATALOG_FORMAT = 3
+
+# Keys App.py looks up through t(); checked for every language in strict mode
+UI_KEYS = [
+    "title", "desc", "start", "back", "next", "answer_all",
+    "final_thanks", "final_scores", "final_saved", "done_message",
+    "sections.A", "sections.B", "sections.C", "sections.C_sub_who",
+    "sections.D", "sections.E", "sections.F",
+]
+
+# Set TRAIL_STRICT_TRANSLATIONS=1 to fail at start-up on missing translations
+STRICT_TRANSLATIONS = os.environ.get("TRAIL_STRICT_TRANSLATIONS") == "1"
+
+
+_MISSING = object()
+
+
+def _freeze(value, memo):
+    """Read-only copy: dicts become MappingProxyType, lists tuples. Shared parts stay shared."""
+    frozen = memo.get(id(value))
+    if frozen is not None:
+        return frozen
+    if isinstance(value, dict):
+        frozen = MappingProxyType({k: _freeze(v, memo) for k, v in value.items()})
+    elif isinstance(value, list):
+        frozen = tuple(_freeze(v, memo) for v in value)
+    else:
+        return value
+    memo[id(value)] = frozen
+    return frozen
+
+
+class CatalogError(ValueError):
+    """translations.json is missing, malformed or incomplete."""
+
+
+def _flatten(prefix, value, out):
+    out[prefix] = value
+    if isinstance(value, dict):
+        for k, v in value.items():
+            if "." not in k:  # t() splits on dots, so such keys were never reachable
+                _flatten(f"{prefix}.{k}", v, out)
+
+def build_flat_catalog(translations, required_keys=(), strict=False):
+    """
+    Compiles the translations into {(lang, dotted key): value} with t()'s
+    resolution order already applied: a top-level key holding a value for
+    the language wins over the nested path inside the language block.
+
+    Returns (catalog, missing), where missing lists "lang:key" entries that
+    English has (or that required_keys asks for) but a language lacks.
+    With strict=True a non-empty missing list raises CatalogError instead.
+    """
+    catalog = {}
+
+    # 2. Nested paths inside each block (like questions)
+    for block_key, block in translations.items():
+        if not isinstance(block, dict):
+            continue
+        nested = {}
+        for k, v in block.items():
+            if "." not in k:
+                _flatten(k, v, nested)
+        for path, value in nested.items():
+            if value is not None:
+                catalog[(block_key, path)] = value
+
+    # 1. Top-level keys with per-language values take precedence
+    for key, value in translations.items():
+        if isinstance(value, dict):
+            for lang_code, lang_value in value.items():
+                catalog[(lang_code, key)] = lang_value
+
+    langs = translations.get("langs") or [k for k in ("en", "hi", "mr") if k in translations]
+    expected = {path for (lang_code, path) in catalog if lang_code == "en"}
+    expected.update(required_keys)
+    missing = sorted(
+        f"{lang_code}:{path}"
+        for lang_code in langs
+        for path in expected
+        if (lang_code, path) not in catalog
+    )
+    if strict and missing:
+        raise CatalogError(f"Missing translations: {', '.join(missing)}")
+    return catalog, missing
+
+def build_option_index(translations):
+    """
+    Compiles the option lists into one dict per language mapping
+    (question id, option text) -> 1-based option code.
+    Questions without options in a language fall back to the English list,
+    the same way score_numeric always has.
+    """
+    en_q = translations.get('en', {}).get('Q', {})
+    index = {}
+    for lang_code, block in translations.items():
+        if not isinstance(block, dict) or not isinstance(block.get('Q'), dict):
+            continue
+        lang_q = block['Q']
+        lang_index = {}
+        for qkey in set(lang_q) | set(en_q):
+            opts = lang_q.get(qkey, {}).get('opts') or en_q.get(qkey, {}).get('opts')
+            if not isinstance(opts, list):
+                continue
+            for i, opt in enumerate(opts):
+                # Keep the first position, like list.index did
+                lang_index.setdefault((qkey, opt), i + 1)
+        index[lang_code] = lang_index
+    return index
+
+def validate_translations(translations):
+    """Raises CatalogError if the file does not have the shape the app reads."""
+    if not isinstance(translations, dict):
+        raise CatalogError("translations.json must contain a JSON object")
+    langs = translations.get("langs") or []
+    for lang_code in langs:
+        q_block = translations.get(lang_code, {}).get("Q") if isinstance(translations.get(lang_code), dict) else None
+        if not isinstance(q_block, dict):
+            raise CatalogError(f"Language '{lang_code}' has no 'Q' block")
+        for q_id, q_data in q_block.items():
+            if not isinstance(q_data, dict) or not isinstance(q_data.get("opts"), list):
+                raise CatalogError(f"{lang_code}.Q.{q_id} must have an 'opts' list")
+
+
+class Catalog:
+    """
+    Immutable compiled form of translations.json. Every nested dict is a
+    MappingProxyType and every list a tuple, so no caller can change what
+    the others see.
+
+    translations  the parsed file
+    flat          {(lang, dotted key): value} behind t() and t_question()
+    missing       "lang:key" entries absent for some language
+    option_index  {lang: {(question id, option text): option code}}
+    en_options    {question id: tuple of English options}
+    digest        SHA-256 of the source file
+    """
+
+    __slots__ = ("translations", "flat", "missing", "option_index", "en_options", "digest")
+
+    def __init__(self, translations, flat, missing, option_index, en_options, digest=None):
+        set_ = object.__setattr__
+        memo = {}  # flat values are parts of translations; freeze each once
+        set_(self, "translations", _freeze(translations, memo))
+        set_(self, "flat", MappingProxyType({key: _freeze(value, memo) for key, value in flat.items()}))
+        set_(self, "missing", tuple(missing))
+        set_(self, "option_index", MappingProxyType(
+            {lang_code: MappingProxyType(dict(idx)) for lang_code, idx in option_index.items()}
+        ))
+        set_(self, "en_options", MappingProxyType(dict(en_options)))
+        set_(self, "digest", digest)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Catalog is immutable")
+
+    def text(self, lang_code, key, default=None):
+        """Translation lookup that works for nested questions or top-level keys."""
+        value = self.flat.get((lang_code, key), _MISSING)
+        if value is _MISSING:
+            return default or key
+        return value
+
+    def question(self, lang_code, q_id):
+        """Question data ({"q": ..., "opts": [...]}) or a visible placeholder."""
+        q_data = self.flat.get((lang_code, f"Q.{q_id}"))
+        if q_data and isinstance(q_data, Mapping):
+            return q_data
+        # Fallback if ID is missing
+        return {"q": f"Question {q_id} missing", "opts": ["Error: Options not found"]}
+
+    def snapshot(self):
+        """The catalog as plain dicts, lists and tuples, for marshal."""
+        memo = {}
+        return (
+            _thaw(self.translations, memo),
+            {key: _thaw(value, memo) for key, value in self.flat.items()},
+            self.missing,
+            {lang_code: dict(idx) for lang_code, idx in self.option_index.items()},
+            dict(self.en_options),
+            self.digest,
+        )
+
+
+def _thaw(value, memo):
+    """Plain dict/list copy of a frozen value; shared parts stay shared, so marshal stores them once."""
+    plain = memo.get(id(value))
+    if plain is not None:
+        return plain
+    if isinstance(value, Mapping):
+        plain = {k: _thaw(v, memo) for k, v in value.items()}
+    elif isinstance(value, tuple):
+        plain = [_thaw(v, memo) for v in value]
+    else:
+        return value
+    memo[id(value)] = plain
+    return plain
+
+
+def compile_catalog(translations, digest=None, strict=False):
+    """Validates the parsed translations and builds every lookup structure."""
+    validate_translations(translations)
+    flat, missing = build_flat_catalog(translations, UI_KEYS, strict=strict)
+    en_options = {
+        qkey: tuple(q.get('opts') or ())
+        for qkey, q in translations.get('en', {}).get('Q', {}).items()
+    }
+    return Catalog(translations, flat, missing, build_option_index(translations), en_options, digest)
+
+
+EMPTY_CATALOG = compile_catalog({})
+
+
+def _snapshot_path(digest):
+    # UI_KEYS feeds the baked-in missing list, so it is part of the key
+    key = hashlib.sha256("\n".join([digest, *UI_KEYS]).encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, f"catalog-v{CATALOG_FORMAT}-{key}.marshal")
+
+def _read_snapshot(path, digest):
+    """The Catalog saved at `path`, or None if it is unreadable or not for this file."""
+    try:
+        with open(path, "rb") as f:
+            data = marshal.loads(f.read())
+        translations, flat, missing, option_index, en_options, saved_digest = data
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if saved_digest != digest or not all(
+        isinstance(part, dict) for part in (translations, flat, option_index, en_options)
+    ):
+        return None
+    return Catalog(translations, flat, missing, option_index, en_options, digest)
+
+def load_catalog(path=TRANS_PATH, strict=STRICT_TRANSLATIONS, use_cache=True):
+    """
+    Reads and compiles a translations file, reusing the marshal snapshot
+    when one exists for the same file content.
+    """
+    if not os.path.exists(path):
+        raise CatalogError(f"Missing translations file: {path}")
+    with open(path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+
+    snapshot = _snapshot_path(digest)
+    catalog = _read_snapshot(snapshot, digest) if use_cache else None
+    if catalog is not None:
+        if strict and catalog.missing:
+            raise CatalogError(f"Missing translations: {', '.join(catalog.missing)}")
+        return catalog
+
+    try:
+        translations = json.loads(raw.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise CatalogError(f"Error in translations.json syntax: {e}") from e
+    catalog = compile_catalog(translations, digest, strict=strict)
+
+    if use_cache:
+        try:
+            os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+            tmp_path = f"{snapshot}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                marshal.dump(catalog.snapshot(), f)
+            os.replace(tmp_path, snapshot)
+        except OSError:
+            pass  # read-only checkout: run without the snapshot
+    return catalog
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+def get_catalog():
+    """The process-wide Catalog, loaded on first use."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = load_catalog()
+    return _catalog
+
+
+def t(lang_code, key, default=None):
+    """utils.t for code that runs without Streamlit."""
+    return get_catalog().text(lang_code, key, default)
+
+def t_question(lang_code, q_id):
+    """utils.t_question for code that runs without Streamlit."""
+    return get_catalog().question(lang_code, q_id)
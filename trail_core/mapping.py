@@ -0,0 +1,18 @@
+from .catalog import get_catalog
+
+
+def map_to_english(q_id, selected_option, lang_code, catalog=None):
+    """
+    Convert the user's selected option in any language to English.
+    """
+    if lang_code == "en":
+        return selected_option  # Already English
+
+    # Same compiled index the scorer uses: one lookup for the option code
+    catalog = catalog or get_catalog()
+    code = catalog.option_index.get(lang_code, {}).get((q_id, selected_option))
+    en_opts = catalog.en_options.get(q_id, ())
+
+    if code is None or code > len(en_opts):
+        return selected_option  # fallback if not found
+    return en_opts[code - 1]  # return English version
@@ -0,0 +1,177 @@
+from .catalog import get_catalog
+
+def __getattr__(name):
+    # TRANSLATIONS, OPTION_INDEX and EN_OPTIONS come from the shared catalog,
+    # loaded on first use rather than at import
+    if name == 'TRANSLATIONS':
+        return get_catalog().translations
+    if name == 'OPTION_INDEX':
+        return get_catalog().option_index
+    if name == 'EN_OPTIONS':
+        return get_catalog().en_options
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def score_numeric(qkey, option_text, lang='en'):
+    if option_text is None:
+        return 0
+    
+    s = str(option_text).strip()
+    
+    # Handle direct numeric strings (e.g., "1", "2")
+    if s.isdigit():
+        return int(s)
+    
+    # 2. One hash lookup in the precompiled index
+    option_index = get_catalog().option_index
+    lang_index = option_index.get(lang) or option_index.get('en', {})
+    return lang_index.get((qkey, s))
+
+def compute_scores(res, lang='en'):
+    # Convert all responses to numeric safely
+    return score_codes({k: score_numeric(k, v, lang) for k, v in res.items()})
+
+def score_codes(codes):
+    """
+    compute_scores for answers that are already option codes, such as
+    AnswerSheet.answered_codes(). Missing keys count as unanswered.
+    """
+    num = dict(codes)
+
+    # List of keys required for your calculation logic
+    required_keys = ['B6','B7','F4','C1','C2','C3','C4','C5','C6','C7','C8','C9','C10','C12']
+    
+    for req in required_keys:
+        if num.get(req) is None:
+            num[req] = 3 # Safe default fallback
+
+    # --- YOUR CALCULATION LOGIC ---
+    refresh_rev = 6 - num['B6']
+    difficulty_rev = 6 - num['B7']
+    env_rev = 6 - num['F4']
+    sleep_quality = refresh_rev + difficulty_rev + env_rev
+
+    who_items = [num['C1'], num['C2'], num['C3'], num['C4'], num['C5']]
+    who_rev = [6 - x for x in who_items]
+    WHO_total = sum(who_rev) * 4
+
+    distress_total = num['C6'] + num['C7'] + num['C8'] + num['C9'] + num['C10'] + num['C12']
+
+    cog_keys = ['D1','D2','D3','D4','D5','D6','D7','D8']
+    cog_efficiency = sum(num.get(k, 0) or 0 for k in cog_keys)
+
+    lifestyle_risk = (
+        (num.get('F1') or 0) + 
+        (num.get('F2') or 0) + 
+        (5 - (num.get('F3') or 3)) + 
+        (6 - (num.get('F4') or 3)) + 
+        (num.get('F5') or 0) + 
+        (num.get('F6') or 0)
+    )
+
+    return {
+        'sleep_quality': int(sleep_quality),
+        'WHO_total': int(WHO_total),
+        'distress_total': int(distress_total),
+        'cognitive_efficiency': int(cog_efficiency),
+        'lifestyle_risk': int(lifestyle_risk)
+    }
+
+# --------------------------------------------------
+# Batch scoring
+# --------------------------------------------------
+SCALE_COLUMNS = ['sleep_quality', 'WHO_total', 'distress_total', 'cognitive_efficiency', 'lifestyle_risk']
+
+# Marks "no code" in a coded array: a missing key or an unrecognised option.
+# compute_scores sees those as None, while an explicit None answer codes as 0.
+MISSING_CODE = -1
+
+# Every question id compute_scores reads
+SCORED_KEYS = ['B6', 'B7'] + [f'C{i}' for i in range(1, 13)] + [f'D{i}' for i in range(1, 9)] + [f'F{i}' for i in range(1, 7)]
+
+def encode_answers(df, lang='en'):
+    """
+    Turns a DataFrame of answer texts into {question id: 1-D float array
+    of option codes}, for the SCORED_KEYS columns present. Each distinct
+    value per column goes through score_numeric once, so the codes are
+    exactly what compute_scores would see: null cells count as an explicit
+    None answer and become 0.0, unrecognised options become NaN.
+    """
+    import numpy as np
+
+    codes = {}
+    for qkey in df.columns.intersection(SCORED_KEYS):
+        col = df[qkey]
+        nulls = col.isna().to_numpy()
+        lookup = {v: score_numeric(qkey, v, lang) for v in col[~nulls].unique()}
+        mapped = col[~nulls].map(lookup).astype('float64')
+        out = np.full(len(col), 0.0)
+        out[~nulls] = mapped.to_numpy()
+        codes[qkey] = out
+    return codes
+
+def compute_scores_batch(data, lang='en', columns=None):
+    """
+    Vectorised compute_scores for many respondents at once.
+
+    `data` is either a DataFrame of answers (question ids as columns, same
+    values compute_scores accepts) or a 2-D integer array of option codes with
+    `columns` naming the question id of each array column; use MISSING_CODE
+    for absent answers. Returns a DataFrame with the five scale columns that
+    matches compute_scores row for row.
+    """
+    # NumPy and pandas are only paid for by batch callers
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(data, pd.DataFrame):
+        index = data.index
+        codes = encode_answers(data, lang)
+    else:
+        arr = np.asarray(data)
+        if arr.ndim != 2 or columns is None or len(columns) != arr.shape[1]:
+            raise ValueError("A coded array must be 2-D with one column name per array column")
+        index = pd.RangeIndex(arr.shape[0])
+        arr = arr.astype('float64')
+        arr[arr == MISSING_CODE] = np.nan
+        codes = {qkey: arr[:, i] for i, qkey in enumerate(columns)}
+
+    n = len(index)
+    missing = np.full(n, np.nan)
+
+    def col(qkey):
+        return codes.get(qkey, missing)
+
+    def required(qkey):
+        # Same safe default fallback as compute_scores
+        return np.where(np.isnan(col(qkey)), 3.0, col(qkey))
+
+    def or_default(values, default):
+        # Mirrors `x or default`: both None and 0 fall back
+        return np.where(np.isnan(values) | (values == 0), default, values)
+
+    f4 = required('F4')
+    sleep_quality = (6 - required('B6')) + (6 - required('B7')) + (6 - f4)
+
+    WHO_total = sum(6 - required(q) for q in ['C1', 'C2', 'C3', 'C4', 'C5']) * 4
+
+    distress_total = sum(required(q) for q in ['C6', 'C7', 'C8', 'C9', 'C10', 'C12'])
+
+    cog_keys = ['D1','D2','D3','D4','D5','D6','D7','D8']
+    cog_efficiency = sum(or_default(col(k), 0) for k in cog_keys)
+
+    lifestyle_risk = (
+        or_default(col('F1'), 0) +
+        or_default(col('F2'), 0) +
+        (5 - or_default(col('F3'), 3)) +
+        (6 - or_default(f4, 3)) +
+        or_default(col('F5'), 0) +
+        or_default(col('F6'), 0)
+    )
+
+    return pd.DataFrame({
+        'sleep_quality': sleep_quality,
+        'WHO_total': WHO_total,
+        'distress_total': distress_total,
+        'cognitive_efficiency': cog_efficiency,
+        'lifestyle_risk': lifestyle_risk,
+    }, index=index).astype('int64')[SCALE_COLUMNS]